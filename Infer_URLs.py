@@ -1,57 +1,61 @@
+import os
+import json
 import pandas as pd
-import requests
 import time
+from instrumentation import Progress, count, timer
+from ivn_output import write_table
+from component_registry import ComponentRegistry
+from sharding import process_items
 
 
 # This is Infer_URLs.py - last execution time: 5880.22 seconds
 
 
 # File paths (update if necessary)
-input_file = r"C:\Users\basil.white\Python\scripts\Infer_URLs\ivntest.xlsx"
-output_file = r"C:\Users\basil.white\Python\scripts\Infer_URLs\ivntest_checked.xlsx"
+INPUT_FILE = "ivntest.xlsx"
+OUTPUT_FILE = "ivntest_checked.xlsx"
 
 
-# Start time tracking
-start_time = time.time()
-
-
-# Load the Excel file (first sheet automatically)
-df = pd.read_excel(input_file, sheet_name=0)
-print("✅ Loaded Excel file successfully.")
-
+# 1. Fill missing URLs using existing mappings
+def infer_urls(df, registry=None):
+    df = df.copy()
 
-# Ensure 'Enabling URL Status' and 'Dependent URL Status' columns exist
-if "Enabling URL Status" not in df.columns:
-    df["Enabling URL Status"] = ""
+    # Ensure 'Enabling URL Status' and 'Dependent URL Status' columns exist
+    if "Enabling URL Status" not in df.columns:
+        df["Enabling URL Status"] = ""
 
 
-if "Dependent URL Status" not in df.columns:
-    df["Dependent URL Status"] = ""
+    if "Dependent URL Status" not in df.columns:
+        df["Dependent URL Status"] = ""
 
 
-df["Enabling URL Status"] = df["Enabling URL Status"].astype(str)
-df["Dependent URL Status"] = df["Dependent URL Status"].astype(str)
+    df["Enabling URL Status"] = df["Enabling URL Status"].astype(str)
+    df["Dependent URL Status"] = df["Dependent URL Status"].astype(str)
 
 
-# 1. Fill missing URLs using existing mappings
-enabling_url_map = df.dropna(subset=["Enabling Component URL"]).set_index("Enabling Component")["Enabling Component URL"].to_dict()
-dependent_url_map = df.dropna(subset=["Dependent Component URL"]).set_index("Dependent Component")["Dependent Component URL"].to_dict()
+    # Component name -> URL, as seen elsewhere in the sheet
+    for side in ("Enabling", "Dependent"):
+        url_column = f"{side} Component URL"
+        url_map = df.dropna(subset=[url_column]).set_index(f"{side} Component")[url_column].to_dict()
+        mapped = df[f"{side} Component"].map(url_map)
+        df[url_column] = mapped.where(mapped.notna(), df[url_column])
 
 
-df["Enabling Component URL"] = df.apply(
-    lambda row: enabling_url_map.get(row["Enabling Component"], row["Enabling Component URL"]), axis=1
-)
-df["Dependent Component URL"] = df.apply(
-    lambda row: dependent_url_map.get(row["Dependent Component"], row["Dependent Component URL"]), axis=1
-)
+    # Anything still missing takes the URL registered for the same component ID (from either side)
+    registry = registry or ComponentRegistry.build(df)
+    for side in ("Enabling", "Dependent"):
+        url_column = f"{side} Component URL"
+        registered = registry.broadcast(registry.components["URL"], side)
+        df[url_column] = df[url_column].where(df[url_column].notna(), registered)
 
 
-# Count inferred URLs
-inferred_enabling = df["Enabling Component URL"].notna().sum()
-inferred_dependent = df["Dependent Component URL"].notna().sum()
+    # Count inferred URLs
+    inferred_enabling = df["Enabling Component URL"].notna().sum()
+    inferred_dependent = df["Dependent Component URL"].notna().sum()
 
 
-print(f"🔍 Inferred {inferred_enabling} Enabling URLs and {inferred_dependent} Dependent URLs.")
+    print(f"🔍 Inferred {inferred_enabling} Enabling URLs and {inferred_dependent} Dependent URLs.")
+    return df
 
 
 # 2. Function to check URL status with caching
@@ -59,14 +63,17 @@ url_status_cache = {}
 
 
 def check_url_status(url):
+    import requests
     if url in url_status_cache:
         return url_status_cache[url]  # Use cached result
-    
+
     try:
-        response = requests.head(url, allow_redirects=True, timeout=5)
+        with timer("urls.http_request"):
+            response = requests.head(url, allow_redirects=True, timeout=5)
         status = "error" if response.status_code >= 400 else "valid"
     except requests.RequestException:
         status = "error"
+    count(f"urls.{status}")
 
 
     url_status_cache[url] = status  # Cache the result
@@ -74,54 +81,173 @@ def check_url_status(url):
 
 
 # 3. Apply function to check URLs with progress tracking
-broken_enabling_urls = 0
-broken_dependent_urls = 0
-total_urls = df["Enabling Component URL"].count() + df["Dependent Component URL"].count()
-checked_urls = 0
+def check_urls(df, shard=None, queue_file=None):
+    """
+    Checks each distinct URL once and maps the statuses back onto the rows.
+    shard (i, N) checks only the URLs hashing to that shard and leaves the other
+    statuses blank for sharding.merge_shards(); queue_file leases URLs through a
+    shared queue (see sharding.py).
+    """
+    df = df.copy()
+    urls = pd.unique(pd.concat([df["Enabling Component URL"], df["Dependent Component URL"]]).dropna())
+
+
+    print("⏳ Checking URLs (this may take a few minutes)...")
 
 
-print("⏳ Checking URLs (this may take a few minutes)...")
+    statuses_by_url = process_items(urls, check_url_status, "urls", shard, queue_file, desc="🔄 Checked URLs")
+    broken = {}
+    for side in ("Enabling", "Dependent"):
+        statuses = df[f"{side} Component URL"].map(statuses_by_url)
+        fallback = "" if shard else df[f"{side} URL Status"]
+        df[f"{side} URL Status"] = statuses.where(statuses.notna(), fallback)
+        broken[side] = int((statuses == "error").sum())
 
 
-for index, row in df.iterrows():
-    if pd.notna(row["Enabling Component URL"]):
-        status = check_url_status(row["Enabling Component URL"])
-        df.at[index, "Enabling URL Status"] = status
-        if status == "error":
-            broken_enabling_urls += 1
+    print("\n✅ URL check complete!")
+    print(f"❌ Broken Enabling URLs: {broken['Enabling']}")
+    print(f"❌ Broken Dependent URLs: {broken['Dependent']}")
+    return df
 
 
-    if pd.notna(row["Dependent Component URL"]):
-        status = check_url_status(row["Dependent Component URL"])
-        df.at[index, "Dependent URL Status"] = status
-        if status == "error":
-            broken_dependent_urls += 1
+def infer_and_check_urls(df, check=True, registry=None, shard=None, queue_file=None):
+    df = infer_urls(df, registry)
+    return check_urls(df, shard, queue_file) if check else df
 
 
-    checked_urls += 1
-    if checked_urls % 100 == 0:  # Print status every 100 checks
-        print(f"🔄 Checked {checked_urls}/{total_urls} URLs...")
+# Incremental audit: statuses persist in URL_STATE_FILE between runs. Only URLs that are new, stale
+# (valid but last checked STALE_AFTER_DAYS ago) or failing and due again are requested; a URL that
+# keeps failing is re-checked after 1, 2, 4, ... days (at most MAX_BACKOFF_DAYS). The delta report
+# lists only what changed since the previous run.
+URL_STATE_FILE = "url_status_state.json"
+DELTA_REPORT_FILE = "url_status_delta.csv"
+STALE_AFTER_DAYS = 7
+MAX_BACKOFF_DAYS = 30
+DAY = 24 * 60 * 60
+
+
+def load_url_state(state_file=URL_STATE_FILE):
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"urls": {}}
+
+
+def save_url_state(state, state_file=URL_STATE_FILE):
+    temp_file = state_file + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(temp_file, state_file)
+
+
+def is_due(entry, now):
+    if entry is None:
+        return True
+    if entry["status"] == "error":
+        return now >= entry["next_check"]
+    return now - entry["checked"] >= STALE_AFTER_DAYS * DAY
+
+
+def record_status(entry, status, now):
+    failures = (entry or {}).get("failures", 0) + 1 if status == "error" else 0
+    backoff = min(2 ** max(failures - 1, 0), MAX_BACKOFF_DAYS) * DAY
+    return {"status": status, "checked": now, "failures": failures, "next_check": now + backoff}
+
+
+def audit_urls(df, state_file=URL_STATE_FILE, report_file=DELTA_REPORT_FILE, now=None):
+    """
+    Checks the URLs that are due (see is_due), fills the status columns from the
+    persisted state and writes a delta report of newly broken and newly fixed URLs.
+    Returns the DataFrame and the delta report.
+    """
+    now = now or time.time()
+    df = df.copy()
+    state = load_url_state(state_file)
+    known = state["urls"]
+    urls = pd.unique(pd.concat([df["Enabling Component URL"], df["Dependent Component URL"]]).dropna())
+    due = [url for url in urls if is_due(known.get(url), now)]
+    count("urls.audit_skipped", len(urls) - len(due))
+    print(f"⏳ Checking {len(due)} of {len(urls)} URLs (new, stale or due for a retry)...")
+
+
+    changes = []
+    progress = Progress(len(due), "🔄 Checked URLs")
+    for url in due:
+        previous = known.get(url)
+        status = check_url_status(url)
+        known[url] = record_status(previous, status, now)
+        previous_status = previous["status"] if previous else ""
+        if status != previous_status and (status == "error" or previous_status == "error"):
+            changes.append({
+                "URL": url,
+                "Change": "newly broken" if status == "error" else "newly fixed",
+                "Previous Status": previous_status or "new",
+                "Status": status,
+                "Consecutive Failures": known[url]["failures"],
+            })
+        progress.update()
+    progress.close()
+    save_url_state(state, state_file)
+
+
+    for side in ("Enabling", "Dependent"):
+        statuses = df[f"{side} Component URL"].map(lambda url: known[url]["status"] if url in known else None)
+        df[f"{side} URL Status"] = statuses.where(statuses.notna(), df[f"{side} URL Status"])
+
+
+    report = pd.DataFrame(changes, columns=["URL", "Change", "Previous Status", "Status", "Consecutive Failures"])
+    if report_file:
+        write_table(report, report_file)
+    broken = int((report["Change"] == "newly broken").sum())
+    print(f"❌ Newly broken: {broken} | ✅ Newly fixed: {len(report) - broken}"
+          + (f" | Report: {report_file}" if report_file else ""))
+    return df, report
 
 
 # 4. Highlight errors in orange in Excel
-def apply_color(val):
-    return 'background-color: orange' if val == "error" else ''
+# One conditional-formatting rule per URL column: shade the URL when its status is "error"
+BROKEN_URL_HIGHLIGHT = {
+    "Enabling Component URL": ("Enabling URL Status", "error"),
+    "Dependent Component URL": ("Dependent URL Status", "error"),
+}
+
+
+def save_checked(df, output_file=OUTPUT_FILE):
+    # Save the updated file
+    write_table(df, output_file, highlight=BROKEN_URL_HIGHLIGHT)
+    print(f"📂 Processed file saved as: {output_file}")
+
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, incremental=False, state_file=URL_STATE_FILE,
+         report_file=DELTA_REPORT_FILE, shard=None, queue_file=None):
+    """
+    incremental: audit against the previous run and write the delta report (plus output_file, if given).
+    shard / queue_file: check one shard of the URLs (see check_urls).
+    """
+    # Start time tracking
+    start_time = time.time()
 
 
-styled_df = df.style.applymap(apply_color, subset=["Enabling Component URL", "Dependent Component URL"])
+    # Load the Excel file (first sheet automatically)
+    registry = ComponentRegistry.load(input_file)
+    df = registry.edges.drop(columns=["Enabling Code", "Dependent Code"])
+    print("✅ Loaded Excel file successfully.")
 
 
-# Save the updated file
-styled_df.to_excel(output_file, engine="openpyxl", index=False)
+    if incremental:
+        df, _ = audit_urls(infer_urls(df, registry), state_file, report_file)
+        if output_file:
+            save_checked(df, output_file)
+    else:
+        df = infer_and_check_urls(df, registry=registry, shard=shard, queue_file=queue_file)
+        save_checked(df, output_file)
 
 
-# Summary
-print("\n✅ URL check complete!")
-print(f"❌ Broken Enabling URLs: {broken_enabling_urls}")
-print(f"❌ Broken Dependent URLs: {broken_dependent_urls}")
-print(f"📂 Processed file saved as: {output_file}")
+    # Show execution time
+    elapsed_time = round(time.time() - start_time, 2)
+    print(f"⏱️ Total execution time: {elapsed_time} seconds")
 
 
-# Show execution time
-elapsed_time = round(time.time() - start_time, 2)
-print(f"⏱️ Total execution time: {elapsed_time} seconds")
+if __name__ == "__main__":
+    main()
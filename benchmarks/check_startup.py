@@ -0,0 +1,95 @@
+# This is check_startup.py
+# Startup regression check. Imports the CLI and each IVN module under `python -X importtime` in a
+# fresh interpreter, fails if a module pulls in a heavy dependency it should only import lazily,
+# and fails if `ivn.py --help` takes longer than its import budget. Exits non-zero on any failure,
+# so it can run in CI or before a release.
+#
+# Example:
+#   python benchmarks/check_startup.py
+#   python benchmarks/check_startup.py --cli-budget-ms 150
+
+import os
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ["pandas", "numpy", "scipy", "sklearn", "openpyxl", "PyPDF2", "requests", "openai", "selenium",
+         "webdriver_manager", "tqdm", "fuzzywuzzy", "pyarrow", "sentence_transformers"]
+
+# Module -> heavy top-level packages it must not import just by being imported
+FORBIDDEN = {
+    "ivn": HEAVY,
+    "instrumentation": HEAVY,
+    "sharding": HEAVY,
+    "extract_citations.citation_index": HEAVY,
+    "extract_citations.extract_citations": HEAVY,
+    "ivn_generate_unique_IDs_for_components": ["tqdm", "sklearn", "scipy", "openpyxl", "requests"],
+    "similarity_scores": ["sklearn", "scipy", "requests", "openai"],
+    "ivn_fuzzy_match": ["sklearn", "scipy", "requests", "openai"],
+    "Infer_URLs": ["requests", "sklearn", "scipy", "openai"],
+    "generate_ivn_recommendations": ["openai", "sklearn", "scipy"],
+    "threshold_sweep": ["sklearn", "scipy", "requests", "openai"],
+    "similarity_server": ["sklearn", "scipy", "pandas", "requests", "openai"],
+    "import_new_EOs": ["selenium", "webdriver_manager", "pandas"],
+}
+
+
+def import_times(code):
+    """
+    Runs code under -X importtime. Returns the top-level packages imported (at any
+    depth) and the total import time in milliseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    packages = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:]  # one separator space, then two spaces per nesting level
+        packages.add(name.strip().split(".")[0])
+        if not name.startswith(" "):
+            total_us += int(cumulative)
+    return packages, total_us / 1000
+
+
+def cli_import_ms():
+    code = "import sys; sys.argv = ['ivn', '--help']\ntry:\n    import ivn; ivn.main()\nexcept SystemExit:\n    pass"
+    return import_times(code)[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that IVN modules import their heavy dependencies lazily.")
+    parser.add_argument("--cli-budget-ms", type=float, default=100.0, help="Import budget for `ivn.py --help`")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for module, forbidden in FORBIDDEN.items():
+        try:
+            imported, total_ms = import_times(f"import {module}")
+        except RuntimeError as e:
+            print(f"⚠️ {module}: not importable here ({e}); skipped")
+            continue
+        loaded = sorted(set(forbidden) & set(imported))
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} at module level")
+        print(f"{'❌' if loaded else '✅'} {module}: {total_ms:.1f} ms of imports")
+
+    cli_ms = cli_import_ms()
+    print(f"{'❌' if cli_ms > args.cli_budget_ms else '✅'} ivn.py --help: {cli_ms:.1f} ms of imports "
+          f"(budget {args.cli_budget_ms:.0f} ms)")
+    if cli_ms > args.cli_budget_ms:
+        failures.append(f"ivn.py --help spends {cli_ms:.1f} ms importing (budget {args.cli_budget_ms:.0f} ms)")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# This is run_benchmarks.py
+# Times the IVN hot paths on synthetic data and records wall time and peak RSS to JSON, so
+# regressions show up as numbers instead of anecdotes. Each benchmark runs in its own process
+# so peak RSS is per benchmark.
+#
+# Example:
+#   python benchmarks/run_benchmarks.py --sizes 1000 10000 --output benchmarks/results/latest.json
+#   python benchmarks/run_benchmarks.py --only ids fuzzy_dedup --sizes 100000
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import multiprocessing
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+# ==============
+# Local HTTP stub
+# ==============
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers 404 for paths ending in /broken and 200 for everything else."""
+
+    def do_HEAD(self):
+        self.send_response(404 if self.path.endswith("/broken") else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_HEAD
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ==========
+# Benchmarks
+# ==========
+# Each benchmark takes the row count and returns a small dict of details.
+# Setup that should not be timed happens before the returned callable runs.
+
+
+def bench_similarity(rows):
+    from synthetic_ivn import generate_ivn
+    from similarity_scores import compute_similarity
+    df = generate_ivn(rows)
+    return lambda: {"pairs_kept": len(compute_similarity(df))}
+
+
+def bench_fuzzy_match(rows):
+    from synthetic_ivn import generate_ivn
+    from ivn_fuzzy_match import fuzzy_match
+    df = generate_ivn(rows)
+    return lambda: {"rows_kept": len(fuzzy_match(df))}
+
+
+def bench_fuzzy_dedup(rows):
+    from synthetic_ivn import generate_ivn
+    from scrub_IVN_Excel import clean_text, deduplicate_column
+    column = generate_ivn(rows)["Enabling Component"].apply(clean_text)
+    return lambda: {"unique": len(set(deduplicate_column(column)))}
+
+
+def bench_ids(rows):
+    from synthetic_ivn import generate_ivn
+    from ivn_generate_unique_IDs_for_components import fill_missing_ids
+    df = generate_ivn(rows)
+    return lambda: {"ids": int(fill_missing_ids(df)["Enabling Component ID"].nunique())}
+
+
+def bench_urls(rows):
+    from synthetic_ivn import generate_ivn
+    from Infer_URLs import infer_and_check_urls
+    server, base_url = start_stub()
+    df = generate_ivn(rows)
+    for column in ("Enabling Component URL", "Dependent Component URL"):
+        df[column] = df[column].str.replace("https://example.gov", base_url, regex=False)
+
+    def run():
+        checked = infer_and_check_urls(df)
+        server.shutdown()
+        return {"broken": int((checked["Enabling URL Status"] == "error").sum()
+                              + (checked["Dependent URL Status"] == "error").sum())}
+    return run
+
+
+def bench_citations(rows):
+    # rows is reused as the total page count across fixture PDFs (100 pages each)
+    from synthetic_ivn import write_pdf, generate_directive_pages
+    from extract_citations.extract_citations import extract_us_code_citations
+    fixture_dir = tempfile.mkdtemp(prefix="ivn_bench_pdfs_")
+    paths = []
+    for i in range(max(rows // 100, 1)):
+        path = os.path.join(fixture_dir, f"directive_{i}.pdf")
+        write_pdf(path, generate_directive_pages(min(rows, 100), seed=i))
+        paths.append(path)
+
+    def run():
+        found = sum(len(extract_us_code_citations(path, f"file://{path}")) for path in paths)
+        return {"documents": len(paths), "citations": found}
+    return run
+
+
+BENCHMARKS = {
+    "similarity": (bench_similarity, 1000),  # name -> (setup, largest row count it is run at)
+    "fuzzy_match": (bench_fuzzy_match, 10000),
+    "fuzzy_dedup": (bench_fuzzy_dedup, 1000),
+    "ids": (bench_ids, None),
+    "urls": (bench_urls, 20000),
+    "citations": (bench_citations, 2000),
+}
+
+
+# ======
+# Runner
+# ======
+
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def _child(name, rows, queue):
+    import io
+    import contextlib
+    setup, _ = BENCHMARKS[name]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            run = setup(rows)
+            baseline = peak_rss_mb()
+            start = time.perf_counter()
+            details = run()
+            seconds = time.perf_counter() - start
+        queue.put({"seconds": round(seconds, 4), "peak_rss_mb": round(peak_rss_mb(), 1),
+                   "setup_peak_rss_mb": round(baseline, 1), "details": details})
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_benchmark(name, rows, timeout=None):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(name, rows, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        return {"error": f"timed out after {timeout} seconds"}
+    return queue.get() if not queue.empty() else {"error": f"exited with code {process.exitcode}"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the IVN scripts on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run")
+    parser.add_argument("--no-limits", action="store_true",
+                        help="Run every benchmark at every size (the quadratic ones take hours at 100k)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-benchmark timeout in seconds")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<timestamp>.json)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.only or BENCHMARKS:
+        limit = BENCHMARKS[name][1]
+        for rows in args.sizes:
+            if limit and rows > limit and not args.no_limits:
+                print(f"{name:12s} {rows:>7d} rows  skipped (above {limit})")
+                results.append({"benchmark": name, "rows": rows, "skipped": True})
+                continue
+            result = run_benchmark(name, rows, args.timeout)
+            results.append({"benchmark": name, "rows": rows, **result})
+            if "error" in result:
+                print(f"{name:12s} {rows:>7d} rows  ERROR {result['error']}")
+            else:
+                print(f"{name:12s} {rows:>7d} rows  {result['seconds']:9.3f} s  {result['peak_rss_mb']:8.1f} MB")
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(RESULTS_DIR, f"{timestamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"timestamp": timestamp, "python": platform.python_version(), "machine": platform.machine(),
+                   "cpu_count": os.cpu_count(), "results": results}, f, indent=2)
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
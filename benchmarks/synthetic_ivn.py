@@ -0,0 +1,172 @@
+# This is synthetic_ivn.py
+# Generates IVN-shaped workbooks (the 16 columns of similarity_scores.original_columns, without
+# "Similarity") with controllable exact- and near-duplicate rates, plus small text PDFs for the
+# citation extractor. Used by run_benchmarks.py; also handy for trying the scripts without real data.
+#
+# Example:
+#   python benchmarks/synthetic_ivn.py --rows 1000 10000 100000 --out-dir benchmarks/data
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from similarity_scores import original_columns
+
+IVN_COLUMNS = [c for c in original_columns if c != "Similarity"]
+
+WORDS = (
+    "food safety inspection meat poultry egg products wildlife nonlethal damage management program "
+    "law regulation strategy metric outcome performance agency budget compliance training outreach "
+    "research livestock predator disease surveillance sampling laboratory verification establishment "
+    "humane handling sanitation pathogen reduction hazard analysis critical control point recall "
+    "import export labeling enforcement grant cooperative agreement stakeholder rural community "
+    "conservation habitat invasive species aviation airport hazard rabies vaccination feral swine"
+).split()
+
+CITATIONS = ["7 U.S.C. 426", "9 CFR 416", "21 U.S.C. 601", "Public Law 117-328", "Executive Order 14008",
+             "9 C.F.R. 310.18", "Title 7", "Act of 1931", "P.L. 99-198", "EO 12866"]
+
+SOURCES = [f"Source {i}" for i in range(60)]
+AGENCIES = ["APHIS", "FSIS", "NRCS", "ARS", "FS", "AMS", "ERS", "NIFA", "RMA", "FNS",
+            "OMB", "DOI", "EPA", "FDA", "CDC", "HHS", "DOT", "FAA", "DHS", "USDA"]
+
+
+def random_text(rng, low, high):
+    return " ".join(rng.choice(WORDS, size=rng.integers(low, high)))
+
+
+def perturb(rng, text):
+    """Near-duplicate of text: a typo, a case change or extra punctuation."""
+    if not text:
+        return text
+    kind = rng.integers(3)
+    if kind == 0:
+        i = int(rng.integers(len(text)))
+        return text[:i] + text[i + 1:]
+    if kind == 1:
+        return text.upper() if rng.random() < 0.5 else text.title()
+    return text.replace(" ", "  ", 1) + "."
+
+
+def make_components(rng, count, prefix):
+    sources = rng.choice(SOURCES, size=count)
+    return pd.DataFrame({
+        "Component": [f"{prefix} {i} {random_text(rng, 2, 6)}" for i in range(count)],
+        "Component Description": [random_text(rng, 10, 30) for _ in range(count)],
+        "Source": sources,
+        "Source Agency": rng.choice(AGENCIES, size=count),
+        "Component URL": [f"https://example.gov/{prefix.lower()}/{i}" + ("/broken" if rng.random() < 0.05 else "")
+                          for i in range(count)],
+    })
+
+
+def generate_ivn(rows, duplicate_rate=0.1, near_duplicate_rate=0.1, seed=0):
+    """
+    IVN edge list with `rows` rows. duplicate_rate of the rows repeat an earlier
+    row exactly; near_duplicate_rate of the rows carry a perturbed copy of an
+    existing component name and description.
+    """
+    rng = np.random.default_rng(seed)
+    n_components = max(rows // 4, 10)
+    enabling = make_components(rng, n_components, "Enabling")
+    dependent = make_components(rng, n_components, "Dependent")
+
+    e = enabling.iloc[rng.integers(n_components, size=rows)].reset_index(drop=True)
+    d = dependent.iloc[rng.integers(n_components, size=rows)].reset_index(drop=True)
+    df = pd.DataFrame({
+        "Enabling Source": e["Source"],
+        "Enabling Component": e["Component"],
+        "Enabling Component Description": e["Component Description"],
+        "Dependent Component": d["Component"],
+        "Dependent Component Description": d["Component Description"],
+        "Dependent Source": d["Source"],
+        "Linkage mandated by what US Code or OMB policy?": rng.choice(CITATIONS + [""] * 10, size=rows),
+        "Enabling Component URL": e["Component URL"],
+        "Dependent Component URL": d["Component URL"],
+        "Enabling Source Agency": e["Source Agency"],
+        "Dependent Source Agency": d["Source Agency"],
+        "Notes and keywords": "",
+        "Keywords Tab Items Found": "",
+        "Enabling Component Responsible Office": "",
+        "Dependent Component Responsible Office": "",
+        "Edits": "",
+    })
+
+    # Blank a few URLs so URL inference has work to do
+    for column in ("Enabling Component URL", "Dependent Component URL"):
+        df.loc[rng.random(rows) < 0.2, column] = None
+
+    near = np.flatnonzero(rng.random(rows) < near_duplicate_rate)
+    for side in ("Enabling", "Dependent"):
+        for column in (f"{side} Component", f"{side} Component Description"):
+            df.loc[near, column] = [perturb(rng, str(text)) for text in df.loc[near, column]]
+
+    duplicates = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    duplicates = duplicates[duplicates > 0]
+    originals = (rng.random(len(duplicates)) * duplicates).astype(int)
+    df.iloc[duplicates] = df.iloc[originals].to_numpy()
+    return df[IVN_COLUMNS]
+
+
+def write_pdf(path, pages):
+    """Minimal single-font PDF with one text page per string in pages."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in pages:
+        lines = [text[i:i + 90] for i in range(0, len(text), 90)] or [""]
+        stream = "BT /F1 10 Tf 12 TL 40 750 Td " + " ".join(
+            "({}) '".format(line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")) for line in lines
+        ) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_directive_pages(pages, seed=0):
+    """Directive-like page texts with a handful of citations per page."""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for page in range(pages):
+        sentences = [random_text(rng, 8, 20) for _ in range(12)]
+        for _ in range(rng.integers(1, 5)):
+            sentences.insert(int(rng.integers(len(sentences))), "under " + str(rng.choice(CITATIONS)))
+        texts.append(f"SECTION {page + 1}. " + ". ".join(sentences) + ".")
+    return texts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic IVN workbooks.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--near-duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=os.path.join("benchmarks", "data"))
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for rows in args.rows:
+        path = os.path.join(args.out_dir, f"synthetic_ivn_{rows}.xlsx")
+        generate_ivn(rows, args.duplicate_rate, args.near_duplicate_rate, args.seed).to_excel(path, index=False)
+        print(f"Wrote {rows} rows to {path}")
+
+
+if __name__ == "__main__":
+    main()
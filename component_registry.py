@@ -0,0 +1,98 @@
+# This is component_registry.py
+# One interned table of IVN components per workbook version. Every component (Enabling or Dependent)
+# is keyed by its SHA-256 ID (see ivn_generate_unique_IDs_for_components.py) and gets an integer code;
+# the edge table carries "Enabling Code" / "Dependent Code" columns. Stages work on the unique
+# components, which are usually far fewer than the edges, and broadcast results back by code.
+
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from ivn_generate_unique_IDs_for_components import component_ids
+from ivn_output import compact_table
+
+CACHE_DIR = ".ivn_cache"
+SIDES = ("Enabling", "Dependent")
+
+# Registry field -> column suffix in the IVN sheet ("Enabling " / "Dependent " prefix)
+FIELDS = {
+    "Component": "Component",
+    "Description": "Component Description",
+    "Source": "Source",
+    "URL": "Component URL",
+    "Agency": "Source Agency",
+}
+
+
+class ComponentRegistry:
+    """
+    components: one row per unique component, indexed by integer code, with
+                ID, Component, Description, Source, URL and Agency columns
+                (each the first non-empty value seen for that ID).
+    edges:      the original rows (repetitive text columns as categoricals)
+                plus integer "Enabling Code" and "Dependent Code".
+    """
+
+    def __init__(self, components, edges):
+        self.components = components
+        self.edges = edges
+
+    @classmethod
+    def build(cls, df):
+        frames = []
+        for side in SIDES:
+            frame = pd.DataFrame({"ID": component_ids(df, side).to_numpy()})
+            for field, suffix in FIELDS.items():
+                column = f"{side} {suffix}"
+                frame[field] = df[column].to_numpy() if column in df.columns else None
+            frames.append(frame)
+        stacked = pd.concat(frames, ignore_index=True)
+
+        codes, ids = pd.factorize(stacked["ID"])
+        values = stacked.drop(columns="ID").astype(object)
+        values = values.mask(values.astype(str).apply(lambda c: c.str.strip()) == "")  # "" counts as missing
+        components = values.groupby(codes).first()
+        components.insert(0, "ID", ids)
+        components.index.name = "Code"
+
+        n = len(df)
+        edges = compact_table(df).assign(**{
+            "Enabling Code": codes[:n].astype(np.int32),
+            "Dependent Code": codes[n:].astype(np.int32),
+        })
+        return cls(components, edges)
+
+    @classmethod
+    def load(cls, path, cache_dir=CACHE_DIR):
+        """Registry for the workbook at path, reused across runs until the file changes."""
+        from ivn_output import read_table
+        from pipeline import file_hash
+        cache_file = os.path.join(cache_dir, f"registry-{file_hash(path)[:16]}.pkl")
+        if os.path.exists(cache_file):
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        registry = cls.build(read_table(path))
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file, "wb") as f:
+            pickle.dump(registry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return registry
+
+    def __len__(self):
+        return len(self.components)
+
+    def codes(self, side):
+        return self.edges[f"{side} Code"].to_numpy()
+
+    def side(self, side):
+        """
+        Unique components appearing on one side, with the IVN column names for
+        that side ("Enabling Component Description", ...). Indexed by code.
+        """
+        used = np.unique(self.codes(side))
+        frame = self.components.loc[used].fillna("")
+        return frame.rename(columns={field: f"{side} {suffix}" for field, suffix in FIELDS.items()})
+
+    def broadcast(self, values, side):
+        """Per-component values (indexed by code) repeated onto every edge for that side."""
+        values = pd.Series(values)
+        return pd.Series(values.reindex(self.codes(side)).to_numpy(), index=self.edges.index)
@@ -0,0 +1,256 @@
+# This is export_graph.py
+# Streams components and linkages out of the IVN workbook and the similarity outputs into bulk-load
+# files for the graph database, so nightly rebuilds can use the bulk importer instead of row-by-row inserts.
+# Input is read in chunks (openpyxl read-only mode / csv reader) and written as it is read. Nodes and
+# relationships are deduplicated across the whole export, so a 64-bit hash of every distinct node ID and
+# relationship written so far stays in memory: roughly 70 bytes each, or about 1 GB per 15 million.
+#
+# Formats:
+#   neo4j   - nodes.csv and relationships.csv with neo4j-admin import headers
+#   graphml - ivn.graphml
+#   parquet - nodes.parquet and relationships.parquet (requires pyarrow)
+#
+# Example:
+#   python export_graph.py --ivn IVN-public-with-IDs.xlsx \
+#       --similarity ivn_similarity_scores_complete_above_threshold.csv --format neo4j --output graph_export
+
+import os
+import csv
+import hashlib
+import argparse
+from itertools import islice
+from xml.sax.saxutils import escape, quoteattr
+from ivn_generate_unique_IDs_for_components import generate_id
+
+IVN_FILE = "IVN-public-with-IDs.xlsx"
+SIMILARITY_FILES = ["ivn_similarity_scores_complete_above_threshold.csv"]
+OUTPUT_DIR = "graph_export"
+CHUNK_SIZE = 10000
+
+NODE_FIELDS = ["id", "name", "description", "source", "agency", "url"]
+EDGE_FIELDS = ["start", "end", "type", "mandate", "similarity"]
+SIMILARITY_COLUMNS = ["Similarity Score", "Similarity"]  # ivn_fuzzy_match.py / similarity_scores.py
+
+
+# ==============
+# Reading inputs
+# ==============
+
+
+def iter_table_rows(path):
+    """Yields each row of an xlsx or csv file as a dict, without loading the whole file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+        return
+
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, [])]
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def text(value):
+    if value is None or value != value:  # None or NaN
+        return ""
+    return str(value).strip()
+
+
+def component_node(row, side):
+    component_id = text(row.get(f"{side} Component ID"))
+    if not component_id:
+        component_id = generate_id(row.get(f"{side} Source", ""), row.get(f"{side} Component Description", ""))
+    return {
+        "id": component_id,
+        "name": text(row.get(f"{side} Component")),
+        "description": text(row.get(f"{side} Component Description")),
+        "source": text(row.get(f"{side} Source")),
+        "agency": text(row.get(f"{side} Source Agency")),
+        "url": text(row.get(f"{side} Component URL")),
+    }
+
+
+def row_to_graph(row, relationship):
+    """Enabling node, Dependent node and the edge between them for one edge-list row."""
+    enabling = component_node(row, "Enabling")
+    dependent = component_node(row, "Dependent")
+    similarity = next((text(row[c]) for c in SIMILARITY_COLUMNS if text(row.get(c))), "")
+    edge = {
+        "start": enabling["id"],
+        "end": dependent["id"],
+        "type": relationship,
+        "mandate": text(row.get("Linkage mandated by what US Code or OMB policy?")),
+        "similarity": similarity,
+    }
+    return enabling, dependent, edge
+
+
+# =======
+# Writers
+# =======
+
+
+class Neo4jCSVWriter:
+    """nodes.csv / relationships.csv in neo4j-admin database import format."""
+
+    def __init__(self, output_dir):
+        self.node_file = open(os.path.join(output_dir, "nodes.csv"), "w", newline="", encoding="utf-8")
+        self.edge_file = open(os.path.join(output_dir, "relationships.csv"), "w", newline="", encoding="utf-8")
+        self.nodes = csv.writer(self.node_file)
+        self.edges = csv.writer(self.edge_file)
+        self.nodes.writerow(["componentId:ID", "name", "description", "source", "agency", "url", ":LABEL"])
+        self.edges.writerow([":START_ID", ":END_ID", ":TYPE", "mandate", "similarity:float"])
+
+    def write_nodes(self, nodes):
+        self.nodes.writerows([[node[f] for f in NODE_FIELDS] + ["Component"] for node in nodes])
+
+    def write_edges(self, edges):
+        self.edges.writerows([[edge[f] for f in EDGE_FIELDS] for edge in edges])
+
+    def close(self):
+        self.node_file.close()
+        self.edge_file.close()
+
+
+class GraphMLWriter:
+    """Single ivn.graphml file; nodes and edges are written in the order they are read."""
+
+    def __init__(self, output_dir):
+        self.file = open(os.path.join(output_dir, "ivn.graphml"), "w", encoding="utf-8")
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        for field in NODE_FIELDS[1:]:
+            self.file.write(f'  <key id="{field}" for="node" attr.name="{field}" attr.type="string"/>\n')
+        self.file.write('  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n'
+                        '  <key id="mandate" for="edge" attr.name="mandate" attr.type="string"/>\n'
+                        '  <key id="similarity" for="edge" attr.name="similarity" attr.type="double"/>\n'
+                        '  <graph id="IVN" edgedefault="directed">\n')
+
+    def write_nodes(self, nodes):
+        parts = []
+        for node in nodes:
+            parts.append(f'    <node id={quoteattr(node["id"])}>')
+            parts.extend(f'<data key="{f}">{escape(node[f])}</data>' for f in NODE_FIELDS[1:] if node[f])
+            parts.append('</node>\n')
+        self.file.write("".join(parts))
+
+    def write_edges(self, edges):
+        parts = []
+        for edge in edges:
+            parts.append(f'    <edge source={quoteattr(edge["start"])} target={quoteattr(edge["end"])}>')
+            parts.extend(f'<data key="{f}">{escape(edge[f])}</data>' for f in EDGE_FIELDS[2:] if edge[f])
+            parts.append('</edge>\n')
+        self.file.write("".join(parts))
+
+    def close(self):
+        self.file.write('  </graph>\n</graphml>\n')
+        self.file.close()
+
+
+class ParquetWriter:
+    """nodes.parquet / relationships.parquet, one row group per chunk."""
+
+    def __init__(self, output_dir):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa = pa
+        node_schema = pa.schema([(f, pa.string()) for f in NODE_FIELDS])
+        edge_schema = pa.schema([(f, pa.string()) for f in EDGE_FIELDS[:-1]] + [("similarity", pa.float64())])
+        self.nodes = pq.ParquetWriter(os.path.join(output_dir, "nodes.parquet"), node_schema)
+        self.edges = pq.ParquetWriter(os.path.join(output_dir, "relationships.parquet"), edge_schema)
+
+    def write_nodes(self, nodes):
+        if nodes:
+            self.nodes.write_table(self.pa.Table.from_pylist(nodes, schema=self.nodes.schema))
+
+    def write_edges(self, edges):
+        if edges:
+            edges = [dict(edge, similarity=float(edge["similarity"]) if edge["similarity"] else None)
+                     for edge in edges]
+            self.edges.write_table(self.pa.Table.from_pylist(edges, schema=self.edges.schema))
+
+    def close(self):
+        self.nodes.close()
+        self.edges.close()
+
+
+WRITERS = {"neo4j": Neo4jCSVWriter, "graphml": GraphMLWriter, "parquet": ParquetWriter}
+
+
+# ======
+# Export
+# ======
+
+
+def _key(*parts):
+    """64-bit hash standing in for a node ID or relationship in the dedupe sets (far smaller than the strings)."""
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def export_graph(ivn_file=IVN_FILE, similarity_files=SIMILARITY_FILES, output_dir=OUTPUT_DIR,
+                 fmt="neo4j", chunk_size=CHUNK_SIZE):
+    os.makedirs(output_dir, exist_ok=True)
+    writer = WRITERS[fmt](output_dir)
+    seen_nodes = set()
+    seen_edges = set()
+    sources = [(ivn_file, "ENABLES")] + [(path, "SIMILAR_TO") for path in similarity_files]
+
+    try:
+        for path, relationship in sources:
+            if not os.path.exists(path):
+                print(f"Skipping missing input: {path}")
+                continue
+            rows_read = 0
+            for chunk in chunked(iter_table_rows(path), chunk_size):
+                new_nodes, new_edges = [], []
+                for row in chunk:
+                    enabling, dependent, edge = row_to_graph(row, relationship)
+                    for node in (enabling, dependent):
+                        key = _key(node["id"])
+                        if key not in seen_nodes:
+                            seen_nodes.add(key)
+                            new_nodes.append(node)
+                    key = _key(edge["start"], edge["end"], relationship)
+                    if key not in seen_edges:
+                        seen_edges.add(key)
+                        new_edges.append(edge)
+                writer.write_nodes(new_nodes)
+                writer.write_edges(new_edges)
+                rows_read += len(chunk)
+            print(f"Read {rows_read} rows from {path}")
+    finally:
+        writer.close()
+
+    print(f"Exported {len(seen_nodes)} components and {len(seen_edges)} relationships "
+          f"to {output_dir} ({fmt}).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the IVN to graph database bulk-load files.")
+    parser.add_argument("--ivn", default=IVN_FILE, help="IVN workbook (Enabling -> Dependent rows)")
+    parser.add_argument("--similarity", nargs="*", default=SIMILARITY_FILES,
+                        help="Similarity outputs to export as SIMILAR_TO relationships")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="neo4j")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    export_graph(args.ivn, args.similarity, args.output, args.format, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
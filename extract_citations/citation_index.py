@@ -0,0 +1,240 @@
+# Filename: citation_index.py
+# Inverted index over extracted citations, stored in SQLite.
+# Each normalized citation maps to postings of (document, page, section) with counts; per-document
+# totals keep the first page a citation was seen on, and co_citations counts the documents that cite
+# both citations of a pair. Queries such as "which directives cite 9 CFR 416?" hit indexes instead
+# of filtering the extracted_citations.xlsx spreadsheet.
+#
+# Examples:
+#   python citation_index.py --input extracted_citations.xlsx --db citations.sqlite
+#   python citation_index.py --db citations.sqlite --cites "9 CFR 416"
+#   python citation_index.py --db citations.sqlite --top 20
+
+
+import os
+import re
+import sqlite3
+import argparse
+from collections import Counter
+
+
+try:
+    from extract_citations.extract_citations import clean_citation, sanitize_text
+except ImportError:  # run as a script from this directory
+    from extract_citations import clean_citation, sanitize_text
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS citations (
+    id INTEGER PRIMARY KEY,
+    citation TEXT NOT NULL UNIQUE,
+    mentions INTEGER NOT NULL DEFAULT 0,
+    documents INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS postings (
+    citation_id INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    mentions INTEGER NOT NULL,
+    PRIMARY KEY (citation_id, document_id, page, section)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS document_citations (
+    citation_id INTEGER NOT NULL,
+    document_id INTEGER NOT NULL,
+    mentions INTEGER NOT NULL,
+    first_page INTEGER NOT NULL,
+    PRIMARY KEY (citation_id, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS document_citations_by_document ON document_citations (document_id, citation_id);
+CREATE TABLE IF NOT EXISTS co_citations (
+    citation_a INTEGER NOT NULL,
+    citation_b INTEGER NOT NULL,
+    documents INTEGER NOT NULL,
+    PRIMARY KEY (citation_a, citation_b)
+) WITHOUT ROWID;
+"""
+
+PAGE_PATTERN = re.compile(r"#page=(\d+)$")
+
+
+def normalize_citation(citation):
+    return re.sub(r"\s+", " ", clean_citation(sanitize_text(str(citation)))).strip()
+
+
+def page_number(citation_page_url):
+    match = PAGE_PATTERN.search(str(citation_page_url))
+    return int(match.group(1)) if match else 0
+
+
+def connect(db_path):
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _ids(connection, table, column, values):
+    connection.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", ((v,) for v in values))
+    return {value: row_id for row_id, value in connection.execute(f"SELECT id, {column} FROM {table}")}
+
+
+def build_index(rows, db_path="citations.sqlite", documents=()):
+    """
+    Indexes extracted citation rows (Citation, Citation Page, Inferred Section Name,
+    Context, URL), as returned by extract_citations.process_url. Documents already in
+    the index are replaced, so re-running on new downloads keeps counts exact.
+    documents lists further URLs that were re-extracted: the rows have none for a
+    document that no longer cites anything, and its old postings are removed too.
+    """
+    postings = Counter()
+    for citation, citation_page, section, _context, url in rows:
+        citation = normalize_citation(citation)
+        if citation:
+            postings[(citation, url, page_number(citation_page), sanitize_text(str(section)))] += 1
+
+    connection = connect(db_path)
+    with connection:
+        urls = {key[1] for key in postings} | set(documents)
+        document_ids = _ids(connection, "documents", "url", urls)
+        citation_ids = _ids(connection, "citations", "citation", {key[0] for key in postings})
+        replaced = [(document_ids[url],) for url in urls]
+        connection.executemany("DELETE FROM postings WHERE document_id = ?", replaced)
+        connection.executemany(
+            "INSERT INTO postings (citation_id, document_id, page, section, mentions) VALUES (?, ?, ?, ?, ?)",
+            ((citation_ids[c], document_ids[u], page, section, n) for (c, u, page, section), n in postings.items()),
+        )
+
+        # Derived tables are rebuilt from the postings in SQL
+        connection.executescript("""
+            DELETE FROM document_citations;
+            INSERT INTO document_citations (citation_id, document_id, mentions, first_page)
+                SELECT citation_id, document_id, SUM(mentions), MIN(page)
+                FROM postings GROUP BY citation_id, document_id;
+            UPDATE citations SET
+                mentions = COALESCE((SELECT SUM(mentions) FROM document_citations d WHERE d.citation_id = citations.id), 0),
+                documents = (SELECT COUNT(*) FROM document_citations d WHERE d.citation_id = citations.id);
+            DELETE FROM co_citations;
+            INSERT INTO co_citations (citation_a, citation_b, documents)
+                SELECT a.citation_id, b.citation_id, COUNT(*)
+                FROM document_citations a JOIN document_citations b
+                    ON a.document_id = b.document_id AND a.citation_id < b.citation_id
+                GROUP BY a.citation_id, b.citation_id;
+        """)
+    connection.close()
+    print(f"Indexed {sum(postings.values())} citations ({len(citation_ids)} distinct) in {db_path}")
+    return db_path
+
+
+def index_workbook(input_file="extracted_citations.xlsx", db_path="citations.sqlite"):
+    from openpyxl import load_workbook
+    workbook = load_workbook(input_file, read_only=True)
+    rows = workbook.active.iter_rows(min_row=2, max_col=5, values_only=True)
+    build_index((row for row in rows if row[0]), db_path)
+    workbook.close()
+    return db_path
+
+
+# =======
+# Queries
+# =======
+
+
+def _glob_escape(text):
+    """Makes GLOB's wildcards in text literal ("]" is only special inside a [...] class)."""
+    return re.sub(r"([\[*?])", r"[\1]", text)
+
+
+def _citation_filter(citation):
+    """Matches the citation itself and its subdivisions: "9 CFR 416" also finds "9 CFR 416.2"."""
+    citation = normalize_citation(citation)
+    prefix = _glob_escape(citation)
+    return "(c.citation = ? OR c.citation GLOB ? OR c.citation GLOB ?)", (citation, prefix + ".*", prefix + "(*")
+
+
+def citing_documents(connection, citation):
+    """(citation, url, mentions, first_page) for every document citing citation, most mentions first."""
+    where, params = _citation_filter(citation)
+    return connection.execute(f"""
+        SELECT c.citation, d.url, dc.mentions, dc.first_page
+        FROM citations c
+        JOIN document_citations dc ON dc.citation_id = c.id
+        JOIN documents d ON d.id = dc.document_id
+        WHERE {where}
+        ORDER BY dc.mentions DESC, d.url
+    """, params).fetchall()
+
+
+def postings_for(connection, citation):
+    """(citation, url, page, section, mentions) for every occurrence of citation."""
+    where, params = _citation_filter(citation)
+    return connection.execute(f"""
+        SELECT c.citation, d.url, p.page, p.section, p.mentions
+        FROM citations c
+        JOIN postings p ON p.citation_id = c.id
+        JOIN documents d ON d.id = p.document_id
+        WHERE {where}
+        ORDER BY d.url, p.page
+    """, params).fetchall()
+
+
+def top_citations(connection, limit=20):
+    """(citation, documents, mentions), most widely cited first."""
+    return connection.execute(
+        "SELECT citation, documents, mentions FROM citations ORDER BY documents DESC, mentions DESC LIMIT ?",
+        (limit,),
+    ).fetchall()
+
+
+def co_cited(connection, citation, limit=20):
+    """(other citation, documents citing both), for the exact normalized citation."""
+    row = connection.execute("SELECT id FROM citations WHERE citation = ?", (normalize_citation(citation),)).fetchone()
+    if not row:
+        return []
+    return connection.execute("""
+        SELECT c.citation, x.documents
+        FROM (SELECT citation_b AS other, documents FROM co_citations WHERE citation_a = :id
+              UNION ALL
+              SELECT citation_a AS other, documents FROM co_citations WHERE citation_b = :id) x
+        JOIN citations c ON c.id = x.other
+        ORDER BY x.documents DESC, c.citation
+        LIMIT :limit
+    """, {"id": row[0], "limit": limit}).fetchall()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the citation index.")
+    parser.add_argument("--input", help="Index this extracted_citations workbook")
+    parser.add_argument("--db", default="citations.sqlite")
+    parser.add_argument("--cites", help="List documents citing this citation (and its subdivisions)")
+    parser.add_argument("--pages", action="store_true", help="With --cites, list every page instead")
+    parser.add_argument("--co", help="List citations most often cited together with this one")
+    parser.add_argument("--top", type=int, help="List the N most widely cited citations")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        index_workbook(args.input, args.db)
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist; build it with --input first")
+
+    connection = sqlite3.connect(args.db)
+    if args.cites and args.pages:
+        for citation, url, page, section, mentions in postings_for(connection, args.cites):
+            print(f"{citation}\t{url}#page={page}\t{section}\t{mentions}")
+    elif args.cites:
+        for citation, url, mentions, first_page in citing_documents(connection, args.cites):
+            print(f"{citation}\t{url}\t{mentions} mentions, first on page {first_page}")
+    if args.co:
+        for citation, documents in co_cited(connection, args.co):
+            print(f"{citation}\t{documents} documents")
+    if args.top:
+        for citation, documents, mentions in top_citations(connection, args.top):
+            print(f"{citation}\t{documents} documents\t{mentions} mentions")
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,19 @@
 # Filename: extract_citations.py
 
 
-import requests
-import PyPDF2
+import io
 import re
 import os
+import mmap
 import tempfile
 import time
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
-from openpyxl import Workbook
-from openpyxl.styles import Alignment
-from openpyxl.utils import get_column_letter
+import sys
+from contextlib import contextmanager
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from instrumentation import count, timer
+from sharding import process_items
 
 
 def sanitize_text(text):
@@ -84,6 +86,12 @@ def clean_citation(citation):
     return citation
 
 
+# Keep downloaded PDFs in memory and hand the buffer straight to the PDF reader
+# (False: spill each download to a temporary file, e.g. for very large PDFs).
+IN_MEMORY = True
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
 def get_browser_headers():
     return {
         "User-Agent": (
@@ -96,7 +104,15 @@ def get_browser_headers():
     }
 
 
-def download_pdf(url):
+def download_pdf(url, in_memory=IN_MEMORY):
+    """
+    Downloads url. Returns an in-memory buffer (in_memory=True) or the path of a
+    temporary file; None if the download failed.
+    """
+    # Network, PDF and Excel libraries are imported where they are used, so index queries start fast
+    import requests
+    from urllib3.util.retry import Retry
+    from requests.adapters import HTTPAdapter
     try:
         session = requests.Session()
         retries = Retry(
@@ -112,8 +128,17 @@ def download_pdf(url):
         response.raise_for_status()
 
 
+        if in_memory:
+            buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+            buffer.seek(0)
+            print(f"Downloaded {url}")
+            return buffer
+
+
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        for chunk in response.iter_content(chunk_size=1024):
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
             temp_file.write(chunk)
         temp_file.close()
 
@@ -127,11 +152,20 @@ def download_pdf(url):
         return None
 
 
-def extract_toc(reader):
+def extract_toc(reader, max_pages=None, texts=None):
+    """
+    Headings and start pages from a "Table of Contents" in the first 10 pages (and
+    within max_pages). Pages without a text layer are not extracted; the text of the
+    others is stored in texts (page index -> text) for the citation scan to reuse.
+    """
     toc = []
     toc_pattern = r"(?P<heading>.+?)\s+(\d+)"
-    for page_num, page in enumerate(reader.pages[:10]):
-        text = page.extract_text()
+    texts = {} if texts is None else texts
+    for page_num, page in enumerate(reader.pages[:min(10, max_pages or 10)]):
+        if not has_text_layer(page):
+            continue
+        with timer("citations.page_extract"):
+            text = texts[page_num] = page.extract_text()
         if text and "Table of Contents" in text:
             matches = re.findall(toc_pattern, text)
             for match in matches:
@@ -156,11 +190,67 @@ def infer_section_name(toc, page_num, context, page_text):
     return "Unknown Section"
 
 
-def extract_us_code_citations(pdf_path, url):
+# Page triage: pages skipped without running the costly extract_text() or citation scan.
+# Every skip is appended to SKIPPED_PAGES_LOG (url, page, reason) so coverage can be audited.
+MAX_PAGES = None            # optional cap on pages scanned per document
+MIN_TEXT_DENSITY = None     # optional: skip pages whose share of letters is below this (forms, tables, scans)
+SKIPPED_PAGES_LOG = "skipped_pages.txt"
+TEXT_OBJECT = re.compile(rb"(?<![A-Za-z])BT(?![A-Za-z])")
+
+
+def has_text_layer(page):
+    """
+    Cheap content-stream check: a page with no BT text object (and no form
+    XObjects that could hold one) has nothing for extract_text() to return.
+    """
+    try:
+        contents = page.get_contents()
+        if contents is not None and TEXT_OBJECT.search(contents.get_data()):
+            return True
+        resources = page["/Resources"] if "/Resources" in page else {}
+        xobjects = resources["/XObject"] if "/XObject" in resources else {}
+        return any(xobject.get_object().get("/Subtype") == "/Form" for xobject in xobjects.values())
+    except Exception:
+        return True  # unusual structure: let extract_text() decide
+
+
+def text_density(text):
+    """Share of non-space characters that are letters (low for forms, number tables and OCR noise)."""
+    visible = [c for c in text if not c.isspace()]
+    return sum(c.isalpha() for c in visible) / len(visible) if visible else 0.0
+
+
+def log_skipped_page(url, page_num, reason):
+    count(f"citations.pages_skipped.{reason}")
+    with open(SKIPPED_PAGES_LOG, "a", encoding="utf-8") as f:
+        f.write(f"{url}\t{page_num}\t{reason}\n")
+
+
+@contextmanager
+def open_pdf(pdf):
+    """
+    A seekable stream for pdf: buffers and file objects are used as they are,
+    paths are memory-mapped instead of read through the file API.
+    """
+    if not isinstance(pdf, (str, os.PathLike)):
+        yield pdf
+        return
+    with open(pdf, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield file  # empty files cannot be mapped; let the reader report them
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def extract_us_code_citations(pdf, url, max_pages=MAX_PAGES, min_density=MIN_TEXT_DENSITY):
+    """Citations in pdf (a path or an in-memory buffer) as (citation, page URL, section, context, url) rows."""
+    import PyPDF2
     try:
-        with open(pdf_path, 'rb') as file:
+        with open_pdf(pdf) as file:
             reader = PyPDF2.PdfReader(file)
-            toc = extract_toc(reader)
+            texts = {}  # pages already extracted by the TOC pass
+            toc = extract_toc(reader, max_pages, texts)
             num_pages = len(reader.pages)
             citations = []
 
@@ -178,8 +268,23 @@ def extract_us_code_citations(pdf_path, url):
 
 
             for page_num in range(num_pages):
+                if max_pages and page_num >= max_pages:
+                    for skipped in range(page_num, num_pages):
+                        log_skipped_page(url, skipped + 1, "page_cap")
+                    break
                 page = reader.pages[page_num]
-                text = page.extract_text()
+                if not has_text_layer(page):
+                    log_skipped_page(url, page_num + 1, "no_text_layer")
+                    continue
+                if page_num in texts:
+                    text = texts.pop(page_num)
+                else:
+                    with timer("citations.page_extract"):
+                        text = page.extract_text()
+                count("citations.pages")
+                if text and min_density and text_density(text) < min_density:
+                    log_skipped_page(url, page_num + 1, "low_density")
+                    continue
                 if text:
                     matches = re.finditer(citation_pattern, text, re.IGNORECASE)
                     for match in matches:
@@ -192,21 +297,26 @@ def extract_us_code_citations(pdf_path, url):
                         citations.append((citation, citation_page_url, section_name, context, url))
         return citations
     except Exception as e:
-        print(f"Error processing {pdf_path}: {e}")
+        print(f"Error processing {url}: {e}")
         return []
 
 
-def process_url(url):
-    temp_file = download_pdf(url)
-    if not temp_file:
-        return []
+def process_url(url, max_pages=MAX_PAGES, min_density=MIN_TEXT_DENSITY, in_memory=IN_MEMORY):
+    """Citation rows of the PDF at url, or None when it could not be downloaded."""
+    pdf = download_pdf(url, in_memory)
+    if pdf is None:
+        return None
     try:
-        return extract_us_code_citations(temp_file, url)
+        return extract_us_code_citations(pdf, url, max_pages, min_density)
     finally:
-        os.remove(temp_file)
+        if isinstance(pdf, str):
+            os.remove(pdf)
 
 
 def save_to_excel(data, filename="extracted_citations.xlsx"):
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment
+    from openpyxl.utils import get_column_letter
     workbook = Workbook()
     sheet = workbook.active
     sheet.append(["Citation", "Citation Page", "Inferred Section Name", "Context", "URL"])
@@ -237,327 +347,345 @@ def save_to_excel(data, filename="extracted_citations.xlsx"):
     print(f"Saved data to {filename}")
 
 
-def main():
-    url_list = [        
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10000.1_0.pdf",
-        "https://www.fsis.usda.gov/policy/fsis-directives/10010.1.pdf",
-        "https://www.fsis.usda.gov/policy/fsis-directives/10010.2",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2022-05/4338.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10010.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1010.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10010.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1020.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10210.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10230.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10230.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10250.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10250.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10310.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1040.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10400.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1045.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1050.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1060.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1070.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1090.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1090.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10900.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1230.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1232.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1240.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12600.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12600.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12700.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.15.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1304.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.11.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.13.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.12.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.14.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.15.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.16.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.17.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.18.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.19.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.20.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.21.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.22.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1307.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1310.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1310.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1320.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1400.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14000.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14400.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1450.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14950.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1510.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1510.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1520.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2200.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2200.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2410.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2410.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2500.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2500.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2530.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2532.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2610.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2610.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2640.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2650.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2660.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2680.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2780.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2791.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3200.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3200.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3230.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3410.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4400.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5110.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5110.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5220.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5220.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5420.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5420.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5600.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5610.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/dr-4030-335-002.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/dr-4040-430.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5620.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5710.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5720.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5730.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5720.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5740.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6020.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6030.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6090.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4339.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4351.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4420.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4440.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.12.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4461.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4500.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4530.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4531.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4536.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4551.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4591.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4711.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4713.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4713.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4732.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4771.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.11.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.12.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.13.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.16.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4810.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4831.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.10.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.15.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5010.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5020.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5020.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5030.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5030.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5060.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5090.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6110.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6120.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6170.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6210.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6240.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6300.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6330.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6400.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6410.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6410.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6420.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6420.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6500.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6600.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6600.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6700.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6900.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6910.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7010.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7020.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7111.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7120.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7130.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7150.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7221.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7230.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7310.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7320.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7355.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7520.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7530.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7530.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7620.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8021.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8030.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8080.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8080.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8091.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8091.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8140.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8150.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8160.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8410.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9010.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9040.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9040.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.9.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9510.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9530.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9700.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9770.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9780.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9790.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.1.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.2.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.3.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.4.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.5.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.6.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.7.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.8.pdf",
-        "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9910.1.pdf",
-    ]
-
-
-    all_citations = []
-    for url in url_list:
-        all_citations.extend(process_url(url))
+DEFAULT_URLS = [
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10000.1_0.pdf",
+    "https://www.fsis.usda.gov/policy/fsis-directives/10010.1.pdf",
+    "https://www.fsis.usda.gov/policy/fsis-directives/10010.2",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2022-05/4338.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-08/10010.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1010.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10010.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1020.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10210.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10230.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10230.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10240.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10250.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10250.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10310.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1040.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10400.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1045.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1050.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1060.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1070.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10800.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1090.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1090.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/10900.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1210.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1230.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1232.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1240.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12600.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12600.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/12700.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.15.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1300.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/13000.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1304.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.11.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.13.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.12.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.14.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.15.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.16.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.17.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.18.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.19.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.20.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.21.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.22.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1306.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1307.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1310.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1310.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1320.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1400.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14000.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14400.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1450.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/14950.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1510.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1510.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/1520.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2100.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2200.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2200.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2410.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2410.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2450.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2500.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2500.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2530.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2532.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2610.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2610.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2620.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2640.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2650.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2660.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2680.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2780.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/2791.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3200.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3200.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3230.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3300.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/3410.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4400.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5100.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5110.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5110.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5220.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5220.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5420.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5420.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5500.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5600.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5610.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/dr-4030-335-002.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/dr-4040-430.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5620.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5710.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5720.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5730.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5720.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5740.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6020.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6030.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6090.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6100.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4339.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4351.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4410.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4420.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4430.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4440.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.12.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4451.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4461.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4500.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4530.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4531.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4536.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4550.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4551.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4591.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4610.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4630.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4711.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4713.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4713.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4732.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4735.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4771.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.11.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.12.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.13.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.16.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4791.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4810.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/4831.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.10.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.15.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5000.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5010.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5020.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5020.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5030.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5030.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5060.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/5090.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6110.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6120.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6170.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6210.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6240.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6300.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6330.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6400.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6410.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6410.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6420.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6420.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6500.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6600.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6600.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6700.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6900.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/6910.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7000.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7010.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7020.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7111.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7120.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7130.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7150.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7160.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7221.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7230.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7310.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7320.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7355.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7520.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7530.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7530.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/7620.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8010.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8021.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8030.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8080.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8080.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8091.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8091.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8140.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8150.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8160.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/8410.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9000.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9010.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9040.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9040.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9500.9.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9510.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9530.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9700.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9770.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9780.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9790.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.1.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.2.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.3.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.4.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.5.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.6.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.7.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9900.8.pdf",
+    "https://www.fsis.usda.gov/sites/default/files/media_file/2020-07/9910.1.pdf",
+]
+
+
+def main(url_list=None, filename="extracted_citations.xlsx", index_file=None,
+         max_pages=MAX_PAGES, min_density=MIN_TEXT_DENSITY, in_memory=IN_MEMORY, shard=None, queue_file=None):
+    if url_list is None:
+        url_list = DEFAULT_URLS
+
+
+    def process(url):
+        citations = process_url(url, max_pages, min_density, in_memory)
         time.sleep(3)  # pause between downloads to mimic human browsing
+        return citations
+
+
+    # shard (i, N) processes only the PDFs hashing to that shard; queue_file leases them (see sharding.py)
+    results = process_items(url_list, process, "citations", shard, queue_file, desc="Processed PDFs")
+    extracted = [url for url in url_list if results.get(url) is not None]  # downloaded, with or without citations
+    all_citations = [tuple(row) for url in extracted for row in results[url]]
 
 
-    save_to_excel(all_citations)
+    save_to_excel(all_citations, filename)
+    if index_file:
+        # Deduplicated, queryable citation index (see citation_index.py)
+        try:
+            from extract_citations.citation_index import build_index
+        except ImportError:
+            from citation_index import build_index
+        build_index(all_citations, index_file, documents=extracted)
 
 
 if __name__ == "__main__":
@@ -11,11 +11,22 @@ Requirements:
 """
 
 import pandas as pd
-import openai
 import time
-
-# Set your OpenAI API key securely
-client = openai.OpenAI(api_key="sk-...")  # <-- Insert your API key here
+from instrumentation import count, timer
+from ivn_output import read_table, write_table
+from ivn_generate_unique_IDs_for_components import component_ids
+from sharding import process_items
+
+# Set your OpenAI API key securely (falls back to the OPENAI_API_KEY environment variable)
+OPENAI_API_KEY = None  # <-- Insert your API key here
+_client = None
+
+def get_client():
+    global _client
+    if _client is None:
+        import openai
+        _client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    return _client
 
 # Settings
 INPUT_FILE = "ivntest.xlsx"
@@ -23,6 +34,7 @@ OUTPUT_FILE = "generated_recommendations.xlsx"
 SAVE_INTERVAL = 5  # Save every N rows
 
 def generate_recommendation(enabling_desc, dependent_desc):
+    import openai  # only needed once recommendations are actually generated
     prompt = f"""
 You are a policy analyst generating rich, strategic recommendations for the USDA Wildlife Services Nonlethal Initiative (WS NLI).
 Given the following context:
@@ -39,12 +51,14 @@ Avoid generic or vague language.
 """
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=250
-        )
+        with timer("recommend.llm_call"):
+            response = get_client().chat.completions.create(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=250
+            )
+        count("recommend.llm_calls")
         return response.choices[0].message.content.strip()
 
     except openai.RateLimitError:
@@ -61,14 +75,50 @@ Avoid generic or vague language.
         print(f"Unexpected error: {e}")
         return "ERROR: " + str(e)
 
-def main():
+def generate_sharded(df, output_file, shard, queue_file=None):
+    """
+    Fills the Recommendation column for the rows whose (Enabling, Dependent) component
+    ID pair hashes to shard; queue_file leases the pairs through a shared queue.
+    """
+    todo = df["Recommendation"].isna() | (df["Recommendation"].astype(str).str.strip() == "")
+    todo &= df["Enabling Component Description"].notna() & df["Dependent Component Description"].notna()
+    keys = component_ids(df, "Enabling") + ":" + component_ids(df, "Dependent")
+    rows_by_key = keys[todo].groupby(keys[todo]).groups
+    df["Recommendation"] = df["Recommendation"].astype(object)
+    saved = 0
+
+    def generate(key):
+        row = df.loc[rows_by_key[key][0]]
+        return generate_recommendation(str(row["Enabling Component Description"]), str(row["Dependent Component Description"]))
+
+    def fill(key, rec):
+        nonlocal saved
+        df.loc[rows_by_key[key], "Recommendation"] = rec
+        saved += 1
+        if saved % SAVE_INTERVAL == 0:
+            write_table(df, output_file)
+
+    results = process_items(list(rows_by_key), generate, "recommend", shard, queue_file,
+                            desc="Generated recommendations", on_result=fill)
+    # Items finished before a restart (or by another worker of this shard) only come back here
+    for key, rec in results.items():
+        df.loc[rows_by_key[key], "Recommendation"] = rec
+    return df
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, shard=None, queue_file=None):
     try:
-        df = pd.read_excel(OUTPUT_FILE)  # Try to resume from output file
-        print(f"Resuming from {OUTPUT_FILE}")
+        df = read_table(output_file)  # Try to resume from output file
+        print(f"Resuming from {output_file}")
     except FileNotFoundError:
-        df = pd.read_excel(INPUT_FILE)
+        df = pd.read_excel(input_file)
         df["Recommendation"] = ""
 
+    if shard or queue_file:
+        df = generate_sharded(df, output_file, shard, queue_file)
+        write_table(df, output_file)
+        print(f"Shard recommendations saved to {output_file}")
+        return
+
     for idx, row in df.iterrows():
         if pd.notna(row["Recommendation"]) and str(row["Recommendation"]).strip() != "":
             continue  # Skip completed rows
@@ -81,11 +131,11 @@ def main():
         df.at[idx, "Recommendation"] = rec
 
         if idx % SAVE_INTERVAL == 0:
-            df.to_excel(OUTPUT_FILE, index=False)
+            write_table(df, output_file)
             print(f"Progress saved at row {idx+1}")
 
-    df.to_excel(OUTPUT_FILE, index=False)
-    print(f"All recommendations saved to {OUTPUT_FILE}")
+    write_table(df, output_file)
+    print(f"All recommendations saved to {output_file}")
 
 if __name__ == "__main__":
     main()
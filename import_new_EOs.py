@@ -1,20 +1,34 @@
 import re
+import os
+import html
+import json
 import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+import requests
+from instrumentation import count, timer
 
 
-# Create a new Excel workbook
-wb = openpyxl.Workbook()
-ws = wb.active
-ws.title = "Executive Orders"
-ws.append(["Executive Order Number", "First 300 Words"])
+# Settings
+OUTPUT_FILE = "executive_orders_300_words.xlsx"
+STATE_FILE = "executive_orders_state.json"  # High-water mark and per-EO hashes for incremental syncs
+CACHE_DIR = "eo_cache"  # On-disk cache of Federal Register responses
+MAX_WORKERS = 8  # Concurrent HTTP requests
+REQUESTS_PER_SECOND = 5  # Shared rate limit across all workers
+RECHECK_WINDOW = 10  # Newest ingested EOs whose text is re-fetched on every sync to catch revisions
+
+API_URL = "https://www.federalregister.gov/api/v1/documents.json"
+API_FIELDS = [
+    "executive_order_number",
+    "document_number",
+    "title",
+    "signing_date",
+    "publication_date",
+    "html_url",
+    "raw_text_url",
+]
 
 
 def get_first_300_words(text):
@@ -22,7 +36,146 @@ def get_first_300_words(text):
     return ' '.join(words[:300])
 
 
-def fetch_executive_orders(start_eo=14147, end_eo=14257):
+# ==========================
+# Plain HTTP fetch (default)
+# ==========================
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class CachedFetcher:
+    """Rate-limited HTTP GET with responses cached on disk by URL."""
+
+    def __init__(self, cache_dir=CACHE_DIR, rate=REQUESTS_PER_SECOND):
+        self.cache_dir = cache_dir
+        self.limiter = RateLimiter(rate)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Mozilla/5.0"
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def get(self, url, params=None, use_cache=True):
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+        path = self.cache_path(url)
+        if use_cache and os.path.exists(path):
+            count("eos.cache_hits")
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+
+        self.limiter.wait()
+        with timer("eos.http_request"):
+            response = self.session.get(url, timeout=30)
+        count("eos.http_requests")
+        response.raise_for_status()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        return response.text
+
+
+def parse_document_index(payload):
+    """
+    Maps EO number -> document metadata from a documents.json response body.
+    Documents without an executive order number are ignored.
+    """
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    documents = {}
+    for doc in payload.get("results") or []:
+        number = doc.get("executive_order_number")
+        if number in (None, ""):
+            continue
+        try:
+            documents[int(number)] = doc
+        except (TypeError, ValueError):
+            continue
+    return documents
+
+
+def parse_raw_text(body):
+    """
+    Converts a Federal Register raw-text response to plain text. The endpoint
+    wraps the text in a minimal HTML page, so tags and entities are stripped.
+    """
+    text = re.sub(r"<[^>]+>", " ", body)
+    text = html.unescape(text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def fetch_document_index(fetcher, start_eo, end_eo=None, use_cache=False):
+    """
+    Pages through the executive order listing (newest first) until the start
+    of the requested range, returning EO number -> metadata. end_eo=None
+    leaves the range open-ended.
+    """
+    documents = {}
+    page = 1
+    while True:
+        params = [
+            ("conditions[type][]", "PRESDOCU"),
+            ("conditions[presidential_document_type][]", "executive_order"),
+            ("order", "newest"),
+            ("per_page", 1000),
+            ("page", page),
+        ] + [("fields[]", field) for field in API_FIELDS]
+        payload = json.loads(fetcher.get(API_URL, params=params, use_cache=use_cache))
+        batch = parse_document_index(payload)
+        documents.update({n: doc for n, doc in batch.items() if start_eo <= n and (end_eo is None or n <= end_eo)})
+        if not batch or min(batch) <= start_eo or not payload.get("next_page_url"):
+            break
+        page += 1
+    return documents
+
+
+def fetch_texts_http(documents, fetcher, max_workers=MAX_WORKERS, use_cache=True):
+    """Fetches raw text for each document concurrently. Returns EO number -> text or None."""
+    def fetch_one(item):
+        eo_num, doc = item
+        url = doc.get("raw_text_url")
+        if not url:
+            return eo_num, None
+        try:
+            return eo_num, parse_raw_text(fetcher.get(url, use_cache=use_cache))
+        except requests.RequestException as e:
+            print(f"Error fetching EO {eo_num} over HTTP: {e}")
+            return eo_num, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(fetch_one, documents.items()))
+
+
+# =========================
+# Selenium fetch (fallback)
+# =========================
+
+
+def fetch_texts_selenium(eo_numbers):
+    """Renders each EO page in headless Chrome. Only used for EOs the HTTP path missed."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from webdriver_manager.chrome import ChromeDriverManager
+
     base_url = "https://www.federalregister.gov/executive-order/"
 
 
@@ -38,7 +191,8 @@ def fetch_executive_orders(start_eo=14147, end_eo=14257):
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
 
-    for eo_num in range(start_eo, end_eo + 1):
+    texts = {}
+    for eo_num in eo_numbers:
         eo_url = f"{base_url}{eo_num}"
         print(f"Fetching EO {eo_num} from {eo_url}...")
         try:
@@ -52,9 +206,7 @@ def fetch_executive_orders(start_eo=14147, end_eo=14257):
                 article_body = driver.find_element(By.TAG_NAME, "main")
 
 
-            text = article_body.text
-            first_300_words = get_first_300_words(text)
-            ws.append([f"EO {eo_num}", first_300_words])
+            texts[eo_num] = article_body.text
         except Exception as e:
             print(f"Error fetching EO {eo_num}: {e}")
             continue
@@ -64,13 +216,159 @@ def fetch_executive_orders(start_eo=14147, end_eo=14257):
 
 
     driver.quit()
-    wb.save("executive_orders_300_words.xlsx")
-    print("Done. File saved as executive_orders_300_words.xlsx")
+    return texts
 
 
-# Run the script
-fetch_executive_orders()
+def fetch_executive_orders(start_eo=14147, end_eo=14257, mode="http", fallback=True, output_file=OUTPUT_FILE):
+    """
+    Writes the first 300 words of each EO in the range to an Excel workbook.
+    mode="http" uses the Federal Register API and, if fallback is set, falls
+    back to Selenium for any EO it could not retrieve; mode="selenium" uses
+    the browser only.
+    """
+    eo_numbers = list(range(start_eo, end_eo + 1))
+    texts = {}
+
+    if mode == "http":
+        fetcher = CachedFetcher()
+        try:
+            documents = fetch_document_index(fetcher, start_eo, end_eo)
+            print(f"Found {len(documents)} EOs in the Federal Register index.")
+            texts = fetch_texts_http(documents, fetcher)
+        except requests.RequestException as e:
+            print(f"Federal Register API unavailable: {e}")
+
+    missing = [n for n in eo_numbers if not texts.get(n)]
+    if missing and (mode == "selenium" or fallback):
+        if mode == "http":
+            print(f"Falling back to Selenium for {len(missing)} EOs...")
+        texts.update(fetch_texts_selenium(missing))
+
+    # Create a new Excel workbook
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Executive Orders"
+    ws.append(["Executive Order Number", "First 300 Words"])
+    for eo_num in eo_numbers:
+        if texts.get(eo_num):
+            ws.append([f"EO {eo_num}", get_first_300_words(texts[eo_num])])
+
+    wb.save(output_file)
+    print(f"Done. File saved as {output_file}")
+
+
+# ======================
+# Incremental ingestion
+# ======================
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
 
+def metadata_fingerprint(doc):
+    """Hash of the index metadata; a change means the EO should be re-fetched."""
+    return content_hash(json.dumps(doc, sort_keys=True, default=str))
 
 
+def load_state(state_file=STATE_FILE):
+    try:
+        with open(state_file, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"high_water_mark": None, "orders": {}}
 
+
+def save_state(state, state_file=STATE_FILE):
+    temp_file = state_file + ".tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(temp_file, state_file)
+
+
+def open_store(output_file=OUTPUT_FILE):
+    """Opens the EO workbook (creating it if needed) and maps each EO label to its row."""
+    if os.path.exists(output_file):
+        wb = openpyxl.load_workbook(output_file)
+        ws = wb["Executive Orders"]
+    else:
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Executive Orders"
+        ws.append(["Executive Order Number", "First 300 Words"])
+    rows = {ws.cell(row=r, column=1).value: r for r in range(2, ws.max_row + 1)}
+    return wb, ws, rows
+
+
+def sync_executive_orders(start_eo=14147, output_file=OUTPUT_FILE, state_file=STATE_FILE, fallback=False,
+                          recheck_window=RECHECK_WINDOW):
+    """
+    Brings the EO workbook up to date without re-scraping the whole range.
+    The index is only paged down to the stored high-water mark, less a
+    re-check window (and to any EO a previous sync listed but could not
+    fetch). From that, it fetches EOs never ingested, EOs whose index
+    metadata changed, and the newest recheck_window ingested EOs, whose text
+    may have been revised without an index change. Fetched text is only
+    written when its content hash differs from the stored one; new EOs are
+    appended and changed EOs are updated in place.
+    """
+    state = load_state(state_file)
+    orders = state["orders"]
+    high_water_mark = state["high_water_mark"]
+    fetcher = CachedFetcher()
+
+    lowest = start_eo
+    if high_water_mark is not None:
+        recheck_from = high_water_mark - recheck_window + 1
+        lowest = max(start_eo, min([recheck_from] + state.get("pending", [])))
+    documents = fetch_document_index(fetcher, lowest)
+    fingerprints = {n: metadata_fingerprint(doc) for n, doc in documents.items()}
+    to_fetch = {
+        n: doc for n, doc in documents.items()
+        if orders.get(str(n), {}).get("fingerprint") != fingerprints[n]
+        or (high_water_mark is not None and n >= high_water_mark - recheck_window + 1)
+    }
+    print(f"Index lists {len(documents)} EOs from {lowest}; "
+          f"high-water mark {high_water_mark}; {len(to_fetch)} new, changed or re-checked.")
+    if not to_fetch:
+        print(f"Nothing to do. {output_file} is up to date.")
+        return
+
+    # Changed documents must bypass the response cache to see the new text
+    texts = fetch_texts_http(to_fetch, fetcher, use_cache=False)
+    missing = [n for n in to_fetch if not texts.get(n)]
+    if missing and fallback:
+        print(f"Falling back to Selenium for {len(missing)} EOs...")
+        texts.update(fetch_texts_selenium(missing))
+
+    wb, ws, rows = open_store(output_file)
+    added = updated = 0
+    for eo_num in sorted(to_fetch):
+        text = texts.get(eo_num)
+        if not text:
+            continue
+        key = str(eo_num)
+        label = f"EO {eo_num}"
+        digest = content_hash(text)
+        if orders.get(key, {}).get("content_hash") != digest or label not in rows:
+            if label in rows:
+                ws.cell(row=rows[label], column=2).value = get_first_300_words(text)
+                updated += 1
+            else:
+                ws.append([label, get_first_300_words(text)])
+                rows[label] = ws.max_row
+                added += 1
+        orders[key] = {"content_hash": digest, "fingerprint": fingerprints[eo_num]}
+
+    state["pending"] = sorted(n for n in to_fetch if str(n) not in orders)  # retried by the next sync
+    if orders:
+        state["high_water_mark"] = max(int(n) for n in orders)
+    wb.save(output_file)
+    save_state(state, state_file)
+    print(f"Done. Added {added} and updated {updated} EOs in {output_file} "
+          f"(high-water mark {state['high_water_mark']}).")
+
+
+# Run the script
+if __name__ == "__main__":
+    sync_executive_orders()
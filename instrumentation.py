@@ -0,0 +1,200 @@
+# This is instrumentation.py
+# Timers, counters and throttled progress for the IVN scripts, plus opt-in profiling.
+# Everything is recorded in one process-wide registry and written out at the end of a run as JSON
+# or as a Prometheus textfile (chosen by the file extension: .prom writes the textfile format).
+#
+# Example:
+#   python ivn.py --metrics run_metrics.json --profile cprofile run scrub ids similarity ...
+#   IVN_METRICS=/var/lib/node_exporter/ivn.prom python ivn.py similarity
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Named timers (calls, total and max seconds) and counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+        self.started = time.time()
+
+    def add_time(self, name, seconds, calls=1):
+        with self.lock:
+            timer = self.timers.setdefault(name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+            timer["calls"] += calls
+            timer["seconds"] += seconds
+            timer["max_seconds"] = max(timer["max_seconds"], seconds / calls if calls else seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self.lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "started": self.started,
+                "wall_seconds": round(time.time() - self.started, 4),
+                "timers": {name: dict(timer) for name, timer in sorted(self.timers.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def timer(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_time(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator form of timer()."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    metrics.count(name, n)
+
+
+class Progress:
+    """
+    Progress line that prints at most once every `interval` seconds (and once
+    at the end), instead of on every item.
+    """
+
+    def __init__(self, total, desc, interval=2.0, stream=None):
+        self.total = total
+        self.desc = desc
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.done = 0
+        self.start = time.time()
+        self.last = 0.0
+
+    def update(self, n=1):
+        self.done += n
+        now = time.time()
+        if now - self.last >= self.interval or self.done >= self.total:
+            self.last = now
+            self.report(now)
+
+    def report(self, now=None):
+        elapsed = (now or time.time()) - self.start
+        remaining = elapsed / self.done * (self.total - self.done) if self.done else 0
+        print(f"\r{self.desc}: {self.done}/{self.total} | Elapsed: {elapsed:.1f}s "
+              f"| Estimated Time Left: {remaining:.1f}s", end="", file=self.stream, flush=True)
+
+    def close(self):
+        self.report()
+        print(file=self.stream)
+
+
+# ======
+# Output
+# ======
+
+
+def _prometheus_name(name):
+    return name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_prometheus(snapshot):
+    lines = [
+        "# HELP ivn_run_wall_seconds Wall time of the run.",
+        "# TYPE ivn_run_wall_seconds gauge",
+        f"ivn_run_wall_seconds {snapshot['wall_seconds']}",
+        "# HELP ivn_timer_seconds_total Time spent per stage or function.",
+        "# TYPE ivn_timer_seconds_total counter",
+    ]
+    lines += [f'ivn_timer_seconds_total{{name="{_prometheus_name(n)}"}} {t["seconds"]:.6f}'
+              for n, t in snapshot["timers"].items()]
+    lines += ["# HELP ivn_timer_calls_total Calls per stage or function.", "# TYPE ivn_timer_calls_total counter"]
+    lines += [f'ivn_timer_calls_total{{name="{_prometheus_name(n)}"}} {t["calls"]}'
+              for n, t in snapshot["timers"].items()]
+    lines += ["# HELP ivn_timer_max_seconds Slowest single call.", "# TYPE ivn_timer_max_seconds gauge"]
+    lines += [f'ivn_timer_max_seconds{{name="{_prometheus_name(n)}"}} {t["max_seconds"]:.6f}'
+              for n, t in snapshot["timers"].items()]
+    lines += ["# HELP ivn_events_total Counted events.", "# TYPE ivn_events_total counter"]
+    lines += [f'ivn_events_total{{name="{_prometheus_name(n)}"}} {v}' for n, v in snapshot["counters"].items()]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path):
+    """Writes the registry to path (JSON, or Prometheus textfile for *.prom) atomically."""
+    snapshot = metrics.snapshot()
+    if path.endswith(".prom"):
+        content = format_prometheus(snapshot)
+    else:
+        content = json.dumps(snapshot, indent=2)
+    temp_file = path + ".tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_file, path)
+    print(f"📊 Metrics saved to {path}", file=sys.stderr)
+
+
+# =========
+# Profiling
+# =========
+
+
+@contextmanager
+def profiled(mode=None, output=None):
+    """
+    Profiles the enclosed block when mode is "cprofile" or "pyinstrument"
+    (default: the IVN_PROFILE environment variable). The report goes to
+    output, or ivn_profile.prof / ivn_profile.html.
+    """
+    mode = mode or os.environ.get("IVN_PROFILE")
+    if not mode:
+        yield
+        return
+
+    if mode == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            output = output or "ivn_profile.prof"
+            profiler.dump_stats(output)
+            print(f"🧪 cProfile stats saved to {output} (view with: python -m pstats {output})", file=sys.stderr)
+    elif mode == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            output = output or "ivn_profile.html"
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+            print(f"🧪 pyinstrument report saved to {output}", file=sys.stderr)
+    else:
+        raise ValueError(f"Unknown profiler '{mode}'. Use 'cprofile' or 'pyinstrument'.")
@@ -0,0 +1,299 @@
+# This is ivn.py
+# Single command-line entry point for the IVN scripts.
+#
+# Examples:
+#   python ivn.py scrub --input ivntest.xlsx --output IVN_Dataset_Cleaned.xlsx
+#   python ivn.py names --pin "APHIS WS" "APHIS Wildlife Services"
+#   python ivn.py similarity --input ivntest.xlsx --threshold 0.6
+#   python ivn.py semantic --input ivntest.xlsx --backend lsa --threshold 0.6
+#   python ivn.py run scrub ids similarity --input ivntest.xlsx --output similarity_scores_filtered.xlsx
+#   python ivn.py sweep fuzzy --input ivntest.xlsx --cut 0.05 --output fuzzy_0.05.csv
+#   python ivn.py serve --input ivntest.xlsx  (then: curl 'http://127.0.0.1:8765/topk?component=...&k=5')
+#   python ivn.py eos --start 14147
+#   python ivn.py cites --input extracted_citations.xlsx --cites "9 CFR 416"
+#   python ivn.py urls --shard 0/4 --queue jobs.sqlite --output checked.0.xlsx  (then: ivn merge urls ...)
+#   python ivn.py --metrics metrics.prom --profile cprofile run scrub ids --input ivntest.xlsx --output out.xlsx
+
+import os
+import argparse
+
+
+def output_path(args, default):
+    """--output (or the subcommand's default), with its extension switched by --output-format."""
+    from ivn_output import with_format
+    return with_format(args.output or default, args.output_format)
+
+
+def cmd_scrub(args):
+    from scrub_IVN_Excel import main
+    main(args.input or "ivntest.xlsx", output_path(args, "IVN_Dataset_Cleaned.xlsx"),
+         cache_file=None if args.no_name_cache else args.name_cache)
+
+
+def cmd_names(args):
+    from scrub_IVN_Excel import NameCache
+    cache = NameCache(args.name_cache)
+    try:
+        if args.pin:
+            cache.pin(*args.pin, column=args.column)
+            print(f"📌 '{args.pin[0]}' -> '{args.pin[1]}' ({args.column})")
+        if args.unpin:
+            removed = cache.unpin(args.unpin, column=args.column)
+            print(f"{'🗑️ Unpinned' if removed else '⚠️ No pin for'} '{args.unpin}' ({args.column})")
+        for column, variant, canonical in cache.pins():
+            print(f"{column}\t{variant}\t{canonical}")
+    finally:
+        cache.close()
+
+
+def cmd_ids(args):
+    from ivn_generate_unique_IDs_for_components import main
+    main(args.input or "IVN-public-version.xlsx", output_path(args, "IVN-public-with-IDs.xlsx"))
+
+
+def cmd_urls(args):
+    from Infer_URLs import main
+    if args.incremental:
+        output_file = output_path(args, args.output) if args.output else None
+        main(args.input or "ivntest.xlsx", output_file, incremental=True, state_file=args.state, report_file=args.report)
+    else:
+        main(args.input or "ivntest.xlsx", output_path(args, "ivntest_checked.xlsx"), shard=args.shard,
+             queue_file=args.queue)
+
+
+def cmd_similarity(args):
+    from similarity_scores import main
+    main(args.input or "ivntest.xlsx", output_path(args, "similarity_scores_filtered.xlsx"), args.threshold,
+         prune=not args.no_prune, max_df=args.candidate_max_df, agency=args.agency)
+
+
+def cmd_fuzzy(args):
+    from ivn_fuzzy_match import main
+    main(args.input or "ivntest.xlsx", output_path(args, "ivn_similarity_scores_complete_above_threshold.csv"),
+         args.threshold, args.workers)
+
+
+def cmd_semantic(args):
+    from semantic_similarity import main
+    main(args.input or "ivntest.xlsx", output_path(args, "semantic_similarity_scores.xlsx"), args.backend,
+         args.threshold, args.store)
+
+
+def cmd_sweep(args):
+    from threshold_sweep import main
+    if args.cut is not None and not args.output:
+        raise SystemExit("ivn sweep: --cut needs --output")
+    main(args.input or "ivntest.xlsx", args.method, args.floor, args.thresholds, args.step, args.report,
+         args.cut, output_path(args, args.output) if args.output else None, args.top, args.top_output,
+         args.workers, args.cache_dir, not args.no_cache, args.candidate_max_df, args.agency)
+
+
+def cmd_serve(args):
+    from similarity_server import serve
+    serve(args.input or "ivntest.xlsx", args.host, args.port, args.cache_dir)
+
+
+def cmd_keywords(args):
+    from keyword_matching import main
+    main(args.input or "ivntest.xlsx", output_path(args, "ivntest_keywords.xlsx"), args.keywords)
+
+
+def cmd_recommend(args):
+    from generate_ivn_recommendations import main
+    main(args.input or "ivntest.xlsx", output_path(args, "generated_recommendations.xlsx"), shard=args.shard,
+         queue_file=args.queue)
+
+
+def cmd_citations(args):
+    from extract_citations.extract_citations import main
+    url_list = None
+    if args.urls:
+        with open(args.urls, encoding="utf-8") as f:
+            url_list = [line.strip() for line in f if line.strip()]
+    main(url_list, args.output or "extracted_citations.xlsx", args.index,
+         max_pages=args.max_pages, min_density=args.min_density, in_memory=not args.temp_files,
+         shard=args.shard, queue_file=args.queue)
+
+
+def cmd_cites(args):
+    from extract_citations.citation_index import main
+    argv = ["--db", args.db]
+    for flag in ("input", "cites", "co", "top"):
+        if getattr(args, flag) is not None:
+            argv += [f"--{flag}", str(getattr(args, flag))]
+    main(argv + (["--pages"] if args.pages else []))
+
+
+def cmd_eos(args):
+    import import_new_EOs
+    output_file = args.output or import_new_EOs.OUTPUT_FILE
+    if args.full:
+        import_new_EOs.fetch_executive_orders(args.start, args.end, mode=args.mode, output_file=output_file)
+    else:
+        import_new_EOs.sync_executive_orders(args.start, output_file=output_file)
+
+
+def cmd_merge(args):
+    from sharding import merge_shards
+    merge_shards(args.job, args.shards, output_path(args, args.output))
+
+
+def cmd_run(args):
+    from pipeline import make_stage, run_pipeline, save_output
+    from keyword_matching import load_keywords
+    params = {
+        "similarity": {"threshold": args.threshold} if args.threshold is not None else {},
+        "fuzzy": dict({"threshold": args.threshold} if args.threshold is not None else {}, workers=args.workers),
+        "urls": {"check": not args.skip_url_check},
+    }
+    if "keywords" in args.stages:
+        # The keyword list itself is a stage parameter, so editing the Keywords tab invalidates the cache
+        params["keywords"] = {"keywords": tuple(load_keywords(args.keywords or args.input))}
+    stages = [make_stage(name, **params.get(name, {})) for name in args.stages]
+    df = run_pipeline(args.input, stages, cache_dir=args.cache_dir, use_cache=not args.no_cache,
+                      compact=args.compact)
+    save_output(df, output_path(args, args.output))
+
+
+def parse_shard(text):
+    from sharding import parse_shard as parse
+    try:
+        return parse(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ivn", description="Integrated Value Network (IVN) tools.")
+    parser.add_argument("--metrics", default=os.environ.get("IVN_METRICS"),
+                        help="Write timers and counters at the end of the run (.json, or .prom for Prometheus)")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], default=os.environ.get("IVN_PROFILE"),
+                        help="Profile the run")
+    parser.add_argument("--profile-output", help="Profile report path")
+    parser.add_argument("--output-format", choices=["xlsx", "csv", "parquet"],
+                        help="Write table outputs in this format (default: by --output extension)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, func, help_text, threshold=None, sharded=False):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--input", help="Input workbook")
+        sub.add_argument("--output", help="Output file")
+        if threshold is not None:
+            sub.add_argument("--threshold", type=float, default=threshold)
+        if sharded:
+            sub.add_argument("--shard", type=parse_shard, help="Only process shard i of N (i/N, from 0); "
+                                                             "combine the outputs with 'ivn merge'")
+            sub.add_argument("--queue", help="SQLite lease queue shared by the workers (resumes after crashes)")
+        sub.set_defaults(func=func)
+        return sub
+
+    scrub = add("scrub", cmd_scrub, "Clean and fuzzy-deduplicate component names")
+    scrub.add_argument("--name-cache", default="scrub_name_cache.sqlite",
+                       help="Canonical names from earlier scrubs; only unseen names are fuzzy-matched")
+    scrub.add_argument("--no-name-cache", action="store_true", help="Fuzzy-match every name afresh")
+    names = subparsers.add_parser("names", help="Pin canonical component names for scrub (lists the pins)")
+    names.add_argument("--name-cache", default="scrub_name_cache.sqlite")
+    names.add_argument("--pin", nargs=2, metavar=("VARIANT", "CANONICAL"), help="Always scrub VARIANT to CANONICAL")
+    names.add_argument("--unpin", metavar="VARIANT")
+    names.add_argument("--column", default="*", choices=["*", "Enabling Component", "Dependent Component"],
+                       help="Column the pin applies to (default: both)")
+    names.set_defaults(func=cmd_names)
+    add("ids", cmd_ids, "Fill missing component IDs")
+    urls = add("urls", cmd_urls, "Infer missing URLs and check URL status", sharded=True)
+    urls.add_argument("--incremental", action="store_true",
+                      help="Only re-check new, stale or failing URLs and report what changed since the last run")
+    urls.add_argument("--state", default="url_status_state.json", help="Persisted URL statuses for --incremental")
+    urls.add_argument("--report", default="url_status_delta.csv", help="Delta report for --incremental")
+    similarity = add("similarity", cmd_similarity, "Score description pairs (count vectors)", threshold=0.6)
+    similarity.add_argument("--no-prune", action="store_true", help="Score the full Enabling x Dependent product")
+    similarity.add_argument("--candidate-max-df", type=float,
+                            help="Approximate: ignore tokens in more than this fraction of descriptions for candidates")
+    similarity.add_argument("--agency", choices=["same", "cross"], help="Only pair components within/across agencies")
+    fuzzy = add("fuzzy", cmd_fuzzy, "Score description pairs (TF-IDF)", threshold=0.02)
+    fuzzy.add_argument("--workers", type=int, default=1, help="Processes for hashing and pair scoring")
+    semantic = add("semantic", cmd_semantic, "Score description pairs (dense embeddings, cached vectors)",
+                   threshold=0.6)
+    semantic.add_argument("--backend", choices=["auto", "sentence", "lsa"], default="auto",
+                          help="auto: sentence-transformers if it loads, else LSA")
+    semantic.add_argument("--store", default="ivn_vectors", help="Vector store directory")
+    sweep = add("sweep", cmd_sweep, "Score pairs once and report edge counts per threshold; --cut writes one")
+    sweep.add_argument("method", choices=["similarity", "fuzzy"])
+    sweep.add_argument("--floor", type=float,
+                       help="Lowest threshold to keep scores for (default 0.05 for similarity, 0 for fuzzy)")
+    sweep.add_argument("--thresholds", type=float, nargs="+", help="Thresholds to report (default: floor..1 by --step)")
+    sweep.add_argument("--step", type=float, help="Threshold step for the report (default 0.05)")
+    sweep.add_argument("--report", default="threshold_sweep.csv", help="Edge counts per threshold")
+    sweep.add_argument("--cut", type=float, help="Write the output at this threshold to --output (from cached scores)")
+    sweep.add_argument("--top", type=int, help="Matches per Enabling Component for --top-output (default 5)")
+    sweep.add_argument("--top-output", help="Write the best matches of each Enabling Component here")
+    sweep.add_argument("--workers", type=int, default=1, help="Processes for fuzzy scoring")
+    sweep.add_argument("--candidate-max-df", type=float, help="similarity: as for 'ivn similarity'")
+    sweep.add_argument("--agency", choices=["same", "cross"], help="similarity: as for 'ivn similarity'")
+    sweep.add_argument("--cache-dir", default=".ivn_cache")
+    sweep.add_argument("--no-cache", action="store_true", help="Score again even if cached scores exist")
+    serve = subparsers.add_parser("serve", help="Answer top-k / pair similarity queries over HTTP on localhost")
+    serve.add_argument("--input", help="Workbook to serve (reloaded when it changes)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--cache-dir", default=".ivn_cache")
+    serve.set_defaults(func=cmd_serve)
+    keywords = add("keywords", cmd_keywords, "Fill 'Keywords Tab Items Found' from the Keywords tab")
+    keywords.add_argument("--keywords", help="Keyword list (.xlsx Keywords tab, .csv or .txt); default: --input")
+    add("recommend", cmd_recommend, "Generate LLM recommendations", sharded=True)
+    citations = add("citations", cmd_citations, "Extract legal citations from PDFs", sharded=True)
+    citations.add_argument("--urls", help="Text file with one PDF URL per line (default: built-in list)")
+    citations.add_argument("--index", help="Also build a SQLite citation index at this path")
+    citations.add_argument("--max-pages", type=int, help="Scan at most this many pages per PDF")
+    citations.add_argument("--min-density", type=float,
+                           help="Skip pages whose share of letters is below this (e.g. 0.5 for forms/tables)")
+    citations.add_argument("--temp-files", action="store_true",
+                           help="Spill downloads to temporary files instead of keeping them in memory")
+    cites = subparsers.add_parser("cites", help="Build or query the SQLite citation index")
+    cites.add_argument("--db", default="citations.sqlite")
+    cites.add_argument("--input", help="Index this extracted_citations workbook first")
+    cites.add_argument("--cites", help="Documents citing this citation (and its subdivisions)")
+    cites.add_argument("--pages", action="store_true", help="With --cites, list every page")
+    cites.add_argument("--co", help="Citations most often cited together with this one")
+    cites.add_argument("--top", type=int, help="The N most widely cited citations")
+    cites.set_defaults(func=cmd_cites)
+    eos = add("eos", cmd_eos, "Fetch executive orders")
+    eos.add_argument("--start", type=int, default=14147)
+    eos.add_argument("--end", type=int, default=14257, help="Last EO for --full")
+    eos.add_argument("--full", action="store_true", help="Rebuild the range instead of syncing incrementally")
+    eos.add_argument("--mode", choices=["http", "selenium"], default="http")
+
+    merge = subparsers.add_parser("merge", help="Combine the outputs of a sharded job")
+    merge.add_argument("job", choices=["urls", "citations", "recommend"])
+    merge.add_argument("shards", nargs="+", help="Shard output files")
+    merge.add_argument("--output", required=True)
+    merge.set_defaults(func=cmd_merge)
+
+    run = subparsers.add_parser("run", help="Chain stages in memory with cached stage outputs")
+    run.add_argument("stages", nargs="+", choices=["scrub", "ids", "urls", "similarity", "fuzzy", "keywords"])
+    run.add_argument("--input", required=True, help="Input workbook")
+    run.add_argument("--output", required=True, help="Output file (.xlsx or .csv)")
+    run.add_argument("--threshold", type=float, help="Threshold for similarity/fuzzy stages")
+    run.add_argument("--skip-url-check", action="store_true", help="Only infer URLs in the urls stage")
+    run.add_argument("--workers", type=int, default=1, help="Processes for the fuzzy stage")
+    run.add_argument("--keywords", help="Keyword list for the keywords stage (default: --input's Keywords tab)")
+    run.add_argument("--cache-dir", default=".ivn_cache")
+    run.add_argument("--no-cache", action="store_true", help="Ignore cached stage outputs")
+    run.add_argument("--compact", action="store_true",
+                     help="Load repetitive text columns as categoricals to cut memory on large workbooks")
+    run.set_defaults(func=cmd_run)
+    return parser
+
+
+def main(argv=None):
+    from instrumentation import profiled, write_metrics
+    args = build_parser().parse_args(argv)
+    try:
+        with profiled(args.profile, args.profile_output):
+            args.func(args)
+    finally:
+        if args.metrics:
+            write_metrics(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
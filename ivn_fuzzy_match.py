@@ -1,45 +1,157 @@
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from instrumentation import count, timer
+from ivn_output import fill_blank, write_table
+from component_registry import ComponentRegistry
 
-# This script compares all components against each other and outputs a large CSV. The script runs fast, so we can use it for the entire database.
-# Load the IVN data
+# This script scores each IVN row's Enabling description against its Dependent description (TF-IDF cosine) and outputs
+# the rows above the threshold as a large CSV. The script runs fast, so we can use it for the entire database.
 file_path = 'ivntest.xlsx'  # Update this to your file path if necessary
-df = pd.read_excel(file_path)
+output_file = 'ivn_similarity_scores_complete_above_threshold.csv'
+THRESHOLD = 0.02
+WORKERS = 1  # >1 tokenizes and scores in a process pool (see parallel_tfidf / parallel_pair_scores)
+HASH_FEATURES = 2 ** 20
 
-# Fill NaN values with an empty string to avoid errors in vectorization
-df = df.fillna('')
+def _chunks(items, n):
+    size = max(1, -(-len(items) // n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
 
-# Extract unique pairs of Enabling and Dependent Component Descriptions
-unique_pairs = df[['Enabling Component Description', 'Dependent Component Description']].drop_duplicates()
+def _hash_counts(texts):
+    # Same tokenization as TfidfVectorizer; hashing needs no shared vocabulary across processes
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return HashingVectorizer(n_features=HASH_FEATURES, alternate_sign=False, norm=None).transform(texts)
 
-# Vectorize the unique descriptions
-vectorizer = TfidfVectorizer()
-enabling_vectors = vectorizer.fit_transform(unique_pairs['Enabling Component Description'])
-dependent_vectors = vectorizer.transform(unique_pairs['Dependent Component Description'])
+def parallel_tfidf(texts, fit_rows, workers):
+    """
+    TF-IDF rows for texts, with the IDF taken from the texts at fit_rows (smoothed
+    and L2-normalised like TfidfVectorizer). Term counts are hashed in parallel.
+    """
+    import scipy.sparse as sp
+    from concurrent.futures import ProcessPoolExecutor
+    from sklearn.preprocessing import normalize
+    with ProcessPoolExecutor(workers) as pool:
+        counts = sp.vstack(list(pool.map(_hash_counts, _chunks(list(texts), workers * 4)))).tocsr()
+    fit = counts[fit_rows]
+    document_frequency = np.bincount(fit.indices, minlength=HASH_FEATURES)
+    idf = np.log((1 + fit.shape[0]) / (1 + document_frequency)) + 1
+    idf[document_frequency == 0] = 0  # terms outside the fitted texts are not in TfidfVectorizer's vocabulary either
+    return normalize(counts @ sp.diags(idf), norm='l2', copy=False).tocsr()
 
-# Calculate similarity scores between Enabling and Dependent descriptions
-similarity_matrix = cosine_similarity(enabling_vectors, dependent_vectors)
+def _share(array):
+    from multiprocessing import shared_memory
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, (block.name, array.shape, array.dtype.str)
 
-# Convert the similarity matrix to a DataFrame for easy merging
-similarity_df = pd.DataFrame(similarity_matrix, 
-                             index=unique_pairs['Enabling Component Description'], 
-                             columns=unique_pairs['Dependent Component Description']).reset_index()
+def _attach(spec):
+    from multiprocessing import shared_memory
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
 
-# Reshape the similarity scores DataFrame for merging
-similarity_df = similarity_df.melt(id_vars='Enabling Component Description', 
-                                   var_name='Dependent Component Description', 
-                                   value_name='Similarity Score')
+def _score_shard(task):
+    import scipy.sparse as sp
+    specs, shape, enabling_codes, dependent_codes = task
+    blocks, arrays = zip(*(_attach(spec) for spec in specs))
+    vectors = None
+    try:
+        vectors = sp.csr_matrix(arrays, shape=shape)
+        return np.asarray(vectors[enabling_codes].multiply(vectors[dependent_codes]).sum(axis=1)).ravel()
+    finally:
+        del vectors, arrays
+        for block in blocks:
+            block.close()
 
-# Filter pairs with similarity scores above a threshold value
-similarity_df = similarity_df[similarity_df['Similarity Score'] > 0.02]
+def parallel_pair_scores(vectors, enabling_codes, dependent_codes, workers):
+    """Row-wise cosine of (enabling, dependent) code pairs, sharded across a process pool.
+    The vector matrix is placed in shared memory once instead of being pickled to every worker."""
+    from concurrent.futures import ProcessPoolExecutor
+    shared = [_share(array) for array in (vectors.data, vectors.indices, vectors.indptr)]
+    try:
+        specs = [spec for _, spec in shared]
+        tasks = [(specs, vectors.shape, e, d)
+                 for e, d in zip(_chunks(enabling_codes, workers * 4), _chunks(dependent_codes, workers * 4))]
+        with ProcessPoolExecutor(workers) as pool:
+            return np.concatenate(list(pool.map(_score_shard, tasks)))
+    finally:
+        for block, _ in shared:
+            block.close()
+            block.unlink()
 
-# Merge similarity scores back with the original DataFrame to include all 15 columns
-output_df = df.merge(similarity_df, 
-                     on=['Enabling Component Description', 'Dependent Component Description'], 
-                     how='inner')
+def fit_descriptions(df):
+    """The texts the IDF is fitted on: the Enabling description of each distinct
+    (Enabling, Dependent) description pair, as the original script fitted it."""
+    pairs = df[['Enabling Component Description', 'Dependent Component Description']].drop_duplicates()
+    return pairs['Enabling Component Description'].astype(str)
 
-# Save the output to CSV
-output_df.to_csv('ivn_similarity_scores_complete_above_threshold.csv', index=False)
-print("Done!")
-print("Alignments with similarity scores over threshold saved to ivn_similarity_scores_complete_above_threshold.csv")
\ No newline at end of file
+def description_vectors(texts, fit_rows, workers=WORKERS):
+    """L2-normalised TF-IDF rows for texts, with the IDF fitted on texts[fit_rows] (repeats count)."""
+    if workers > 1:
+        return parallel_tfidf(texts, fit_rows, workers)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(pd.Series(texts).iloc[fit_rows])
+    return vectorizer.transform(texts)
+
+def component_vectors(registry):
+    """TF-IDF rows of every registry component description (indexed by code), fitted as in fuzzy_match."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(fit_descriptions(fill_blank(registry.edges)))
+    return vectorizer.transform(registry.components['Description'].fillna('').astype(str))
+
+def row_scores(df, workers=WORKERS):
+    """TF-IDF cosine similarity of each row's Enabling and Dependent descriptions."""
+    n = len(df)
+    descriptions = pd.concat([df['Enabling Component Description'], df['Dependent Component Description']],
+                             ignore_index=True).astype(object).fillna('').astype(str)
+
+    # Vectorize each distinct description text once; rows refer to them by code
+    with timer("fuzzy.vectorize"):
+        codes, texts = pd.factorize(descriptions)
+        pairs = pd.DataFrame({'e': codes[:n], 'd': codes[n:]})
+        unique_pairs = pairs.drop_duplicates()
+        vectors = description_vectors(list(texts), unique_pairs['e'].to_numpy(), workers)
+
+    # Score every distinct (Enabling, Dependent) description pair once. Rows are L2-normalised,
+    # so the cosine similarity is the row-wise dot product.
+    with timer("fuzzy.pair_scoring"):
+        if workers > 1:
+            scores = parallel_pair_scores(vectors, unique_pairs['e'].to_numpy(), unique_pairs['d'].to_numpy(), workers)
+        else:
+            scores = np.asarray(vectors[unique_pairs['e'].to_numpy()]
+                                .multiply(vectors[unique_pairs['d'].to_numpy()]).sum(axis=1)).ravel()
+    count("fuzzy.pairs_scored", len(unique_pairs))
+
+    # Broadcast the pair scores back onto the rows
+    unique_pairs = unique_pairs.assign(score=scores)
+    return pairs.merge(unique_pairs, on=['e', 'd'], how='left')['score'].to_numpy()
+
+def matching_rows(df, threshold=THRESHOLD, workers=WORKERS):
+    """Positions and scores of the rows of df (blanks filled, see fill_blank) scoring above threshold."""
+    scores = row_scores(df, workers)
+    rows = np.flatnonzero(scores > threshold)
+    return rows, scores[rows]
+
+def fuzzy_match(df, threshold=THRESHOLD, workers=WORKERS):
+    """TF-IDF similarity of each IVN row's Enabling and Dependent descriptions; returns the rows scoring above threshold.
+    workers > 1 hashes and scores in parallel (hashed features, so scores can differ from the exact vocabulary
+    only on hash collisions)."""
+    # Fill NaN values with an empty string to avoid errors in vectorization
+    df = fill_blank(df)
+    rows, scores = matching_rows(df, threshold, workers)
+    return df.iloc[rows].assign(**{'Similarity Score': scores}).reset_index(drop=True)
+
+def main(file_path=file_path, output_file=output_file, threshold=THRESHOLD, workers=WORKERS):
+    # Load the IVN data
+    registry = ComponentRegistry.load(file_path)
+
+    output_df = fuzzy_match(registry.edges.drop(columns=['Enabling Code', 'Dependent Code']), threshold, workers)
+
+    # Save the output to CSV
+    write_table(output_df, output_file)
+    print("Done!")
+    print(f"Alignments with similarity scores over threshold saved to {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 # This is ivn_generate_unique_IDs_for_components.py
 # # Last updated: 2025-05-30  🕒 Fills missing IVN Component IDs using SHA-256
 
+import numpy as np
 import pandas as pd
 import hashlib
 import re
-from tqdm import tqdm
 import time
+from ivn_output import write_table
 
 def normalize(text):
     if pd.isna(text):
@@ -16,34 +17,65 @@ def generate_id(source, component):
     combo = normalize(source) + normalize(component)
     return hashlib.sha256(combo.encode('utf-8')).hexdigest()
 
-# Load the Excel file
-input_file = "IVN-public-version.xlsx"
-df = pd.read_excel(input_file)
-
-# Fill missing Enabling Component ID
-print("🔄 Filling missing Enabling Component IDs...")
-start_time = time.time()
-for i, row in tqdm(df.iterrows(), total=len(df), desc="Enabling IDs", unit="row"):
-    if pd.isna(row.get("Enabling Component ID", None)) or str(row.get("Enabling Component ID", "")).strip() == "":
-        df.at[i, "Enabling Component ID"] = generate_id(
-            row.get("Enabling Source", ""), row.get("Enabling Component Description", "")
-        )
-elapsed_time = time.time() - start_time
-print(f"✅ Completed Enabling Component IDs in {elapsed_time:.2f} seconds.")
-
-# Fill missing Dependent Component ID
-print("🔄 Filling missing Dependent Component IDs...")
-start_time = time.time()
-for i, row in tqdm(df.iterrows(), total=len(df), desc="Dependent IDs", unit="row"):
-    if pd.isna(row.get("Dependent Component ID", None)) or str(row.get("Dependent Component ID", "")).strip() == "":
-        df.at[i, "Dependent Component ID"] = generate_id(
-            row.get("Dependent Source", ""), row.get("Dependent Component Description", "")
-        )
-elapsed_time = time.time() - start_time
-print(f"✅ Completed Dependent Component IDs in {elapsed_time:.2f} seconds.")
-
-# Save updated Excel
-output_file = "IVN-public-with-IDs.xlsx"
-df.to_excel(output_file, index=False)
-print(f"✅ Filled missing IDs and saved to: {output_file}")
+def component_ids(df, side):
+    """
+    Returns the "Enabling" or "Dependent" component IDs for every row,
+    generating the SHA-256 ID wherever the ID column is missing or blank.
+    """
+    id_col = f"{side} Component ID"
+    # Hash each distinct (source, description) once and broadcast by code
+    codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([df[f"{side} Source"], df[f"{side} Component Description"]]))
+    unique_ids = np.array([generate_id(source, description) for source, description in pairs], dtype=object)
+    generated = unique_ids[codes]
+    if id_col not in df.columns:
+        return pd.Series(generated, index=df.index)
+    existing = df[id_col]
+    blank = existing.isna() | (existing.astype(str).str.strip() == "")
+    return existing.astype(object).where(~blank, pd.Series(generated, index=df.index))
 
+# Settings
+INPUT_FILE = "IVN-public-version.xlsx"
+OUTPUT_FILE = "IVN-public-with-IDs.xlsx"
+
+def fill_missing_ids(df):
+    """Fills missing Enabling/Dependent Component IDs. Returns a new DataFrame."""
+    from tqdm import tqdm
+    df = df.copy()
+
+    # Fill missing Enabling Component ID
+    print("🔄 Filling missing Enabling Component IDs...")
+    start_time = time.time()
+    for i, row in tqdm(df.iterrows(), total=len(df), desc="Enabling IDs", unit="row"):
+        if pd.isna(row.get("Enabling Component ID", None)) or str(row.get("Enabling Component ID", "")).strip() == "":
+            df.at[i, "Enabling Component ID"] = generate_id(
+                row.get("Enabling Source", ""), row.get("Enabling Component Description", "")
+            )
+    elapsed_time = time.time() - start_time
+    print(f"✅ Completed Enabling Component IDs in {elapsed_time:.2f} seconds.")
+
+    # Fill missing Dependent Component ID
+    print("🔄 Filling missing Dependent Component IDs...")
+    start_time = time.time()
+    for i, row in tqdm(df.iterrows(), total=len(df), desc="Dependent IDs", unit="row"):
+        if pd.isna(row.get("Dependent Component ID", None)) or str(row.get("Dependent Component ID", "")).strip() == "":
+            df.at[i, "Dependent Component ID"] = generate_id(
+                row.get("Dependent Source", ""), row.get("Dependent Component Description", "")
+            )
+    elapsed_time = time.time() - start_time
+    print(f"✅ Completed Dependent Component IDs in {elapsed_time:.2f} seconds.")
+
+    return df
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE):
+    # Load the Excel file
+    df = pd.read_excel(input_file)
+
+    df = fill_missing_ids(df)
+
+    # Save updated Excel
+    write_table(df, output_file)
+    print(f"✅ Filled missing IDs and saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# This is ivn_graph.py
+# Loads the IVN edge list (Enabling -> Dependent rows) into a compact in-memory graph for path queries.
+# Component IDs are interned to integers and adjacency is kept as CSR arrays in both directions,
+# so neighbourhood, reachability and shortest-path questions are answered without scanning the sheet.
+#
+# Example:
+#   python ivn_graph.py laws "Percent of inspections completed on time"
+#   python ivn_graph.py path <enabling component or ID> <dependent component or ID>
+
+import re
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order, shortest_path
+from ivn_generate_unique_IDs_for_components import component_ids
+
+INPUT_FILE = "IVN-public-with-IDs.xlsx"
+
+# Sources or component names that look like statutes, regulations or executive orders
+LAW_PATTERN = re.compile(
+    r"\b(?:\d+\s*U\.?S\.?C\.?|U\.S\. Code|United States Code|\d+\s*C\.?F\.?R\.?|Code of Federal Regulations|"
+    r"Public\s+Law|P\.L\.|Act\b|Statute|Executive\s+Order|E\.O\.)",
+    re.IGNORECASE,
+)
+
+NODE_COLUMNS = ["Component", "Component Description", "Source", "Source Agency", "Component URL"]
+
+
+class IVNGraph:
+    """
+    Directed IVN graph. Nodes are components (interned SHA-256 IDs), edges
+    point from the Enabling component to the Dependent component.
+    """
+
+    def __init__(self, nodes, sources, targets):
+        self.nodes = nodes.reset_index(drop=True)
+        self.ids = self.nodes["ID"].tolist()
+        self.index = {component_id: i for i, component_id in enumerate(self.ids)}
+        self.names = {}
+        for i, name in enumerate(self.nodes["Component"]):
+            self.names.setdefault(str(name).strip().lower(), i)
+
+        n = len(self.ids)
+        adjacency = csr_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n, n))
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1
+        self.forward = adjacency
+        self.reverse = adjacency.T.tocsr()
+        self.undirected = (adjacency + self.reverse).tocsr()
+
+        text = self.nodes["Source"].astype(str) + " " + self.nodes["Component"].astype(str)
+        self.is_law = text.str.contains(LAW_PATTERN).to_numpy()
+
+    @classmethod
+    def from_dataframe(cls, df):
+        df = df.fillna("")
+        enabling_ids = component_ids(df, "Enabling")
+        dependent_ids = component_ids(df, "Dependent")
+
+        sides = []
+        for side, ids in (("Enabling", enabling_ids), ("Dependent", dependent_ids)):
+            columns = {f"{side} {column}": column for column in NODE_COLUMNS if f"{side} {column}" in df.columns}
+            frame = df[list(columns)].rename(columns=columns)
+            frame["ID"] = ids.to_numpy()
+            sides.append(frame)
+        nodes = pd.concat(sides, ignore_index=True).drop_duplicates(subset="ID")
+        for column in NODE_COLUMNS:
+            if column not in nodes.columns:
+                nodes[column] = ""
+
+        codes = pd.Index(nodes["ID"])
+        sources = codes.get_indexer(enabling_ids)
+        targets = codes.get_indexer(dependent_ids)
+        return cls(nodes[["ID"] + NODE_COLUMNS], sources, targets)
+
+    @classmethod
+    def load(cls, path=INPUT_FILE):
+        return cls.from_dataframe(pd.read_excel(path))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        return self.forward.nnz
+
+    # ---------------
+    # Node resolution
+    # ---------------
+
+    def node(self, key):
+        """Integer node for a component ID or (case-insensitive) component name."""
+        if isinstance(key, (int, np.integer)):
+            return int(key)
+        if key in self.index:
+            return self.index[key]
+        name = str(key).strip().lower()
+        if name in self.names:
+            return self.names[name]
+        raise KeyError(f"Unknown component: {key}")
+
+    def describe(self, nodes):
+        """Node attribute rows for a list of integer nodes."""
+        return self.nodes.iloc[list(nodes)]
+
+    def _adjacency(self, direction):
+        if direction == "out":
+            return self.forward
+        if direction == "in":
+            return self.reverse
+        if direction == "both":
+            return self.undirected
+        raise ValueError("direction must be 'out', 'in' or 'both'")
+
+    # -------
+    # Queries
+    # -------
+
+    def successors(self, key):
+        i = self.node(key)
+        return self.forward.indices[self.forward.indptr[i]:self.forward.indptr[i + 1]]
+
+    def predecessors(self, key):
+        i = self.node(key)
+        return self.reverse.indices[self.reverse.indptr[i]:self.reverse.indptr[i + 1]]
+
+    def neighbourhood(self, key, depth=1, direction="both"):
+        """Nodes within depth hops of key (excluding key itself)."""
+        adjacency = self._adjacency(direction)
+        start = self.node(key)
+        seen = np.zeros(len(self), dtype=bool)
+        seen[start] = True
+        frontier = np.array([start])
+        for _ in range(depth):
+            if not len(frontier):
+                break
+            neighbours = np.concatenate(
+                [adjacency.indices[adjacency.indptr[i]:adjacency.indptr[i + 1]] for i in frontier]
+            )
+            frontier = np.unique(neighbours[~seen[neighbours]])
+            seen[frontier] = True
+        seen[start] = False
+        return np.flatnonzero(seen)
+
+    def reachable(self, key, direction="out"):
+        """All nodes reachable from key (direction="in" gives everything that transitively enables key)."""
+        start = self.node(key)
+        order = breadth_first_order(self._adjacency(direction), start, directed=True, return_predecessors=False)
+        return order[order != start]
+
+    def shortest_path(self, source, target, direction="out"):
+        """Fewest-hop path from source to target as a list of integer nodes, or None."""
+        start, end = self.node(source), self.node(target)
+        _, predecessors = shortest_path(self._adjacency(direction), unweighted=True, directed=True,
+                                        indices=start, return_predecessors=True)
+        if start != end and predecessors[end] < 0:
+            return None
+        path = [end]
+        while path[-1] != start:
+            path.append(int(predecessors[path[-1]]))
+        return path[::-1]
+
+    def enabling_laws(self, key):
+        """Law-like components that transitively enable key."""
+        ancestors = self.reachable(key, direction="in")
+        return ancestors[self.is_law[ancestors]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the IVN graph.")
+    parser.add_argument("--input", default=INPUT_FILE, help="IVN workbook")
+    subparsers = parser.add_subparsers(dest="query", required=True)
+    for name in ("successors", "predecessors", "reachable", "laws"):
+        subparsers.add_parser(name).add_argument("component")
+    neighbours = subparsers.add_parser("neighbours")
+    neighbours.add_argument("component")
+    neighbours.add_argument("--depth", type=int, default=1)
+    path = subparsers.add_parser("path")
+    path.add_argument("source")
+    path.add_argument("target")
+    args = parser.parse_args(argv)
+
+    graph = IVNGraph.load(args.input)
+    print(f"Loaded {len(graph)} components and {graph.edge_count} linkages from {args.input}", file=sys.stderr)
+
+    if args.query == "path":
+        result = graph.shortest_path(args.source, args.target)
+        if result is None:
+            print("No path found.")
+            return
+    elif args.query == "neighbours":
+        result = graph.neighbourhood(args.component, depth=args.depth)
+    elif args.query == "laws":
+        result = graph.enabling_laws(args.component)
+    else:
+        result = getattr(graph, args.query)(args.component)
+    print(graph.describe(result)[["ID", "Component", "Source"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# This is ivn_output.py
+# Shared reader/writer for IVN tables. The format follows the file extension (.xlsx, .csv, .parquet).
+# xlsx output is streamed row by row: through xlsxwriter in constant-memory mode when it is installed,
+# otherwise through openpyxl's write-only mode. Highlighting is added as one conditional-formatting rule
+# per column instead of a style on every cell, so large outputs stay fast and small.
+# read_table(..., compact=True) stores the repetitive text columns as categoricals.
+
+import os
+import math
+import pandas as pd
+
+OUTPUT_FORMATS = ("xlsx", "csv", "parquet")
+ORANGE = "FFA500"
+
+# Text repeated on thousands of rows: kept as pandas categoricals in compact mode
+# (one copy of each distinct string plus integer codes; parquet stores them dictionary-encoded)
+COMPACT_COLUMNS = [f"{side} {column}" for side in ("Enabling", "Dependent")
+                   for column in ("Component", "Component Description", "Source", "Source Agency",
+                                  "Component Responsible Office")]
+
+
+def output_format(path):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in OUTPUT_FORMATS else "xlsx"
+
+
+def with_format(path, fmt):
+    """path with its extension replaced to match fmt (no-op when fmt is None)."""
+    if not fmt:
+        return path
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}'. Choose from: {', '.join(OUTPUT_FORMATS)}")
+    return os.path.splitext(path)[0] + "." + fmt
+
+
+def compact_table(df, columns=COMPACT_COLUMNS):
+    """df with the given text columns stored as categoricals."""
+    convert = [c for c in columns if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: "category" for c in convert}) if convert else df
+
+
+def fill_blank(df, value=""):
+    """df.fillna(value) that keeps categorical columns categorical."""
+    df = df.copy()
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype) and value not in df[c].cat.categories:
+            df[c] = df[c].cat.add_categories([value])
+    return df.fillna(value)
+
+
+def read_table(path, compact=False, **kwargs):
+    fmt = output_format(path)
+    if fmt == "csv":
+        df = pd.read_csv(path, **kwargs)
+    elif fmt == "parquet":
+        df = pd.read_parquet(path, **kwargs)
+    else:
+        df = pd.read_excel(path, **kwargs)
+    return compact_table(df) if compact else df
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NaT:
+        return None
+    if isinstance(value, (list, dict, set, tuple)):
+        return str(value)
+    return value
+
+
+def _rows(df):
+    for row in df.itertuples(index=False, name=None):
+        yield [_cell(value) for value in row]
+
+
+def _highlight_ranges(df, highlight):
+    """
+    Turns {"target column": ("condition column", value)} into
+    (cell range, formula) pairs for conditional formatting.
+    """
+    from openpyxl.utils import get_column_letter
+    columns = list(df.columns)
+    last_row = len(df) + 1
+    for target, (condition, value) in (highlight or {}).items():
+        if target not in columns or condition not in columns or last_row < 2:
+            continue
+        target_letter = get_column_letter(columns.index(target) + 1)
+        condition_letter = get_column_letter(columns.index(condition) + 1)
+        formula = f'${condition_letter}2="{value}"'
+        yield f"{target_letter}2:{target_letter}{last_row}", formula
+
+
+def _write_xlsxwriter(df, path, highlight, float_format):
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False,
+                                          "nan_inf_to_errors": True, "default_date_format": "yyyy-mm-dd"})
+    worksheet = workbook.add_worksheet("Sheet1")
+    if float_format:
+        number_format = workbook.add_format({"num_format": float_format})
+        for i, dtype in enumerate(df.dtypes):
+            if pd.api.types.is_float_dtype(dtype):
+                worksheet.set_column(i, i, None, number_format)
+    orange = workbook.add_format({"bg_color": "#" + ORANGE})
+    for cell_range, formula in _highlight_ranges(df, highlight):
+        worksheet.conditional_format(cell_range, {"type": "formula", "criteria": "=" + formula, "format": orange})
+
+    worksheet.write_row(0, 0, [str(c) for c in df.columns])
+    for r, row in enumerate(_rows(df), start=1):
+        worksheet.write_row(r, 0, row)
+    workbook.close()
+
+
+def _write_openpyxl(df, path, highlight, float_format):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet("Sheet1")
+    fill = PatternFill(start_color=ORANGE, end_color=ORANGE, fill_type="solid")
+    for cell_range, formula in _highlight_ranges(df, highlight):
+        worksheet.conditional_formatting.add(cell_range, FormulaRule(formula=[formula], fill=fill))
+
+    float_columns = {i for i, dtype in enumerate(df.dtypes) if pd.api.types.is_float_dtype(dtype)}
+    worksheet.append([str(c) for c in df.columns])
+    for row in _rows(df):
+        if float_format and float_columns:
+            for i in float_columns:
+                if row[i] is not None:
+                    cell = WriteOnlyCell(worksheet, value=row[i])
+                    cell.number_format = float_format
+                    row[i] = cell
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def write_table(df, path, highlight=None, float_format=None):
+    """
+    Writes df to path in the format given by its extension.
+    highlight maps a column to (condition column, value): its cells are shaded
+    orange where the condition column equals value (xlsx only).
+    float_format is an Excel number format such as "0.0000": float columns are
+    rounded to its decimals in every format (as to_excel(float_format="%.4f")
+    did) and xlsx cells also get it as their display format.
+    """
+    fmt = output_format(path)
+    if float_format:
+        decimals = len(float_format.split(".")[1]) if "." in float_format else 0
+        floats = [c for c, dtype in df.dtypes.items() if pd.api.types.is_float_dtype(dtype)]
+        df = df.round({c: decimals for c in floats})
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        # Columns mixing strings and numbers (common after fillna('')) are stored as text
+        mixed = [c for c in df.columns if df[c].dtype == object]
+        df.astype({c: "string" for c in mixed}).to_parquet(path, index=False)
+    else:
+        try:
+            _write_xlsxwriter(df, path, highlight, float_format)
+        except ImportError:
+            _write_openpyxl(df, path, highlight, float_format)
+    return path
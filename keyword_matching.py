@@ -0,0 +1,135 @@
+# This is keyword_matching.py
+# Fills "Keywords Tab Items Found" from the workbook's Keywords tab. Every keyword is compiled into one
+# Aho-Corasick automaton (pyahocorasick, when installed) so each description is scanned once, however
+# long the keyword list is. Without pyahocorasick the same whole-word matches are found by looking up
+# each run of words in a dictionary of keyword phrases, which is also a single pass per text.
+# Descriptions are matched once per unique component (see component_registry.py).
+
+import re
+import argparse
+import pandas as pd
+from instrumentation import count, timer
+from ivn_output import write_table
+from component_registry import ComponentRegistry
+
+INPUT_FILE = "ivntest.xlsx"
+OUTPUT_FILE = "ivntest_keywords.xlsx"
+KEYWORDS_SHEET = "Keywords"
+FOUND_COLUMN = "Keywords Tab Items Found"
+SEPARATOR = "; "
+# Header cells of a keyword list, compared after normalize(); the first cell is dropped when it is one of these
+KEYWORD_HEADERS = {"keyword", "keywords", "keyword s", "keywords tab items", "keywords tab items found",
+                   "term", "terms"}
+
+
+def normalize(text):
+    """Lowercase words separated by single spaces, so matches are case-insensitive and whole-word."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(text).lower()))
+
+
+def load_keywords(path=INPUT_FILE, sheet=KEYWORDS_SHEET):
+    """
+    Keywords from the first column of the Keywords tab (or of a .csv / .txt list).
+    The sheet is read without a header row, so a list without one keeps its first
+    keyword; a first cell like "Keywords" (see KEYWORD_HEADERS) is dropped instead.
+    """
+    if path.endswith(".txt"):
+        with open(path, encoding="utf-8") as f:
+            keywords = [line.strip() for line in f if line.strip()]
+    else:
+        if path.endswith(".csv"):
+            column = pd.read_csv(path, header=None, dtype=str).iloc[:, 0]
+        else:
+            column = pd.read_excel(path, sheet_name=sheet, header=None, dtype=str).iloc[:, 0]
+        keywords = [str(keyword).strip() for keyword in column.dropna() if str(keyword).strip()]
+    if keywords and normalize(keywords[0]) in KEYWORD_HEADERS:
+        keywords = keywords[1:]
+    return keywords
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        # normalized phrase -> keyword as written in the Keywords tab (first spelling wins)
+        self.keywords = {}
+        # Keywords that normalize to a single character ("C++" -> "c") would match every stray
+        # letter, such as the "c" of "U.S.C.", so they are left out
+        self.dropped = []
+        for keyword in keywords:
+            phrase = normalize(keyword)
+            if len(phrase) > 1:
+                self.keywords.setdefault(phrase, keyword)
+            elif phrase:
+                self.dropped.append(keyword)
+        self.max_words = max((phrase.count(" ") + 1 for phrase in self.keywords), default=0)
+        try:
+            import ahocorasick
+        except ImportError:
+            self.automaton = None
+        else:
+            self.automaton = ahocorasick.Automaton()
+            for phrase, keyword in self.keywords.items():
+                self.automaton.add_word(f" {phrase} ", (len(phrase) + 2, keyword))
+            self.automaton.make_automaton()
+
+    def find(self, text):
+        """Keywords in text, in order of first appearance, without repeats."""
+        text = normalize(text)
+        if not text or not self.keywords:
+            return []
+        if self.automaton is not None:
+            # Space-padded patterns only match whole words; order hits by start, then length
+            hits = sorted((end - length, length, keyword)
+                          for end, (length, keyword) in self.automaton.iter(f" {text} "))
+            found = [keyword for _, _, keyword in hits]
+        else:
+            words = text.split(" ")
+            found = []
+            for start in range(len(words)):
+                for length in range(1, min(self.max_words, len(words) - start) + 1):
+                    keyword = self.keywords.get(" ".join(words[start:start + length]))
+                    if keyword:
+                        found.append(keyword)
+        return list(dict.fromkeys(found))
+
+
+def match_keywords(df, keywords, registry=None):
+    """
+    Returns df with "Keywords Tab Items Found" listing the keywords found in each
+    row's Enabling and Dependent descriptions, separated by "; ".
+    """
+    registry = registry or ComponentRegistry.build(df)
+    matcher = KeywordMatcher(keywords)
+    if matcher.dropped:
+        print(f"⚠️ Skipped {len(matcher.dropped)} keywords with a single letter or digit: {', '.join(matcher.dropped)}")
+    count("keywords.dropped", len(matcher.dropped))
+
+    with timer("keywords.scan"):
+        descriptions = registry.components["Description"]
+        found = pd.Series([matcher.find(text) if pd.notna(text) else [] for text in descriptions],
+                          index=registry.components.index)
+    count("keywords.descriptions_scanned", len(descriptions))
+
+    enabling = registry.broadcast(found, "Enabling")
+    dependent = registry.broadcast(found, "Dependent")
+    df = df.copy()
+    df[FOUND_COLUMN] = [SEPARATOR.join(dict.fromkeys(e + d)) for e, d in zip(enabling, dependent)]
+    count("keywords.rows_with_matches", int((df[FOUND_COLUMN] != "").sum()))
+    return df
+
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, keywords_file=None):
+    keywords = load_keywords(keywords_file or input_file)
+    print(f"🔑 Loaded {len(keywords)} keywords.")
+    registry = ComponentRegistry.load(input_file)
+    df = match_keywords(registry.edges.drop(columns=["Enabling Code", "Dependent Code"]), keywords, registry)
+    write_table(df, output_file)
+    print(f"✅ {int((df[FOUND_COLUMN] != '').sum())} of {len(df)} rows matched keywords. Saved to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill 'Keywords Tab Items Found' from the Keywords tab.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--keywords", help="Keyword list (.xlsx Keywords tab, .csv or .txt); default: the input workbook")
+    args = parser.parse_args()
+    main(args.input, args.output, args.keywords)
@@ -0,0 +1,211 @@
+# This is pipeline.py
+# Chains IVN processing stages in memory (scrub -> ids -> urls -> similarity ...) and caches each
+# stage's output by the hash of its input, the stage's code and its parameters. Re-running with an
+# unchanged workbook skips every stage whose inputs have not changed, and no intermediate xlsx
+# files are written between stages.
+
+import os
+import ast
+import time
+import pickle
+import hashlib
+import inspect
+from instrumentation import count, timer
+from ivn_output import read_table, write_table
+
+CACHE_DIR = ".ivn_cache"
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _local_path(name):
+    path = os.path.join(ROOT, *name.split(".")) + ".py"
+    return path if os.path.exists(path) else None
+
+
+def local_sources(module_name):
+    """
+    Source of module_name and of every repo-local module it imports, at any depth
+    and including imports inside functions, by module name. Third-party imports
+    are ignored.
+    """
+    sources = {}
+    todo = [module_name]
+    while todo:
+        name = todo.pop()
+        path = _local_path(name)
+        if name in sources or path is None:
+            continue
+        with open(path, encoding="utf-8") as f:
+            sources[name] = f.read()
+        if name == __name__:
+            continue  # the stage loaders below import every stage; modules only use file_hash from here
+        for node in ast.walk(ast.parse(sources[name])):
+            if isinstance(node, ast.Import):
+                todo += [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                todo.append(node.module)
+                todo += [f"{node.module}.{alias.name}" for alias in node.names]  # from package import module
+    return sources
+
+
+class Stage:
+    """One DataFrame -> DataFrame step. func is called as func(df, **params)."""
+
+    def __init__(self, name, func, state=None, cache=True, **params):
+        self.name = name
+        self.func = func
+        self.state = state  # optional callable: digest of what the stage reads besides df (e.g. scrub's name cache)
+        self.cache = cache  # False: the output can't be reproduced from the inputs (see STAGE_CACHE)
+        self.params = params
+
+    def fingerprint(self):
+        """
+        Changes whenever the source of the stage's module (or of a repo module it
+        imports), its parameters or its state digest change.
+        """
+        sources = local_sources(inspect.getmodule(self.func).__name__)
+        source = "".join(f"{name}\n{text}" for name, text in sorted(sources.items()))
+        state = self.state() if self.state else ""
+        return hashlib.sha256((self.name + source + repr(sorted(self.params.items())) + state).encode("utf-8")).hexdigest()
+
+    def run(self, df):
+        return self.func(df, **self.params)
+
+
+def _scrub():
+    from scrub_IVN_Excel import scrub
+    return scrub
+
+
+def _ids():
+    from ivn_generate_unique_IDs_for_components import fill_missing_ids
+    return fill_missing_ids
+
+
+def _urls():
+    from Infer_URLs import infer_and_check_urls
+    return infer_and_check_urls
+
+
+def _similarity():
+    from similarity_scores import compute_similarity
+    return compute_similarity
+
+
+def _fuzzy():
+    from ivn_fuzzy_match import fuzzy_match
+    return fuzzy_match
+
+
+def _keywords():
+    from keyword_matching import match_keywords
+    return match_keywords
+
+
+# Stage name -> loader returning the stage function
+STAGES = {
+    "scrub": _scrub,
+    "ids": _ids,
+    "urls": _urls,
+    "similarity": _similarity,
+    "fuzzy": _fuzzy,
+    "keywords": _keywords,
+}
+
+
+def _scrub_state():
+    from scrub_IVN_Excel import name_cache_digest
+    return name_cache_digest()
+
+
+# Stage name -> digest of data the stage reads besides its input DataFrame. Scrub maps names through the
+# persistent name cache, so a new pin must invalidate its cached output.
+STAGE_STATE = {
+    "scrub": _scrub_state,
+}
+
+
+def _urls_cache(params):
+    return not params.get("check", True)
+
+
+# Stage name -> whether its output may be cached, given its parameters. Checking URL statuses asks the
+# network, so a cached result would report today's statuses forever; the stage only infers URLs (and can
+# be cached) with check=False.
+STAGE_CACHE = {
+    "urls": _urls_cache,
+}
+
+
+def make_stage(name, **params):
+    if name not in STAGES:
+        raise ValueError(f"Unknown stage '{name}'. Choose from: {', '.join(STAGES)}")
+    cache = STAGE_CACHE[name](params) if name in STAGE_CACHE else True
+    return Stage(name, STAGES[name](), state=STAGE_STATE.get(name), cache=cache, **params)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_input(path, compact=False):
+    return read_table(path, compact=compact)
+
+
+def run_pipeline(input_file, stages, cache_dir=CACHE_DIR, use_cache=True, compact=False):
+    """
+    Runs the stages in order on the workbook and returns the final DataFrame.
+    Each stage's cache key chains the previous key with the stage fingerprint,
+    so keys are known before anything runs: the pipeline resumes from the last
+    cached stage and only loads the input workbook if the first stage must run.
+    A stage with cache=False always runs, and the stages after it are neither
+    read from nor written to the cache, since their input changes between runs.
+    compact loads the repetitive text columns as categoricals.
+    """
+    key = file_hash(input_file) + ("-compact" if compact else "")
+    keys = []
+    for stage in stages:
+        key = hashlib.sha256((key + stage.fingerprint()).encode("utf-8")).hexdigest()
+        keys.append(key)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, f"{stage.name}-{key[:16]}.pkl") for stage, key in zip(stages, keys)]
+    cached = next((i for i, stage in enumerate(stages) if not stage.cache), len(stages))  # stages [0, cached)
+
+    start = 0
+    df = None
+    if use_cache:
+        for i in range(cached - 1, -1, -1):
+            if os.path.exists(paths[i]):
+                with open(paths[i], "rb") as f:
+                    df = pickle.load(f)
+                start = i + 1
+                count("pipeline.stages_skipped", start)
+                print(f"⏭️ Stages up to '{stages[i].name}' unchanged; using cached output.")
+                break
+
+    if df is None:
+        df = load_input(input_file, compact)
+
+    for i in range(start, len(stages)):
+        stage = stages[i]
+        print(f"▶️ Running stage '{stage.name}'..." + ("" if i < cached else " (not cached)"))
+        stage_start = time.time()
+        with timer(f"stage.{stage.name}"):
+            df = stage.run(df)
+        count(f"stage.{stage.name}.rows", len(df))
+        if i < cached:
+            with open(paths[i], "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"✅ Stage '{stage.name}' finished in {time.time() - stage_start:.2f} seconds ({len(df)} rows).")
+
+    return df
+
+
+def save_output(df, path):
+    write_table(df, path)
+    print(f"📂 Saved {len(df)} rows to {path}")
@@ -1,26 +1,23 @@
 import pandas as pd
+import os
 import re
 import time
+import hashlib
+import sqlite3
 from fuzzywuzzy import process
-from tqdm import tqdm  # For progress tracking
+from ivn_output import write_table
+from instrumentation import Progress, count, timer  # For progress tracking
 
 
-# ===========================
-# Step 1: Load the Excel File
-# ===========================
-
-
-# Load the dataset into a pandas DataFrame
-file_path = "ivntest.xlsx"  # Replace with your actual file name
-
+# Settings
+INPUT_FILE = "ivntest.xlsx"  # Replace with your actual file name
+OUTPUT_FILE = "IVN_Dataset_Cleaned.xlsx"
+NAME_CACHE_FILE = "scrub_name_cache.sqlite"  # Variant -> canonical names from earlier runs (None to disable)
+MATCH_CUTOFF = 90
+ALL_COLUMNS = "*"  # Column of pins that apply to every cleaned column
 
-# Use openpyxl to support .xlsx format
-df = pd.read_excel(file_path, engine="openpyxl")
-
-
-# Inspect the first few rows
-print("Original Data Sample:")
-print(df.head())
+# Define the columns that need cleaning
+columns_to_clean = ["Enabling Component", "Dependent Component"]
 
 
 # ===================================
@@ -54,18 +51,102 @@ def clean_text(text):
     return text
 
 
-# ==========================================
-# Step 3: Apply Cleaning to Relevant Columns
-# ==========================================
+# ===================================
+# Canonical Name Cache
+# ===================================
 
 
-# Define the columns that need cleaning
-columns_to_clean = ["Enabling Component", "Dependent Component"]
+class NameCache:
+    """
+    SQLite store of the variant -> canonical text decided for each column, with the
+    fuzzy score and when it was decided, so later scrubs only fuzzy-match texts they
+    have not seen. Pinned rows are analyst overrides: they win over the cache and the
+    matcher, are never overwritten by a scrub, and apply to every column when stored
+    under "*".
+    """
 
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS names (
+        column_name TEXT NOT NULL,
+        variant TEXT NOT NULL,
+        canonical TEXT NOT NULL,
+        score INTEGER,
+        updated REAL NOT NULL,
+        pinned INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (column_name, variant)
+    );
+    """
 
-for col in columns_to_clean:
-    if col in df.columns:  # Ensure the column exists
-        df[col] = df[col].apply(clean_text)  # Apply cleaning function
+    def __init__(self, path=NAME_CACHE_FILE):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+
+    def load(self, column):
+        """Returns ({variant: canonical} decided by earlier scrubs, {variant: canonical} pinned) for column."""
+        known, pinned = {}, {}
+        rows = self.connection.execute(
+            "SELECT variant, canonical, pinned FROM names WHERE column_name IN (?, ?) "
+            "ORDER BY column_name = ? DESC, rowid",  # column-specific pins override "*" pins
+            (column, ALL_COLUMNS, ALL_COLUMNS),
+        )
+        for variant, canonical, is_pinned in rows:
+            (pinned if is_pinned else known)[variant] = canonical
+        return known, pinned
+
+    def save(self, column, decisions):
+        """Stores [(variant, canonical, score)] for column, leaving pinned variants alone."""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO names (column_name, variant, canonical, score, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (column_name, variant) DO UPDATE SET canonical = excluded.canonical, "
+                "score = excluded.score, updated = excluded.updated WHERE pinned = 0",
+                ((column, variant, canonical, score, now) for variant, canonical, score in decisions),
+            )
+
+    def pin(self, variant, canonical, column=ALL_COLUMNS):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO names (column_name, variant, canonical, score, updated, pinned) VALUES (?, ?, ?, NULL, ?, 1) "
+                "ON CONFLICT (column_name, variant) DO UPDATE SET canonical = excluded.canonical, "
+                "score = NULL, updated = excluded.updated, pinned = 1",
+                (column, clean_text(variant), clean_text(canonical), time.time()),
+            )
+
+    def unpin(self, variant, column=ALL_COLUMNS):
+        """Removes a pin; the variant is fuzzy-matched again on the next scrub."""
+        with self.connection:
+            return self.connection.execute(
+                "DELETE FROM names WHERE column_name = ? AND variant = ? AND pinned = 1",
+                (column, clean_text(variant)),
+            ).rowcount
+
+    def pins(self):
+        return self.connection.execute(
+            "SELECT column_name, variant, canonical FROM names WHERE pinned = 1 ORDER BY column_name, variant"
+        ).fetchall()
+
+    def digest(self):
+        """
+        Changes whenever a pin changes (used in the pipeline's scrub cache key). Decisions
+        stored by scrubs are left out: every scrub stores its own, so hashing them would make
+        the next run of an unchanged workbook miss the cache. "" without pins, as for no cache file.
+        """
+        pins = self.pins()
+        return hashlib.sha256(repr(pins).encode("utf-8")).hexdigest() if pins else ""
+
+    def close(self):
+        self.connection.close()
+
+
+def name_cache_digest(cache_file=NAME_CACHE_FILE):
+    if not cache_file or not os.path.exists(cache_file):
+        return ""
+    cache = NameCache(cache_file)
+    try:
+        return cache.digest()
+    finally:
+        cache.close()
 
 
 # ===========================
@@ -73,82 +154,137 @@ for col in columns_to_clean:
 # ===========================
 
 
-def deduplicate_column(column_data):
+def deduplicate_column(column_data, cache=None, column=None):
     """
     Uses fuzzy matching to identify and replace near-duplicate component descriptions
     with a standardized version, ensuring consistent text formatting across the dataset.
     Prevents errors caused by empty or special-character-only strings.
+    With a NameCache, pinned and previously decided texts are mapped without fuzzy
+    matching, and the canonical forms of earlier runs are the first match candidates.
     """
-    unique_texts = {}  # Dictionary to store standardized versions of text
+    known, pinned = cache.load(column) if cache else ({}, {})
+    # Dictionary to store standardized versions of text, seeded with earlier canonical forms
+    unique_texts = {canonical: canonical for canonical in list(known.values()) + list(pinned.values())}
+    resolved = dict(unique_texts)  # Every text already mapped, matched variants included
+    resolved.update(known)
+    resolved.update(pinned)
+    decisions = []  # (variant, canonical, score) to store in the cache
     cleaned_column = []  # List to store cleaned values
-    total_entries = len(column_data)  # Total rows to process
-    start_time = time.time()  # Track start time
+    progress = Progress(len(column_data), "Deduplicating Entries")  # Throttled progress line
 
 
-    for index, text in enumerate(tqdm(column_data, desc="Deduplicating Entries", unit="entry")):
+    for text in column_data:
+        progress.update()
+
         # Skip empty or whitespace-only strings to avoid fuzzy matching errors
         if not text.strip():
             cleaned_column.append(text)
             continue
 
 
-        if text in unique_texts:
-            cleaned_column.append(unique_texts[text])  # Use existing standardized version
+        if text in resolved:
+            cleaned_column.append(resolved[text])  # Use existing standardized version
         else:
             # Ensure we're only matching against non-empty, valid texts
             non_empty_keys = [key for key in unique_texts.keys() if key.strip()]
-            
+
             if non_empty_keys:
-                result = process.extractOne(text, non_empty_keys, score_cutoff=90)
+                with timer("scrub.fuzzy_match"):
+                    result = process.extractOne(text, non_empty_keys, score_cutoff=MATCH_CUTOFF)
+                count("scrub.fuzzy_match_candidates", len(non_empty_keys))
             else:
                 result = None  # No valid matches available
 
 
             if result:  # Ensure extractOne() found a match
                 match, score = result  # Unpack only if not None
-                cleaned_column.append(unique_texts[match])  # Use closest match
+                resolved[text] = unique_texts[match]  # Use closest match
             else:
                 unique_texts[text] = text  # Add new unique text
-                cleaned_column.append(text)
+                resolved[text], score = text, 100
+            cleaned_column.append(resolved[text])
+            decisions.append((text, resolved[text], score))
 
 
-        # Progress tracking
-        elapsed_time = time.time() - start_time
-        avg_time_per_entry = elapsed_time / (index + 1)
-        estimated_time_remaining = avg_time_per_entry * (total_entries - (index + 1))
+    progress.close()
+    if cache:
+        cache.save(column, decisions)
+    count("scrub.entries", len(cleaned_column))
+    count("scrub.new_texts", len(decisions))
+    return cleaned_column
 
 
-        print(f"\rChecked: {index + 1}/{total_entries} | Remaining: {total_entries - (index + 1)} "
-              f"| Estimated Time Left: {estimated_time_remaining:.2f} seconds", end="")
+def scrub(df, cache_file=NAME_CACHE_FILE):
+    """
+    Cleans, deduplicates and numbers the component columns. Returns a new DataFrame.
+    cache_file is the NameCache shared across runs; None matches every text afresh.
+    """
+    df = df.copy()
 
 
-    return cleaned_column
+    # ==========================================
+    # Step 3: Apply Cleaning to Relevant Columns
+    # ==========================================
+
+
+    for col in columns_to_clean:
+        if col in df.columns:  # Ensure the column exists
+            df[col] = df[col].apply(clean_text)  # Apply cleaning function
+
+
+    # Apply deduplication to each relevant column
+    cache = NameCache(cache_file) if cache_file else None
+    try:
+        for col in columns_to_clean:
+            if col in df.columns:
+                df[col] = deduplicate_column(df[col], cache, col)
+    finally:
+        if cache:
+            cache.close()
+
+
+    # =============================
+    # Step 5: Ensure Consistent IDs
+    # =============================
+
+
+    if "Component ID" in df.columns:
+        # Fill missing IDs with an auto-generated number
+        df["Component ID"] = df["Component ID"].fillna(pd.Series(df.index + 1, index=df.index)).astype(int)
+
+
+    return df
+
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, cache_file=NAME_CACHE_FILE):
+    # ===========================
+    # Step 1: Load the Excel File
+    # ===========================
+
+
+    # Use openpyxl to support .xlsx format
+    df = pd.read_excel(input_file, engine="openpyxl")
 
 
-# Apply deduplication to each relevant column
-for col in columns_to_clean:
-    if col in df.columns:
-        df[col] = deduplicate_column(df[col])
+    # Inspect the first few rows
+    print("Original Data Sample:")
+    print(df.head())
 
 
-# =============================
-# Step 5: Ensure Consistent IDs
-# =============================
+    df = scrub(df, cache_file)
 
 
-if "Component ID" in df.columns:
-    # Fill missing IDs with an auto-generated number
-    df["Component ID"] = df["Component ID"].fillna(df.index + 1).astype(int)
+    # =========================
+    # Step 6: Save Cleaned Data
+    # =========================
 
 
-# =========================
-# Step 6: Save Cleaned Data
-# =========================
+    # Save cleaned dataset to a new Excel file (or .csv/.parquet, by extension)
+    write_table(df, output_file)
 
 
-# Save cleaned dataset to a new Excel file
-output_file = "IVN_Dataset_Cleaned.xlsx"
-df.to_excel(output_file, index=False, engine="openpyxl")
+    print(f"\n\nData cleaning complete! Cleaned file saved as: {output_file}")
 
 
-print(f"\n\nData cleaning complete! Cleaned file saved as: {output_file}")
+if __name__ == "__main__":
+    main()
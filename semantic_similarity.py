@@ -0,0 +1,258 @@
+# This is semantic_similarity.py
+# Scores Enabling vs. Dependent component descriptions with dense embeddings instead of raw token counts,
+# so paraphrased policy language still links. Vectors are cached on disk by component ID and description hash
+# and reused across runs; only components that are new, or whose description changed, get encoded.
+
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+from ivn_generate_unique_IDs_for_components import component_ids
+from instrumentation import count, timer
+from ivn_output import read_table, write_table
+
+# Settings
+INPUT_FILE = "ivntest.xlsx"
+OUTPUT_FILE = "semantic_similarity_scores.xlsx"
+STORE_DIR = "ivn_vectors"  # One subdirectory per backend
+BACKEND = "auto"  # "auto", "sentence" or "lsa"
+SENTENCE_MODEL = "all-MiniLM-L6-v2"
+LSA_DIMENSIONS = 200
+THRESHOLD = 0.6
+BATCH_SIZE = 256  # Descriptions encoded per batch
+BLOCK_SIZE = 2048  # Rows per block in the pairwise matrix multiply
+
+
+# ==================
+# Vectorizer backends
+# ==================
+
+
+class SentenceEmbeddingBackend:
+    """Local CPU sentence-embedding model (requires sentence-transformers)."""
+
+    def __init__(self, model_name=SENTENCE_MODEL):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = "sentence-" + model_name.replace("/", "_")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def fit(self, texts, model_dir):
+        pass  # Pretrained; nothing to fit
+
+    def encode(self, texts):
+        vectors = self.model.encode(list(texts), batch_size=BATCH_SIZE, convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+        return vectors.astype(np.float32)
+
+
+class LSABackend:
+    """
+    Hashed word n-grams projected onto an SVD basis (latent semantic analysis).
+    The basis is fitted on the first run and saved next to the vectors, so
+    later runs project new text into the same space as the cached vectors.
+    """
+
+    def __init__(self, dim=LSA_DIMENSIONS, n_features=2 ** 16):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.hasher = HashingVectorizer(n_features=n_features, ngram_range=(1, 2),
+                                        alternate_sign=False, norm="l2")
+        self.name = f"lsa-{dim}"
+        self.dim = dim
+        self.components = None
+
+    def fit(self, texts, model_dir):
+        basis_file = os.path.join(model_dir, "lsa_basis.npy")
+        if os.path.exists(basis_file):
+            self.components = np.load(basis_file)
+            return
+        from sklearn.decomposition import TruncatedSVD
+        X = self.hasher.transform(texts)
+        n_components = min(self.dim, max(X.shape[0] - 1, 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=0).fit(X)
+        components = np.zeros((self.dim, X.shape[1]), dtype=np.float32)
+        components[:n_components] = svd.components_
+        self.components = components
+        os.makedirs(model_dir, exist_ok=True)
+        np.save(basis_file, components)
+
+    def encode(self, texts):
+        vectors = np.asarray(self.hasher.transform(texts) @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+
+def get_backend(name=BACKEND):
+    """
+    "auto" uses the sentence model when it loads and falls back to LSA otherwise: when
+    sentence-transformers is not installed, or the model can't be downloaded or read
+    (offline, proxy, corrupt cache). "sentence" raises those errors instead.
+    """
+    if name in ("auto", "sentence"):
+        try:
+            return SentenceEmbeddingBackend()
+        except ImportError:
+            if name == "sentence":
+                raise
+            print("sentence-transformers not installed; using the LSA backend.")
+        except Exception as e:  # OSError, or the HTTP client's network errors
+            if name == "sentence":
+                raise
+            print(f"Could not load the {SENTENCE_MODEL} model ({e}); using the LSA backend.")
+    return LSABackend()
+
+
+# ============
+# Vector store
+# ============
+
+
+def vector_key(component_id, text):
+    """Store key of a component's vector: its ID plus a hash of the description that was encoded."""
+    return f"{component_id}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+class VectorStore:
+    """
+    Append-only float32 matrix on disk (vectors.f32), memory-mapped for reads,
+    with the key (see vector_key) of each row kept in ids.json. add() appends the
+    vectors before it replaces ids.json, so after a crash in between the file may
+    hold rows without an ID; they are truncated when the store is opened.
+    """
+
+    def __init__(self, directory, dim):
+        self.directory = directory
+        self.dim = dim
+        self.vector_file = os.path.join(directory, "vectors.f32")
+        self.id_file = os.path.join(directory, "ids.json")
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.id_file):
+            with open(self.id_file, encoding="utf-8") as f:
+                self.ids = json.load(f)
+        else:
+            self.ids = []
+        size = len(self.ids) * dim * np.dtype(np.float32).itemsize
+        if os.path.exists(self.vector_file) and os.path.getsize(self.vector_file) > size:
+            with open(self.vector_file, "r+b") as f:
+                f.truncate(size)
+        self.index = {component_id: row for row, component_id in enumerate(self.ids)}
+
+    def __contains__(self, component_id):
+        return component_id in self.index
+
+    def matrix(self):
+        if not self.ids:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vector_file, dtype=np.float32, mode="r", shape=(len(self.ids), self.dim))
+
+    def add(self, ids, vectors):
+        with open(self.vector_file, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        for component_id in ids:
+            self.index[component_id] = len(self.ids)
+            self.ids.append(component_id)
+        temp_file = self.id_file + ".tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(self.ids, f)
+        os.replace(temp_file, self.id_file)
+
+    def get(self, ids):
+        rows = [self.index[component_id] for component_id in ids]
+        return np.asarray(self.matrix()[rows])
+
+
+def encode_components(store, backend, texts_by_key, batch_size=BATCH_SIZE):
+    """Encodes the texts whose key is missing from the store in batches. Returns the number encoded."""
+    missing = [key for key in texts_by_key if key not in store]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        with timer("semantic.vectorize"):
+            vectors = backend.encode([texts_by_key[key] for key in batch])
+        store.add(batch, vectors)
+        count("semantic.encoded", len(batch))
+    return len(missing)
+
+
+def score_blocks(left, right, threshold, block_size=BLOCK_SIZE):
+    """
+    Cosine scores of every left x right row pair above threshold, computed as
+    blocked matrix multiplies of unit vectors. Yields (i, j, score) arrays per block.
+    """
+    for i0 in range(0, left.shape[0], block_size):
+        left_block = np.asarray(left[i0:i0 + block_size])
+        for j0 in range(0, right.shape[0], block_size):
+            with timer("semantic.pair_scoring"):
+                scores = left_block @ np.asarray(right[j0:j0 + block_size]).T
+                i, j = np.nonzero(scores >= threshold)
+            count("semantic.pairs_scored", scores.size)
+            if len(i):
+                yield i + i0, j + j0, scores[i, j]
+
+
+# ====
+# Main
+# ====
+
+
+def components(df, side):
+    columns = [f"{side} Component Description", f"{side} Component", f"{side} Source",
+               f"{side} Component URL", f"{side} Source Agency"]
+    frame = df[columns].copy()
+    frame["ID"] = component_ids(df, side)
+    return frame.drop_duplicates(subset="ID").reset_index(drop=True)
+
+
+def main(input_file=INPUT_FILE, output_file=OUTPUT_FILE, backend=BACKEND, threshold=THRESHOLD, store_dir=STORE_DIR):
+    df = read_table(input_file).fillna("")
+    enabling_df = components(df, "Enabling")
+    dependent_df = components(df, "Dependent")
+
+    texts_by_id = dict(zip(enabling_df["ID"], enabling_df["Enabling Component Description"]))
+    texts_by_id.update(zip(dependent_df["ID"], dependent_df["Dependent Component Description"]))
+    texts_by_id = {component_id: str(text) for component_id, text in texts_by_id.items() if str(text).strip()}
+    keys = {component_id: vector_key(component_id, text) for component_id, text in texts_by_id.items()}
+    texts_by_key = {keys[component_id]: text for component_id, text in texts_by_id.items()}
+
+    backend = get_backend(backend)
+    store_dir = os.path.join(store_dir, backend.name)
+    backend.fit(list(texts_by_id.values()), store_dir)
+    store = VectorStore(store_dir, backend.dim)
+    encoded = encode_components(store, backend, texts_by_key)
+    print(f"Encoded {encoded} new components ({len(texts_by_id) - encoded} reused from {store_dir}).")
+
+    enabling_df = enabling_df[enabling_df["ID"].isin(texts_by_id)].reset_index(drop=True)
+    dependent_df = dependent_df[dependent_df["ID"].isin(texts_by_id)].reset_index(drop=True)
+    left = store.get(enabling_df["ID"].map(keys))
+    right = store.get(dependent_df["ID"].map(keys))
+
+    rows = []
+    for i, j, scores in score_blocks(left, right, threshold):
+        enabling = enabling_df.iloc[i].reset_index(drop=True)
+        dependent = dependent_df.iloc[j].reset_index(drop=True)
+        keep = (enabling["Enabling Source"] != dependent["Dependent Source"]).to_numpy()  # Skip same-source pairs
+        block = pd.concat([enabling[keep].reset_index(drop=True), dependent[keep].reset_index(drop=True)], axis=1)
+        block["Similarity"] = scores[keep]
+        rows.append(block.drop(columns="ID"))
+
+    columns = ["Enabling Source", "Enabling Component", "Enabling Component Description",
+               "Dependent Component", "Dependent Component Description", "Dependent Source",
+               "Enabling Component URL", "Dependent Component URL",
+               "Enabling Source Agency", "Dependent Source Agency", "Similarity"]
+    output_df = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=columns)
+    output_df = output_df[columns].sort_values("Similarity", ascending=False)
+    write_table(output_df, output_file, float_format="0.0000")
+    print(f"{len(output_df)} semantic similarity scores (>= {threshold}) saved to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score description pairs with cached dense embeddings.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--backend", choices=["auto", "sentence", "lsa"], default=BACKEND)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--store", default=STORE_DIR, help="Vector store directory")
+    args = parser.parse_args()
+    main(args.input, args.output, args.backend, args.threshold, args.store)
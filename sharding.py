@@ -0,0 +1,254 @@
+# This is sharding.py
+# Work partitioning for the long-running jobs (URL checks, citation extraction, LLM recommendations).
+# Work items are assigned to one of N shards by the hash of their key, so every machine started with
+# --shard i/N agrees on the split without coordination. With a queue file, items are leased through
+# SQLite: results are stored as they finish, and items leased by a worker that crashed are picked up
+# again once the lease expires. merge_shards() combines the per-shard outputs into one table.
+# The queue relies on SQLite file locking, which is not reliable on network filesystems (NFS, SMB):
+# keep the queue file on a local disk and its workers on that host. Workers on other machines split
+# the job with --shard alone (no shared queue) and their outputs are merged afterwards.
+#
+# Example (two workers on one host):
+#   python ivn.py urls --shard 0/2 --queue jobs.sqlite --output checked.0.xlsx
+#   python ivn.py urls --shard 1/2 --queue jobs.sqlite --output checked.1.xlsx
+#   python ivn.py merge urls checked.0.xlsx checked.1.xlsx --output ivntest_checked.xlsx
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import hashlib
+from instrumentation import Progress, count
+
+LEASE_SECONDS = 600   # an item whose lease is not renewed for this long is assumed lost and handed out again
+LEASE_BATCH = 10
+POLL_SECONDS = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    job TEXT NOT NULL,
+    key TEXT NOT NULL,
+    shard TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    PRIMARY KEY (job, key)
+);
+CREATE INDEX IF NOT EXISTS items_by_shard ON items (job, shard, status);
+CREATE TABLE IF NOT EXISTS jobs (
+    job TEXT PRIMARY KEY,
+    shards INTEGER NOT NULL
+);
+"""
+
+
+def parse_shard(text):
+    """ "i/N" -> (i, N), with 0 <= i < N."""
+    try:
+        index, total = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N (e.g. 0/4), not '{text}'")
+    if total < 1 or not 0 <= index < total:
+        raise ValueError(f"Shard index must be between 0 and {total - 1}, not {index}")
+    return index, total
+
+
+def shard_of(key, total):
+    return int(hashlib.sha256(str(key).encode("utf-8")).hexdigest()[:16], 16) % total
+
+
+def in_shard(key, shard):
+    """True when shard is None (no sharding) or key hashes to shard (i, N)."""
+    return shard is None or shard_of(key, shard[1]) == shard[0]
+
+
+class WorkQueue:
+    """
+    SQLite lease queue shared by the workers of a job (on a local filesystem; see above).
+    Each item row records the shard it hashes to, so a job's queue only works with the
+    shard count it was created with; other --shard layouts are rejected.
+    """
+
+    def __init__(self, path, job, shard=None):
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=DELETE")
+        self.connection.executescript(SCHEMA)
+        self.job = job
+        self.shard = "/".join(map(str, shard)) if shard else "all"
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        total = shard[1] if shard else 1
+        self.connection.execute("INSERT OR IGNORE INTO jobs (job, shards) VALUES (?, ?)", (job, total))
+        (stored,) = self.connection.execute("SELECT shards FROM jobs WHERE job = ?", (job,)).fetchone()
+        if stored != total:
+            self.connection.close()
+            layout = f"--shard i/{stored}" if stored > 1 else "no --shard"
+            raise ValueError(f"The queue {path} holds job '{job}' split for {layout}; "
+                             f"use the same layout or a new queue file")
+
+    def add(self, keys):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO items (job, key, shard) VALUES (?, ?, ?)",
+                ((self.job, key, self.shard) for key in keys),
+            )
+
+    def lease(self, n=LEASE_BATCH, lease_seconds=LEASE_SECONDS):
+        """Claims up to n pending (or expired) items of this shard; returns their keys."""
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            keys = [key for (key,) in self.connection.execute(
+                "SELECT key FROM items WHERE job = ? AND shard = ? AND status != 'done' "
+                "AND (owner IS NULL OR lease_expires < ?) LIMIT ?",
+                (self.job, self.shard, now, n),
+            )]
+            self.connection.executemany(
+                "UPDATE items SET status = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE job = ? AND key = ?",
+                ((self.owner, now + lease_seconds, self.job, key) for key in keys),
+            )
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return keys
+
+    def renew(self, keys, lease_seconds=LEASE_SECONDS):
+        """Extends this worker's leases on keys; returns the keys it still holds (not re-leased by another)."""
+        keys = list(keys)
+        if not keys:
+            return set()
+        placeholders = ", ".join("?" * len(keys))
+        with self.connection:
+            self.connection.execute(
+                f"UPDATE items SET lease_expires = ? WHERE job = ? AND owner = ? AND status = 'leased' "
+                f"AND key IN ({placeholders})",
+                [time.time() + lease_seconds, self.job, self.owner] + keys,
+            )
+            return {key for (key,) in self.connection.execute(
+                f"SELECT key FROM items WHERE job = ? AND owner = ? AND status = 'leased' AND key IN ({placeholders})",
+                [self.job, self.owner] + keys,
+            )}
+
+    def release(self):
+        """Hands this worker's unfinished leases back, so a restarted worker need not wait for them to expire."""
+        with self.connection:
+            self.connection.execute(
+                "UPDATE items SET status = 'pending', owner = NULL, lease_expires = NULL "
+                "WHERE job = ? AND owner = ? AND status = 'leased'",
+                (self.job, self.owner),
+            )
+
+    def complete(self, key, result):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE items SET status = 'done', owner = NULL, lease_expires = NULL, result = ? "
+                "WHERE job = ? AND key = ?",
+                (json.dumps(result), self.job, key),
+            )
+
+    def remaining(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM items WHERE job = ? AND shard = ? AND status != 'done'", (self.job, self.shard)
+        ).fetchone()[0]
+
+    def results(self, keys):
+        wanted = set(keys)
+        rows = self.connection.execute(
+            "SELECT key, result FROM items WHERE job = ? AND shard = ? AND status = 'done'", (self.job, self.shard)
+        )
+        return {key: json.loads(result) for key, result in rows if key in wanted}
+
+    def close(self):
+        self.connection.close()
+
+
+def process_items(keys, func, job, shard=None, queue_file=None, desc="Processed items", on_result=None):
+    """
+    Runs func(key) for every key in this shard and returns {key: result}.
+    Results must be JSON-serialisable when queue_file is given: they are stored
+    in the queue, so a restarted worker only runs what is not done yet and waits
+    for items still leased by other live workers of the same shard. The rest of a
+    leased batch has its lease renewed before each item runs, so slow items are
+    not handed to another worker while this one is still busy with the batch.
+    on_result(key, result) is called as each item finishes.
+    """
+    keys = [key for key in dict.fromkeys(keys) if in_shard(key, shard)]
+    count(f"{job}.shard_items", len(keys))
+    progress = Progress(len(keys), desc)
+    if not queue_file:
+        results = {}
+        for key in keys:
+            results[key] = func(key)
+            if on_result:
+                on_result(key, results[key])
+            progress.update()
+        progress.close()
+        return results
+
+    queue = WorkQueue(queue_file, job, shard)
+    try:
+        queue.add(keys)
+        done = queue.results(keys)
+        if done:
+            progress.update(len(done))
+        while True:
+            leased = queue.lease()
+            if not leased:
+                if not queue.remaining():
+                    break
+                time.sleep(POLL_SECONDS)  # other workers hold the rest; pick them up if their leases expire
+                continue
+            for n, key in enumerate(leased):
+                if key not in queue.renew(leased[n:]):
+                    continue  # the lease expired and another worker took the item
+                result = func(key)
+                queue.complete(key, result)
+                if on_result:
+                    on_result(key, result)
+                progress.update()
+        progress.close()
+        return queue.results(keys)
+    finally:
+        queue.release()
+        queue.close()
+
+
+# =====
+# Merge
+# =====
+
+
+# How each job's shard outputs combine: "concat" stacks rows; "overlay" takes the per-shard
+# outputs of the same sheet and fills each of the listed columns from whichever shard filled it.
+MERGE_MODES = {
+    "urls": ("overlay", ["Enabling URL Status", "Dependent URL Status"]),
+    "recommend": ("overlay", ["Recommendation"]),
+    "citations": ("concat", None),
+}
+
+
+def _blank(series):
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def merge_shards(job, paths, output_file):
+    import pandas as pd
+    from ivn_output import read_table, write_table
+    mode, columns = MERGE_MODES[job]
+    frames = [read_table(path) for path in paths]
+    if mode == "concat":
+        merged = pd.concat(frames, ignore_index=True)
+    else:
+        merged = frames[0].copy()
+        for frame in frames[1:]:
+            if len(frame) != len(merged):
+                raise ValueError("Shard outputs of an overlay job must come from the same input sheet")
+            for column in columns:
+                merged[column] = merged[column].astype(object).where(~_blank(merged[column]), frame[column])
+    write_table(merged, output_file)
+    print(f"🧩 Merged {len(paths)} shard outputs into {output_file} ({len(merged)} rows)")
+    return merged
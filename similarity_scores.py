@@ -1,78 +1,16 @@
 # This is similarity_scores_2025-03-17.py
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from itertools import product  # Used to generate combinations
+from itertools import chain
+from collections import defaultdict
+from instrumentation import count, timer
+from ivn_output import fill_blank, write_table
+from component_registry import ComponentRegistry
 
 # Load the Excel file
 input_file = "ivntest.xlsx"
 output_file = "similarity_scores_filtered.xlsx"
-
-# Read the Excel file into a DataFrame
-df = pd.read_excel(input_file)
-
-# Check if required columns exist
-if "Enabling Component Description" not in df.columns or "Dependent Component Description" not in df.columns:
-    raise ValueError("The input file must contain columns 'Enabling Component Description' and 'Dependent Component Description'.")
-
-# Fill missing values with an empty string to avoid issues with NaN
-df = df.fillna("")
-
-# Separate Enabling and Dependent components
-enabling_df = df[[
-    "Enabling Component Description",
-    "Enabling Component",
-    "Enabling Source",
-    "Enabling Component URL",
-    "Enabling Source Agency"
-]].drop_duplicates()
-
-dependent_df = df[[
-    "Dependent Component Description",
-    "Dependent Component",
-    "Dependent Source",
-    "Dependent Component URL",
-    "Dependent Source Agency"
-]].drop_duplicates()
-
-# Function to calculate cosine similarity
-def calculate_similarity(text1, text2):
-    if not text1 or not text2:  # Avoid processing empty text
-        return 0
-    vectorizer = CountVectorizer().fit_transform([text1, text2])
-    vectors = vectorizer.toarray()
-    return cosine_similarity(vectors)[0, 1]
-
-# Generate all possible combinations and calculate similarity
-filtered_data = []
-for enabling, dependent in product(enabling_df.itertuples(index=False), dependent_df.itertuples(index=False)):
-    # Skip if the sources are the same
-    if enabling[2] == dependent[2]:
-        continue
-    similarity = calculate_similarity(enabling[0], dependent[0])  # Compare descriptions
-    if similarity >= 0.6:  # Only add rows where similarity >= 0.6
-        filtered_data.append({
-            "Enabling Source": enabling[2],
-            "Enabling Component": enabling[1],
-            "Enabling Component Description": enabling[0],
-            "Dependent Component": dependent[1],
-            "Dependent Component Description": dependent[0],
-            "Dependent Source": dependent[2],
-            "Linkage mandated by what US Code or OMB policy?": "",
-            "Enabling Component URL": enabling[3],
-            "Dependent Component URL": dependent[3],
-            "Enabling Source Agency": enabling[4],
-            "Dependent Source Agency": dependent[4],
-            "Notes and keywords": "",
-            "Keywords Tab Items Found": "",
-            "Enabling Component Responsible Office": "",
-            "Dependent Component Responsible Office": "",
-            "Edits": "",
-            "Similarity": similarity  # Add similarity score for reference
-        })
-
-# Create a DataFrame from the filtered data
-filtered_df = pd.DataFrame(filtered_data)
+THRESHOLD = 0.6
 
 # Ensure the columns match the sequence in the original `ivntest.xlsx`
 original_columns = [
@@ -95,10 +33,183 @@ original_columns = [
     "Similarity"  # Include similarity for visibility
 ]
 
-# Reorder columns and save to Excel
-filtered_df = filtered_df[original_columns]
-filtered_df.to_excel(output_file, index=False, float_format="%.4f")
+# Columns that identify a component for pairing (each side's columns, in this order)
+SIMILARITY_FIELDS = ["Component Description", "Component", "Source", "Component URL", "Source Agency"]
+
+PAIR_CHUNK = 200_000  # pairs scored per sparse product (bounds memory on the full product)
+
+def description_vectors(enabling_texts, dependent_texts):
+    """
+    Count vectors of both sides' descriptions over one shared vocabulary, L2-normalised,
+    so the cosine similarity of a pair is the dot product of its rows. Counting the
+    tokens of a pair of texts with a vocabulary fitted on just those two gives the same
+    counts, so the scores equal those of a CountVectorizer per pair.
+    """
+    import scipy.sparse as sp
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.preprocessing import normalize
+    vectorizer = CountVectorizer()
+    try:
+        vectorizer.fit(list(enabling_texts) + list(dependent_texts))
+    except ValueError:  # no description has a single token: every score is 0
+        return sp.csr_matrix((len(enabling_texts), 1)), sp.csr_matrix((len(dependent_texts), 1))
+    return normalize(vectorizer.transform(enabling_texts)), normalize(vectorizer.transform(dependent_texts))
+
+def candidate_pairs(enabling_df, dependent_df, max_df=None, agency=None):
+    """
+    Yields (enabling, dependent) row positions worth scoring, in product order.
+    Dependents are grouped by source and agency, and an inverted index maps each
+    description token to the dependents containing it. A pair is a candidate when
+    the sources differ and the descriptions share at least one token: with no
+    shared token the count-vector cosine is exactly 0.
+    max_df (approximate): tokens found in more than this fraction of dependent
+    descriptions don't generate candidates on their own.
+    agency: "same" or "cross" restricts pairs to the same or to different agencies.
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    analyzer = CountVectorizer().build_analyzer()
+    postings = defaultdict(set)
+    by_source = defaultdict(set)
+    by_agency = defaultdict(set)
+    for j, (description, _, source, _, dependent_agency) in enumerate(dependent_df.itertuples(index=False)):
+        for token in analyzer(str(description)):
+            postings[token].add(j)
+        by_source[source].add(j)
+        by_agency[dependent_agency].add(j)
+    if max_df is not None:
+        limit = max_df * len(dependent_df)
+        postings = {token: js for token, js in postings.items() if len(js) <= limit}
+
+    for i, (description, _, source, _, enabling_agency) in enumerate(enabling_df.itertuples(index=False)):
+        candidates = set()
+        for token in set(analyzer(str(description))):
+            candidates |= postings.get(token, set())
+        candidates -= by_source.get(source, set())
+        if agency == "same":
+            candidates &= by_agency.get(enabling_agency, set())
+        elif agency == "cross":
+            candidates -= by_agency.get(enabling_agency, set())
+        for j in sorted(candidates):
+            yield i, j
+
+def unique_components(df, side):
+    """
+    The distinct (description, component, source, URL, agency) rows of one side, in
+    first-seen order. Variants of a component (a description differing in case, a
+    blank URL) are kept as separate rows, so each is paired and reported.
+    """
+    return df[[f"{side} {field}" for field in SIMILARITY_FIELDS]].drop_duplicates()
+
+def similar_pairs(df, threshold=THRESHOLD, prune=True, max_df=None, agency=None):
+    """
+    Returns (enabling_df, dependent_df, i, j, scores): the unique components of each
+    side and, in product order, the row positions and scores of the pairs >= threshold.
+    """
+    # Check if required columns exist
+    if "Enabling Component Description" not in df.columns or "Dependent Component Description" not in df.columns:
+        raise ValueError("The input file must contain columns 'Enabling Component Description' and 'Dependent Component Description'.")
+
+    # Fill missing values with an empty string to avoid issues with NaN
+    df = fill_blank(df)
+
+    # Unique Enabling and Dependent components
+    enabling_df = unique_components(df, "Enabling")
+    dependent_df = unique_components(df, "Dependent")
+
+    with timer("similarity.vectorize"):
+        enabling_vectors, dependent_vectors = description_vectors(
+            enabling_df.iloc[:, 0].astype(str), dependent_df.iloc[:, 0].astype(str))
+    enabling_source = enabling_df.iloc[:, 2].astype(str).to_numpy()
+    dependent_source = dependent_df.iloc[:, 2].astype(str).to_numpy()
+    enabling_agency = enabling_df.iloc[:, 4].astype(str).to_numpy()
+    dependent_agency = dependent_df.iloc[:, 4].astype(str).to_numpy()
+
+    used_candidates = prune and threshold > 0
+    if used_candidates:
+        blocks = _candidate_blocks(candidate_pairs(enabling_df, dependent_df, max_df, agency))
+    else:
+        # Zero-similarity pairs can pass a threshold <= 0, so every pair is scored
+        blocks = _product_blocks(len(enabling_df), len(dependent_df))
+
+    # Score each block of pairs as row-wise dot products and keep those >= threshold
+    kept_i, kept_j, kept_scores = [], [], []
+    scored = 0
+    with timer("similarity.pair_scoring"):
+        for i, j in blocks:
+            # Skip if the sources are the same
+            keep = enabling_source[i] != dependent_source[j]
+            if not used_candidates and agency:
+                keep &= (enabling_agency[i] == dependent_agency[j]) == (agency == "same")
+            i, j = i[keep], j[keep]
+            scored += len(i)
+            scores = np.asarray(enabling_vectors[i].multiply(dependent_vectors[j]).sum(axis=1)).ravel()
+            passed = scores >= threshold
+            kept_i.append(i[passed])
+            kept_j.append(j[passed])
+            kept_scores.append(scores[passed])
+    count("similarity.pairs_scored", scored)
+    count("similarity.pairs_skipped", len(enabling_df) * len(dependent_df) - scored)
+
+    def joined(arrays, dtype):
+        return np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+
+    return (enabling_df, dependent_df,
+            joined(kept_i, np.int64), joined(kept_j, np.int64), joined(kept_scores, float))
+
+def _candidate_blocks(pairs):
+    pairs = np.fromiter(chain.from_iterable(pairs), dtype=np.int64).reshape(-1, 2)
+    for start in range(0, len(pairs), PAIR_CHUNK):
+        yield pairs[start:start + PAIR_CHUNK, 0], pairs[start:start + PAIR_CHUNK, 1]
+
+def _product_blocks(n_enabling, n_dependent):
+    """All (i, j) in product order, a few enabling rows at a time."""
+    rows = max(1, PAIR_CHUNK // max(n_dependent, 1))
+    for start in range(0, n_enabling, rows):
+        i = np.arange(start, min(start + rows, n_enabling))
+        yield np.repeat(i, n_dependent), np.tile(np.arange(n_dependent), len(i))
+
+def pair_rows(enabling_df, dependent_df, i, j, scores):
+    """Output rows (original_columns) for the pairs (enabling_df row i, dependent_df row j)."""
+    enabling = [enabling_df.iloc[:, k].to_numpy()[i] for k in range(5)]
+    dependent = [dependent_df.iloc[:, k].to_numpy()[j] for k in range(5)]
+    blank = [""] * len(i)
+    return pd.DataFrame({
+        "Enabling Source": enabling[2],
+        "Enabling Component": enabling[1],
+        "Enabling Component Description": enabling[0],
+        "Dependent Component": dependent[1],
+        "Dependent Component Description": dependent[0],
+        "Dependent Source": dependent[2],
+        "Linkage mandated by what US Code or OMB policy?": blank,
+        "Enabling Component URL": enabling[3],
+        "Dependent Component URL": dependent[3],
+        "Enabling Source Agency": enabling[4],
+        "Dependent Source Agency": dependent[4],
+        "Notes and keywords": blank,
+        "Keywords Tab Items Found": blank,
+        "Enabling Component Responsible Office": blank,
+        "Dependent Component Responsible Office": blank,
+        "Edits": blank,
+        "Similarity": scores  # Add similarity score for reference
+    }, columns=original_columns)
+
+def compute_similarity(df, threshold=THRESHOLD, prune=True, max_df=None, agency=None):
+    """
+    Scores Enabling x Dependent description pairs from different sources; keeps pairs >= threshold.
+    prune scores only candidate_pairs() (exact for threshold > 0); see there for max_df and agency.
+    """
+    return pair_rows(*similar_pairs(df, threshold, prune, max_df, agency))
+
+def main(input_file=input_file, output_file=output_file, threshold=THRESHOLD, prune=True, max_df=None, agency=None):
+    # Read the Excel file into a DataFrame
+    registry = ComponentRegistry.load(input_file)
+
+    filtered_df = compute_similarity(registry.edges, threshold, prune, max_df, agency)
 
-print(f"Filtered similarity scores (>= 0.6) saved to {output_file}")
+    # Save to Excel
+    write_table(filtered_df, output_file, float_format="0.0000")
 
+    print(f"Filtered similarity scores (>= {threshold}) saved to {output_file}")
 
+if __name__ == "__main__":
+    main()
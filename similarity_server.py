@@ -0,0 +1,227 @@
+# This is similarity_server.py
+# Long-lived localhost service for "what is similar to component X?" questions. The workbook's component
+# registry and TF-IDF vectors (the same ones ivn_fuzzy_match.py scores with) are loaded once and kept in
+# memory, so each query is a single sparse product instead of a full load-vectorize-score run. The server
+# watches the workbook and reloads when its content hash changes; queries keep being answered from the
+# previous version while the new one loads.
+#
+# Endpoints (GET, JSON responses; components are given by ID or by exact Component name):
+#   /topk?component=X&k=10[&agency=APHIS][&side=dependent]   the k components most similar to X
+#   /pair?a=X&b=Y                                            the similarity of two components
+#   /status                                                  workbook hash, component count, load time
+#
+# Example:
+#   python ivn.py serve --input ivntest.xlsx --port 8765
+#   curl 'http://127.0.0.1:8765/topk?component=Nonlethal%20Initiative&k=5&agency=APHIS'
+
+import os
+import json
+import time
+import argparse
+import threading
+import numpy as np
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from instrumentation import count, timer
+
+INPUT_FILE = "ivntest.xlsx"
+HOST = "127.0.0.1"  # localhost only: the service has no authentication
+PORT = 8765
+TOP_K = 10
+RELOAD_CHECK_SECONDS = 2  # how often a query may stat the workbook for changes
+
+
+class QueryError(ValueError):
+    """A bad query; answered with HTTP 400 (or 404 for unknown components)."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class Snapshot:
+    """One loaded workbook version: its hash, component registry and TF-IDF vectors."""
+
+    def __init__(self, digest, registry, vectors):
+        self.digest = digest
+        self.registry = registry
+        self.vectors = vectors
+        self.loaded = time.time()
+        components = registry.components
+        self.by_id = {component_id: code for code, component_id in components["ID"].items()}
+        self.by_name = {}
+        for code, name in components["Component"].dropna().items():
+            self.by_name.setdefault(str(name).strip().lower(), []).append(code)
+        self.agency = components["Agency"].fillna("").astype(str).str.strip().str.lower().to_numpy()
+        self.sides = {side: np.isin(components.index, np.unique(registry.codes(side)))
+                      for side in ("Enabling", "Dependent")}
+
+    @classmethod
+    def load(cls, path, digest, cache_dir):
+        from component_registry import ComponentRegistry
+        from ivn_fuzzy_match import component_vectors
+        registry = ComponentRegistry.load(path, cache_dir)
+        return cls(digest, registry, component_vectors(registry).tocsr())
+
+    def code(self, component):
+        """Code of a component given by ID or exact (case-insensitive) Component name."""
+        if not component:
+            raise QueryError("Missing component")
+        if component in self.by_id:
+            return self.by_id[component]
+        codes = self.by_name.get(component.strip().lower(), [])
+        if not codes:
+            raise QueryError(f"Unknown component '{component}'", status=404)
+        if len(codes) > 1:
+            ids = ", ".join(str(component_id) for component_id in self.registry.components.loc[codes, "ID"])
+            raise QueryError(f"'{component}' names {len(codes)} components; query by ID instead: {ids}")
+        return codes[0]
+
+    def describe(self, code, score=None):
+        row = self.registry.components.loc[code]
+        result = {field.lower(): (None if value is None or value != value else value)  # NaN -> null
+                  for field, value in row.items()}
+        if score is not None:
+            result["score"] = round(float(score), 6)
+        return result
+
+    def scores(self, code):
+        return (self.vectors @ self.vectors[code].T).toarray().ravel()
+
+    def top_k(self, component, k=TOP_K, agency=None, side=None):
+        code = self.code(component)
+        scores = self.scores(code)
+        keep = np.ones(len(scores), dtype=bool)
+        keep[code] = False
+        if agency:
+            keep &= self.agency == agency.strip().lower()
+        if side:
+            keep &= self.sides[side.capitalize()]
+        candidates = np.flatnonzero(keep & (scores > 0))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        best = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return {"component": self.describe(code), "results": [self.describe(c, scores[c]) for c in best]}
+
+    def pair(self, a, b):
+        code_a, code_b = self.code(a), self.code(b)
+        score = self.vectors[code_a].multiply(self.vectors[code_b]).sum()
+        return {"a": self.describe(code_a), "b": self.describe(code_b), "score": round(float(score), 6)}
+
+
+class SimilarityIndex:
+    """The current Snapshot of a workbook, reloaded when the file's content hash changes."""
+
+    def __init__(self, path, cache_dir=".ivn_cache"):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.signature = None
+        self.checked = 0.0
+        self.snapshot = None
+        self.refresh()
+        if self.snapshot is None:
+            raise RuntimeError(f"Could not load {path}")
+
+    def refresh(self):
+        """Reloads if the workbook changed. While one thread reloads, others keep the old snapshot."""
+        now = time.monotonic()
+        if self.snapshot is not None and now - self.checked < RELOAD_CHECK_SECONDS:
+            return
+        if not self.lock.acquire(blocking=self.snapshot is None):
+            return
+        try:
+            self.checked = now
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self.signature:
+                return
+            from pipeline import file_hash
+            digest = file_hash(self.path)
+            if self.snapshot is None or digest != self.snapshot.digest:
+                with timer("server.load"):
+                    self.snapshot = Snapshot.load(self.path, digest, self.cache_dir)
+                count("server.loads")
+                print(f"🔄 Loaded {self.path} ({digest[:16]}, {len(self.snapshot.registry)} components)")
+            self.signature = signature
+        except Exception as e:
+            # e.g. the workbook is still being saved; retry on a later query
+            print(f"⚠️ Could not reload {self.path}: {e}")
+        finally:
+            self.lock.release()
+
+    def current(self):
+        self.refresh()
+        return self.snapshot
+
+
+def make_handler(index):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                snapshot = index.current()
+                with timer(f"server.{url.path.strip('/') or 'root'}"):
+                    if url.path == "/topk":
+                        side = query.get("side")
+                        if side and side.lower() not in ("enabling", "dependent"):
+                            raise QueryError("side must be 'enabling' or 'dependent'")
+                        try:
+                            k = int(query.get("k", TOP_K))
+                        except ValueError:
+                            raise QueryError("k must be an integer")
+                        if k < 1:
+                            raise QueryError("k must be at least 1")
+                        body = snapshot.top_k(query.get("component"), k, query.get("agency"), side)
+                    elif url.path == "/pair":
+                        body = snapshot.pair(query.get("a"), query.get("b"))
+                    elif url.path == "/status":
+                        body = {"workbook": index.path, "hash": snapshot.digest,
+                                "components": len(snapshot.registry), "loaded": snapshot.loaded}
+                    else:
+                        raise QueryError(f"Unknown endpoint {url.path}; use /topk, /pair or /status", status=404)
+                body["hash"] = snapshot.digest
+                self.reply(200, body)
+            except QueryError as e:
+                self.reply(e.status, {"error": str(e)})
+            except Exception as e:
+                # A bug or unexpected data must not drop the connection without a reply
+                count("server.errors")
+                print(f"⚠️ Error answering {self.path}: {e!r}")
+                self.reply(500, {"error": f"Internal error: {e}"})
+            count("server.requests")
+
+        def reply(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # one line per query is too chatty for an interactive service
+
+    return Handler
+
+
+def serve(input_file=INPUT_FILE, host=HOST, port=PORT, cache_dir=".ivn_cache"):
+    index = SimilarityIndex(input_file, cache_dir)
+    server = ThreadingHTTPServer((host, port), make_handler(index))
+    print(f"🛰️ Serving similarity queries for {input_file} on http://{host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve top-k and pair similarity queries for an IVN workbook.")
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    serve(args.input, args.host, args.port)
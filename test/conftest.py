@@ -0,0 +1,9 @@
+# This is conftest.py
+# Puts the repository root (the IVN scripts) and benchmarks/ (synthetic_ivn.generate_ivn) on sys.path.
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
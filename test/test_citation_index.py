@@ -0,0 +1,59 @@
+# This is test_citation_index.py
+# Checks the SQLite citation index of citation_index.py: re-indexing replaces a document's citations (also
+# when it no longer cites anything), counts stay exact, and citation queries treat GLOB wildcards literally.
+#
+# Example:
+#   python -m pytest test/test_citation_index.py
+
+import sqlite3
+
+import pytest
+
+from extract_citations.citation_index import build_index, citing_documents, co_cited, top_citations
+
+A = "https://example.gov/a.pdf"
+B = "https://example.gov/b.pdf"
+
+
+def row(citation, url, page=1, section="Authorities"):
+    return (citation, f"{url}#page={page}", section, "context", url)
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = str(tmp_path / "citations.sqlite")
+    build_index([row("9 CFR 416", A), row("9 CFR 416", A, 2), row("7 U.S.C. 426", A),
+                 row("9 CFR 416.2", B), row("7 U.S.C. 426", B)], path)
+    return path
+
+
+def query(path, func, *args):
+    connection = sqlite3.connect(path)
+    try:
+        return func(connection, *args)
+    finally:
+        connection.close()
+
+
+def test_counts_and_subdivisions(index):
+    assert query(index, citing_documents, "9 CFR 416") == [("9 CFR 416", A, 2, 1), ("9 CFR 416.2", B, 1, 1)]
+    assert query(index, top_citations)[0] == ("7 USC 426", 2, 2)
+    assert query(index, co_cited, "7 U.S.C. 426") == [("9 CFR 416", 1), ("9 CFR 416.2", 1)]
+
+
+def test_reindexed_document_replaces_its_citations(index):
+    build_index([row("21 U.S.C. 601", A)], index)
+    assert query(index, citing_documents, "9 CFR 416") == [("9 CFR 416.2", B, 1, 1)]
+    assert query(index, citing_documents, "21 U.S.C. 601") == [("21 USC 601", A, 1, 1)]
+
+
+def test_reindexed_document_without_citations_is_removed(index):
+    build_index([], index, documents=[A])
+    assert query(index, citing_documents, "9 CFR 416") == [("9 CFR 416.2", B, 1, 1)]
+    assert query(index, citing_documents, "7 U.S.C. 426") == [("7 USC 426", B, 1, 1)]
+    assert query(index, co_cited, "7 U.S.C. 426") == [("9 CFR 416.2", 1)]
+
+
+def test_glob_wildcards_in_queries_are_literal(index):
+    assert query(index, citing_documents, "9 CFR 41*") == []
+    assert query(index, citing_documents, "9 CFR 41?") == []
@@ -0,0 +1,83 @@
+# This is test_export_graph.py
+# Exports a synthetic IVN (synthetic_ivn.generate_ivn) and a similarity output with export_graph.py and checks
+# that every component and relationship is written exactly once, whatever the chunk size, in each format.
+#
+# Example:
+#   python -m pytest test/test_export_graph.py
+
+import os
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+import pytest
+
+from export_graph import export_graph
+from ivn_generate_unique_IDs_for_components import component_ids
+from synthetic_ivn import generate_ivn
+
+
+@pytest.fixture(scope="module")
+def inputs(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("export")
+    ivn = generate_ivn(80, duplicate_rate=0.2)
+    ivn_file = str(tmp_path / "ivn.xlsx")
+    ivn.to_excel(ivn_file, index=False)
+    similarity_file = str(tmp_path / "similarity.csv")
+    ivn.iloc[:30].assign(**{"Similarity Score": 0.5}).to_csv(similarity_file, index=False)
+    return ivn, ivn_file, similarity_file
+
+
+def expected_graph(ivn):
+    ivn = ivn.fillna("")
+    enabling, dependent = component_ids(ivn, "Enabling"), component_ids(ivn, "Dependent")
+    nodes = set(enabling) | set(dependent)
+    edges = set(zip(enabling, dependent, ["ENABLES"] * len(ivn)))
+    edges |= set(zip(enabling[:30], dependent[:30], ["SIMILAR_TO"] * 30))
+    return nodes, edges
+
+
+@pytest.mark.parametrize("chunk_size", [7, 10000])
+def test_neo4j_export_writes_each_node_and_edge_once(inputs, tmp_path, chunk_size):
+    ivn, ivn_file, similarity_file = inputs
+    export_graph(ivn_file, [similarity_file], str(tmp_path), "neo4j", chunk_size)
+    nodes = pd.read_csv(tmp_path / "nodes.csv", dtype=str, keep_default_na=False)
+    edges = pd.read_csv(tmp_path / "relationships.csv", dtype=str, keep_default_na=False)
+    expected_nodes, expected_edges = expected_graph(ivn)
+
+    assert nodes["componentId:ID"].is_unique
+    assert set(nodes["componentId:ID"]) == expected_nodes
+    keys = list(zip(edges[":START_ID"], edges[":END_ID"], edges[":TYPE"]))
+    assert len(keys) == len(set(keys))
+    assert set(keys) == expected_edges
+    assert set(edges.loc[edges[":TYPE"] == "SIMILAR_TO", "similarity:float"]) == {"0.5"}
+
+
+def test_graphml_export_is_valid_and_deduplicated(inputs, tmp_path):
+    ivn, ivn_file, similarity_file = inputs
+    export_graph(ivn_file, [similarity_file], str(tmp_path), "graphml", 7)
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    graph = ET.parse(tmp_path / "ivn.graphml").getroot().find("g:graph", ns)
+    node_ids = [node.get("id") for node in graph.findall("g:node", ns)]
+    edges = graph.findall("g:edge", ns)
+    expected_nodes, expected_edges = expected_graph(ivn)
+    assert len(node_ids) == len(set(node_ids)) and set(node_ids) == expected_nodes
+    assert len(edges) == len(expected_edges)
+    assert all(edge.get("source") in expected_nodes and edge.get("target") in expected_nodes for edge in edges)
+
+
+def test_parquet_export(inputs, tmp_path):
+    pytest.importorskip("pyarrow")
+    ivn, ivn_file, similarity_file = inputs
+    export_graph(ivn_file, [similarity_file], str(tmp_path), "parquet", 7)
+    expected_nodes, expected_edges = expected_graph(ivn)
+    nodes = pd.read_parquet(os.path.join(tmp_path, "nodes.parquet"))
+    edges = pd.read_parquet(os.path.join(tmp_path, "relationships.parquet"))
+    assert set(nodes["id"]) == expected_nodes and nodes["id"].is_unique
+    assert len(edges) == len(expected_edges)
+
+
+def test_missing_similarity_file_is_skipped(inputs, tmp_path):
+    ivn, ivn_file, _ = inputs
+    export_graph(ivn_file, [str(tmp_path / "missing.csv")], str(tmp_path), "neo4j")
+    edges = pd.read_csv(tmp_path / "relationships.csv")
+    assert set(edges[":TYPE"]) == {"ENABLES"}
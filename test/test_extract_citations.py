@@ -0,0 +1,50 @@
+# This is test_extract_citations.py
+# Checks the page triage of extract_citations.py on small generated PDFs (synthetic_ivn.write_pdf): every page
+# is extracted at most once, the table-of-contents pass respects the page cap, and TOC sections still apply.
+#
+# Example:
+#   python -m pytest test/test_extract_citations.py
+
+import pytest
+
+from extract_citations import extract_citations
+from synthetic_ivn import write_pdf
+
+PAGES = ["Table of Contents Background 2 Authorities 3"] + [
+    f"Page {n} text under 7 U.S.C. 426 and 9 CFR 416 for the program." for n in range(2, 13)]
+
+
+@pytest.fixture
+def extracted_pages(tmp_path, monkeypatch):
+    """Writes the PDF; returns (path, list of the page texts extract_text() was called for)."""
+    import PyPDF2
+    monkeypatch.chdir(tmp_path)  # skipped_pages.txt
+    path = str(tmp_path / "directive.pdf")
+    write_pdf(path, PAGES)
+    calls = []
+    extract_text = PyPDF2.PageObject.extract_text
+
+    def counting(page, *args, **kwargs):
+        text = extract_text(page, *args, **kwargs)
+        calls.append(text)
+        return text
+
+    monkeypatch.setattr(PyPDF2.PageObject, "extract_text", counting)
+    return path, calls
+
+
+def test_each_page_is_extracted_once(extracted_pages):
+    path, calls = extracted_pages
+    citations = extract_citations.extract_us_code_citations(path, "https://example.gov/d.pdf")
+    assert len(calls) == len(PAGES)
+    assert len(citations) == 2 * (len(PAGES) - 1)
+    assert {section for _, page_url, section, _, _ in citations if page_url.endswith("#page=3")} == {"Authorities"}
+
+
+def test_page_cap_applies_to_the_toc_pass(extracted_pages):
+    path, calls = extracted_pages
+    citations = extract_citations.extract_us_code_citations(path, "https://example.gov/d.pdf", max_pages=2)
+    assert len(calls) == 2
+    assert [page_url for _, page_url, _, _, _ in citations] == ["https://example.gov/d.pdf#page=2"] * 2
+    with open("skipped_pages.txt", encoding="utf-8") as f:
+        assert len(f.readlines()) == len(PAGES) - 2
@@ -0,0 +1,65 @@
+# This is test_import_new_EOs.py
+# Runs the Federal Register parsers in import_new_EOs.py against saved API responses
+# (test/fixtures/federal_register), so no network access is needed.
+#
+# Example:
+#   python -m pytest test
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import import_new_EOs
+
+FIXTURES = os.path.join(ROOT, "test", "fixtures", "federal_register")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FixtureFetcher:
+    """Serves the saved index pages by page number instead of calling the API."""
+
+    def __init__(self):
+        self.pages = []
+
+    def get(self, url, params=None, use_cache=True):
+        page = dict(params)["page"]
+        self.pages.append(page)
+        return fixture(f"documents_page{page}.json")
+
+
+def test_parse_document_index_keys_by_eo_number():
+    documents = import_new_EOs.parse_document_index(fixture("documents_page1.json"))
+    assert sorted(documents) == [14256, 14257]  # string numbers are converted; the memorandum is skipped
+    assert documents[14257]["document_number"] == "2025-06063"
+
+
+def test_parse_document_index_without_results():
+    assert import_new_EOs.parse_document_index('{"count": 0}') == {}
+
+
+def test_parse_raw_text_strips_markup_and_entities():
+    text = import_new_EOs.parse_raw_text(fixture("raw_text_2025-05838.txt"))
+    assert text.startswith("2025-05838.txt Federal Register / Vol. 90")
+    assert 'The United States "Investment Accelerator" will facilitate large-scale investments & reduce' in text
+    assert "<" not in text and "\n" not in text
+    assert import_new_EOs.get_first_300_words(text).split()[:3] == ["2025", "05838", "txt"]
+
+
+def test_fetch_document_index_pages_down_to_start():
+    fetcher = FixtureFetcher()
+    documents = import_new_EOs.fetch_document_index(fetcher, 14255)
+    assert sorted(documents) == [14255, 14256, 14257]
+    assert fetcher.pages == [1, 2]
+
+
+def test_fetch_document_index_stops_at_start():
+    fetcher = FixtureFetcher()
+    documents = import_new_EOs.fetch_document_index(fetcher, 14256)
+    assert sorted(documents) == [14256, 14257]
+    assert fetcher.pages == [1]
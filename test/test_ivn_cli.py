@@ -0,0 +1,64 @@
+# This is test_ivn_cli.py
+# Runs the ivn.py command line on a synthetic workbook (synthetic_ivn.generate_ivn): the staged pipeline runner
+# gives the same output as the stage functions called directly and reuses its cache, and stage fingerprints
+# cover the repo modules a stage imports.
+#
+# Example:
+#   python -m pytest test/test_ivn_cli.py
+
+import json
+
+import pandas as pd
+import pytest
+
+import ivn
+from pipeline import local_sources, make_stage
+from similarity_scores import compute_similarity
+from synthetic_ivn import generate_ivn
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "ivn.csv")
+    generate_ivn(60, near_duplicate_rate=0.2).to_csv(path, index=False)
+    return path
+
+
+def test_run_matches_direct_stages_and_reuses_the_cache(workbook, tmp_path, capsys):
+    output = str(tmp_path / "out.csv")
+    metrics = str(tmp_path / "metrics.json")
+    argv = ["--metrics", metrics, "run", "similarity", "--input", workbook, "--output", output,
+            "--threshold", "0.4", "--cache-dir", str(tmp_path / "cache")]
+    ivn.main(argv)
+    first = pd.read_csv(output)
+    expected = compute_similarity(pd.read_csv(workbook), 0.4)
+    assert len(first) == len(expected)
+    assert list(first["Similarity"].round(4)) == list(expected["Similarity"].round(4))
+    with open(metrics, encoding="utf-8") as f:
+        assert "stage.similarity" in json.dumps(json.load(f))
+
+    capsys.readouterr()
+    ivn.main(argv)
+    assert "unchanged; using cached output" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(pd.read_csv(output), first)
+
+
+def test_output_format_switches_the_extension(workbook, tmp_path):
+    ivn.main(["--output-format", "csv", "similarity", "--input", workbook,
+              "--output", str(tmp_path / "scores.xlsx"), "--threshold", "0.5"])
+    assert (tmp_path / "scores.csv").exists()
+
+
+def test_bad_arguments_are_rejected(capsys):
+    with pytest.raises(SystemExit):
+        ivn.build_parser().parse_args(["urls", "--shard", "4/4"])
+    assert "between 0 and 3" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        ivn.build_parser().parse_args(["run", "nonsense", "--input", "a", "--output", "b"])
+
+
+def test_fingerprint_covers_imported_repo_modules():
+    sources = local_sources("similarity_scores")
+    assert {"similarity_scores", "ivn_output", "instrumentation", "component_registry"} <= set(sources)
+    assert make_stage("similarity", threshold=0.5).fingerprint() != make_stage("similarity", threshold=0.6).fingerprint()
+    assert make_stage("similarity").fingerprint() == make_stage("similarity").fingerprint()
@@ -0,0 +1,66 @@
+# This is test_ivn_graph.py
+# Checks the path queries of ivn_graph.py on a small hand-made IVN: neighbourhoods, reachability,
+# shortest paths and the law-like components enabling a component.
+#
+# Example:
+#   python -m pytest test/test_ivn_graph.py
+
+import pandas as pd
+import pytest
+
+from ivn_graph import IVNGraph
+
+# (enabling source, enabling component, dependent source, dependent component)
+EDGES = [
+    ("7 U.S.C. 426", "Wildlife Damage Authority", "APHIS Strategy", "Wildlife Services Program"),
+    ("APHIS Strategy", "Wildlife Services Program", "APHIS Metrics", "Damage Cases Resolved"),
+    ("FSIS Strategy", "Inspection Program", "APHIS Metrics", "Damage Cases Resolved"),
+    ("APHIS Strategy", "Wildlife Services Program", "APHIS Metrics", "Rabies Baits Distributed"),
+    ("APHIS Strategy", "Wildlife Services Program", "APHIS Metrics", "Damage Cases Resolved"),  # repeated edge
+    ("Executive Order 14008", "Climate Order", "FSIS Strategy", "Inspection Program"),
+]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    rows = [{"Enabling Source": es, "Enabling Component": ec, "Enabling Component Description": ec.lower(),
+             "Dependent Source": ds, "Dependent Component": dc, "Dependent Component Description": dc.lower()}
+            for es, ec, ds, dc in EDGES]
+    return IVNGraph.from_dataframe(pd.DataFrame(rows))
+
+
+def names(graph, nodes):
+    return sorted(graph.describe(nodes)["Component"])
+
+
+def test_nodes_and_deduplicated_edges(graph):
+    assert len(graph) == 6
+    assert graph.edge_count == 5
+    assert graph.node("wildlife services program") == graph.node(graph.ids[graph.node("Wildlife Services Program")])
+    with pytest.raises(KeyError):
+        graph.node("No Such Component")
+
+
+def test_successors_predecessors_and_neighbourhood(graph):
+    assert names(graph, graph.successors("Wildlife Services Program")) == [
+        "Damage Cases Resolved", "Rabies Baits Distributed"]
+    assert names(graph, graph.predecessors("Damage Cases Resolved")) == [
+        "Inspection Program", "Wildlife Services Program"]
+    assert names(graph, graph.neighbourhood("Damage Cases Resolved", depth=2)) == [
+        "Climate Order", "Inspection Program", "Rabies Baits Distributed", "Wildlife Damage Authority",
+        "Wildlife Services Program"]
+    assert names(graph, graph.neighbourhood("Damage Cases Resolved", depth=1, direction="out")) == []
+
+
+def test_reachability_and_shortest_path(graph):
+    assert names(graph, graph.reachable("Wildlife Damage Authority")) == [
+        "Damage Cases Resolved", "Rabies Baits Distributed", "Wildlife Services Program"]
+    path = graph.shortest_path("Climate Order", "Damage Cases Resolved")
+    assert list(graph.describe(path)["Component"]) == ["Climate Order", "Inspection Program", "Damage Cases Resolved"]
+    assert graph.shortest_path("Damage Cases Resolved", "Climate Order") is None
+    assert graph.shortest_path("Damage Cases Resolved", "Climate Order", direction="in") is not None
+
+
+def test_enabling_laws(graph):
+    assert names(graph, graph.enabling_laws("Damage Cases Resolved")) == ["Climate Order", "Wildlife Damage Authority"]
+    assert names(graph, graph.enabling_laws("Rabies Baits Distributed")) == ["Wildlife Damage Authority"]
@@ -0,0 +1,68 @@
+# This is test_ivn_output.py
+# Checks the shared table writer of ivn_output.py: values round-trip in every format, floats are rounded to
+# float_format, highlighting becomes one conditional-format rule per column, and both xlsx writers agree.
+#
+# Example:
+#   python -m pytest test/test_ivn_output.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ivn_output
+from ivn_output import compact_table, fill_blank, read_table, with_format, write_table
+
+
+@pytest.fixture
+def table():
+    return pd.DataFrame({
+        "Enabling Component": ["Wildlife Services", "Meat Inspection", None],
+        "Linked": ["Yes", "No", "Yes"],
+        "Similarity": [0.123456, 0.5, np.nan],
+        "Count": [1, 2, 3],
+        "Notes": ["", [1, 2], "x"],
+    })
+
+
+@pytest.mark.parametrize("suffix", [".xlsx", ".csv", ".parquet"])
+def test_round_trip_with_rounded_floats(table, tmp_path, suffix):
+    if suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+    path = write_table(table, str(tmp_path / f"out{suffix}"), float_format="0.0000")
+    back = read_table(path)
+    assert list(back.columns) == list(table.columns)
+    assert back["Similarity"].iloc[0] == pytest.approx(0.1235)
+    assert pd.isna(back["Similarity"].iloc[2])
+    assert list(back["Count"].astype(int)) == [1, 2, 3]
+    assert back["Enabling Component"].iloc[0] == "Wildlife Services"
+
+
+@pytest.mark.parametrize("writer", ["xlsxwriter", "openpyxl"])
+def test_xlsx_number_format_and_highlight(table, tmp_path, monkeypatch, writer):
+    from openpyxl import load_workbook
+    if writer == "openpyxl":
+        def no_xlsxwriter(*args):
+            raise ImportError("xlsxwriter")
+        monkeypatch.setattr(ivn_output, "_write_xlsxwriter", no_xlsxwriter)
+    else:
+        pytest.importorskip("xlsxwriter")
+    path = write_table(table, str(tmp_path / "out.xlsx"), highlight={"Enabling Component": ("Linked", "Yes")},
+                       float_format="0.0000")
+    sheet = load_workbook(path).active
+    assert sheet["C2"].value == pytest.approx(0.1235)
+    assert sheet["C2"].number_format == "0.0000"
+    assert sheet["E3"].value == "[1, 2]"
+    rules = [(str(cells.sqref), rule.formula) for cells in sheet.conditional_formatting for rule in cells.rules]
+    assert rules == [("A2:A4", ['$B2="Yes"'])]
+
+
+def test_with_format_and_compact_helpers(table):
+    assert with_format("scores.xlsx", "csv") == "scores.csv"
+    assert with_format("scores.xlsx", None) == "scores.xlsx"
+    with pytest.raises(ValueError):
+        with_format("scores.xlsx", "json")
+    compact = compact_table(table)
+    assert isinstance(compact["Enabling Component"].dtype, pd.CategoricalDtype)
+    filled = fill_blank(compact)
+    assert isinstance(filled["Enabling Component"].dtype, pd.CategoricalDtype)
+    assert filled["Enabling Component"].iloc[2] == ""
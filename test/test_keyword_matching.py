@@ -0,0 +1,74 @@
+# This is test_keyword_matching.py
+# Checks keyword_matching.py: loading the keyword list with or without a header row, whole-word matching
+# with and without pyahocorasick, and the per-row "Keywords Tab Items Found" column.
+#
+# Example:
+#   python -m pytest test/test_keyword_matching.py
+
+import pandas as pd
+import pytest
+
+from keyword_matching import FOUND_COLUMN, KeywordMatcher, load_keywords, match_keywords
+from synthetic_ivn import IVN_COLUMNS
+
+DESCRIPTION = "Implements 7 U.S.C. 426 wildlife damage management; see the Rabies Vaccination program."
+
+
+@pytest.fixture(params=["automaton", "dictionary"])
+def matcher_of(request):
+    def make(keywords):
+        matcher = KeywordMatcher(keywords)
+        if request.param == "dictionary":
+            matcher.automaton = None  # the fallback used without pyahocorasick
+        return matcher
+    return make
+
+
+def write_keywords(tmp_path, rows, suffix):
+    path = str(tmp_path / f"keywords{suffix}")
+    if suffix == ".xlsx":
+        pd.DataFrame(rows).to_excel(path, sheet_name="Keywords", header=False, index=False)
+    else:
+        pd.DataFrame(rows).to_csv(path, header=False, index=False)
+    return path
+
+
+@pytest.mark.parametrize("suffix", [".xlsx", ".csv"])
+def test_first_keyword_is_kept_without_a_header_row(tmp_path, suffix):
+    path = write_keywords(tmp_path, [["wildlife damage"], ["rabies"]], suffix)
+    assert load_keywords(path) == ["wildlife damage", "rabies"]
+
+
+@pytest.mark.parametrize("suffix", [".xlsx", ".csv"])
+def test_header_cell_is_dropped(tmp_path, suffix):
+    path = write_keywords(tmp_path, [["Keywords"], ["wildlife damage"], ["426"]], suffix)
+    assert load_keywords(path) == ["wildlife damage", "426"]
+
+
+def test_txt_list(tmp_path):
+    path = tmp_path / "keywords.txt"
+    path.write_text("Keyword\nrabies\n\n  feral swine \n", encoding="utf-8")
+    assert load_keywords(str(path)) == ["rabies", "feral swine"]
+
+
+def test_whole_word_case_insensitive_matches_in_order(matcher_of):
+    matcher = matcher_of(["rabies vaccination", "Wildlife Damage", "damage management", "life", "rabies"])
+    assert matcher.find(DESCRIPTION) == ["Wildlife Damage", "damage management", "rabies", "rabies vaccination"]
+
+
+def test_single_character_keywords_are_dropped(matcher_of):
+    matcher = matcher_of(["C++", "R", "426", "U.S.C."])
+    assert sorted(matcher.dropped) == ["C++", "R"]
+    assert matcher.find(DESCRIPTION) == ["U.S.C.", "426"]  # no "C++" hit on the "c" of "U.S.C."
+
+
+def test_match_keywords_fills_each_row_from_both_sides():
+    df = pd.DataFrame("", index=range(2), columns=IVN_COLUMNS)
+    df["Enabling Source"] = ["S1", "S2"]
+    df["Enabling Component"] = ["A", "B"]
+    df["Enabling Component Description"] = [DESCRIPTION, "Feral swine removal"]
+    df["Dependent Source"] = ["S2", "S3"]
+    df["Dependent Component"] = ["B", "C"]
+    df["Dependent Component Description"] = ["Feral swine removal", None]
+    result = match_keywords(df, ["feral swine", "rabies"])
+    assert list(result[FOUND_COLUMN]) == ["rabies; feral swine", "feral swine"]
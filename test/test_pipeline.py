@@ -0,0 +1,70 @@
+# This is test_pipeline.py
+# Checks pipeline.run_pipeline's stage cache: unchanged stages are read back instead of run, a stage that
+# can't be cached (the URL status check) runs every time, and so do the stages after it.
+#
+# Example:
+#   python -m pytest test/test_pipeline.py
+
+import pandas as pd
+import pytest
+
+from pipeline import Stage, make_stage, run_pipeline
+
+CALLS = []
+
+
+def add_column(df, column):
+    CALLS.append(column)
+    return df.assign(**{column: len(CALLS)})
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    CALLS.clear()
+    path = str(tmp_path / "ivn.csv")
+    pd.DataFrame({"Enabling Component": ["A", "B"]}).to_csv(path, index=False)
+    return path
+
+
+def stages(network=True):
+    return [Stage("first", add_column, column="first"),
+            Stage("network", add_column, cache=not network, column="network"),
+            Stage("last", add_column, column="last")]
+
+
+def test_unchanged_stages_are_read_from_the_cache(workbook, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first = run_pipeline(workbook, stages(network=False), cache_dir)
+    second = run_pipeline(workbook, stages(network=False), cache_dir)
+    assert CALLS == ["first", "network", "last"]
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_uncached_stage_and_later_stages_always_run(workbook, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    run_pipeline(workbook, stages(), cache_dir)
+    CALLS.clear()
+    df = run_pipeline(workbook, stages(), cache_dir)
+    assert CALLS == ["network", "last"]  # "first" comes from the cache
+    assert list(df["network"]) == [1, 1] and list(df["last"]) == [2, 2]
+
+
+def test_url_stage_is_cached_only_without_status_checks():
+    assert make_stage("urls", check=True).cache is False
+    assert make_stage("urls").cache is False
+    assert make_stage("urls", check=False).cache is True
+    assert make_stage("scrub").cache is True
+
+
+def test_stage_state_changes_the_cache_key(workbook, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    state = ["pins-1"]
+
+    def run():
+        run_pipeline(workbook, [Stage("first", add_column, state=lambda: state[0], column="first")], cache_dir)
+
+    run()
+    run()
+    state[0] = "pins-2"
+    run()
+    assert CALLS == ["first", "first"]
@@ -0,0 +1,73 @@
+# This is test_scrub_name_cache.py
+# Checks scrub_IVN_Excel.NameCache and the pipeline's scrub cache key: an unchanged workbook reuses the cached
+# scrub output on the second run, and pinning a name invalidates it.
+#
+# Example:
+#   python -m pytest test/test_scrub_name_cache.py
+
+import pandas as pd
+import pytest
+
+import pipeline
+from scrub_IVN_Excel import NameCache, deduplicate_column, name_cache_digest
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the scrub stage uses the default name cache file in the working directory
+    path = tmp_path / "ivn.csv"
+    pd.DataFrame({
+        "Enabling Component": ["Wildlife Services", "Wildlife Service", "Meat Inspection"],
+        "Dependent Component": ["Meat Inspection", "Rabies Program", "Rabies Programs"],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def scrub_runs(capsys, input_file, cache_dir):
+    """Runs the scrub stage; returns (whether scrub ran rather than coming from the cache, output)."""
+    capsys.readouterr()
+    df = pipeline.run_pipeline(input_file, [pipeline.make_stage("scrub")], cache_dir)
+    return "Running stage 'scrub'" in capsys.readouterr().out, df
+
+
+def test_second_run_of_unchanged_workbook_uses_cache(workbook, tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    assert scrub_runs(capsys, workbook, cache_dir)[0]
+    assert scrub_runs(capsys, workbook, cache_dir)[0] is False  # the decisions stored by run 1 don't change the key
+
+
+def test_pin_invalidates_cached_scrub(workbook, tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    scrub_runs(capsys, workbook, cache_dir)
+    cache = NameCache()
+    cache.pin("Rabies Programs", "Rabies Control Program", "Dependent Component")
+    cache.close()
+    ran, df = scrub_runs(capsys, workbook, cache_dir)
+    assert ran
+    assert "Rabies Control Program" in set(df["Dependent Component"])
+
+
+def test_digest_ignores_decisions_and_tracks_pins(tmp_path):
+    path = str(tmp_path / "names.sqlite")
+    cache = NameCache(path)
+    empty = cache.digest()
+    cache.save("Enabling Component", [("Wildlife Service", "Wildlife Services", 95)])
+    assert cache.digest() == empty
+    cache.pin("APHIS WS", "Wildlife Services")
+    pinned = cache.digest()
+    assert pinned != empty
+    cache.unpin("APHIS WS")
+    assert cache.digest() == empty
+    cache.close()
+    assert name_cache_digest(path) == empty
+    assert name_cache_digest(str(tmp_path / "missing.sqlite")) == ""
+
+
+def test_pins_and_earlier_decisions_skip_fuzzy_matching(tmp_path):
+    cache = NameCache(str(tmp_path / "names.sqlite"))
+    cache.pin("APHIS WS", "Wildlife Services")
+    cache.save("Enabling Component", [("Meat Inspections", "Meat Inspection", 97)])
+    cleaned = deduplicate_column(pd.Series(["APHIS WS", "Meat Inspections", "Rabies Program"]), cache,
+                                 "Enabling Component")
+    assert cleaned == ["Wildlife Services", "Meat Inspection", "Rabies Program"]
+    cache.close()
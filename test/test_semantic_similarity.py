@@ -0,0 +1,83 @@
+# This is test_semantic_similarity.py
+# Checks the cached vector store of semantic_similarity.py with the LSA backend on a synthetic workbook
+# (synthetic_ivn.generate_ivn): a second run reuses every vector, an edited description is encoded again,
+# rows appended without an ID are truncated, and blocked scoring matches a plain matrix multiply.
+#
+# Example:
+#   python -m pytest test/test_semantic_similarity.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sklearn")
+
+import semantic_similarity
+from semantic_similarity import VectorStore, main, score_blocks, vector_key
+from synthetic_ivn import generate_ivn
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = str(tmp_path / "ivn.csv")
+    generate_ivn(40, near_duplicate_rate=0.2).to_csv(path, index=False)
+    return path
+
+
+def run(workbook, tmp_path, capsys):
+    output = str(tmp_path / "semantic.csv")
+    capsys.readouterr()
+    main(workbook, output, "lsa", 0.3, str(tmp_path / "vectors"))
+    return pd.read_csv(output), capsys.readouterr().out
+
+
+def test_second_run_reuses_vectors_and_edits_are_reencoded(workbook, tmp_path, capsys):
+    first, out = run(workbook, tmp_path, capsys)
+    assert "(0 reused" in out
+    assert len(first) and (first["Enabling Source"] != first["Dependent Source"]).all()
+    assert first["Similarity"].between(0.3, 1.0001).all()
+
+    second, out = run(workbook, tmp_path, capsys)
+    assert "Encoded 0 new components" in out
+    pd.testing.assert_frame_equal(second, first)
+
+    df = pd.read_csv(workbook)
+    description = df.loc[0, "Enabling Component Description"]
+    df.loc[df["Enabling Component Description"] == description, "Enabling Component Description"] = "Edited text"
+    df.to_csv(workbook, index=False)
+    _, out = run(workbook, tmp_path, capsys)
+    assert "Encoded 1 new components" in out
+
+
+def test_store_truncates_rows_without_an_id(tmp_path):
+    directory = str(tmp_path / "store")
+    store = VectorStore(directory, 3)
+    store.add([vector_key("a", "x")], np.ones((1, 3)))
+    with open(os.path.join(directory, "vectors.f32"), "ab") as f:  # crash after appending, before ids.json
+        f.write(np.zeros((2, 3), dtype=np.float32).tobytes())
+    reopened = VectorStore(directory, 3)
+    assert os.path.getsize(reopened.vector_file) == 3 * 4
+    reopened.add([vector_key("b", "y")], np.full((1, 3), 2.0))
+    np.testing.assert_array_equal(reopened.get([vector_key("b", "y"), vector_key("a", "x")]),
+                                  [[2, 2, 2], [1, 1, 1]])
+    assert vector_key("a", "x") != vector_key("a", "x2")
+
+
+def test_score_blocks_matches_a_full_multiply():
+    rng = np.random.default_rng(0)
+    left, right = rng.normal(size=(7, 4)), rng.normal(size=(5, 4))
+    found = {(i, j): s for block in score_blocks(left, right, 0.5, block_size=3) for i, j, s in zip(*block)}
+    full = left @ right.T
+    assert found.keys() == {tuple(ij) for ij in np.argwhere(full >= 0.5)}
+    assert all(np.isclose(score, full[ij]) for ij, score in found.items())
+
+
+def test_auto_backend_falls_back_to_lsa_when_the_model_fails(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise OSError("no network")
+    monkeypatch.setattr(semantic_similarity, "SentenceEmbeddingBackend", unavailable)
+    assert semantic_similarity.get_backend("auto").name.startswith("lsa")
+    with pytest.raises(OSError):
+        semantic_similarity.get_backend("sentence")
@@ -0,0 +1,117 @@
+# This is test_sharding.py
+# Checks the SQLite lease queue of sharding.py (lease expiry and renewal, restarts after a partial run,
+# shard layout checks) and merge_shards' overlay and concat modes.
+#
+# Example:
+#   python -m pytest test/test_sharding.py
+
+import pandas as pd
+import pytest
+
+import sharding
+from sharding import WorkQueue, merge_shards, process_items
+
+
+@pytest.fixture
+def queue_file(tmp_path):
+    return str(tmp_path / "jobs.sqlite")
+
+
+def other_worker(queue_file, job, shard=None):
+    queue = WorkQueue(queue_file, job, shard)
+    queue.owner = "other-host:1"
+    return queue
+
+
+def test_expired_lease_is_handed_out_again(queue_file):
+    first = WorkQueue(queue_file, "urls")
+    first.add(["a", "b"])
+    assert sorted(first.lease(lease_seconds=600)) == ["a", "b"]
+    second = other_worker(queue_file, "urls")
+    assert second.lease() == []  # still leased by the first worker
+
+    first.lease(lease_seconds=-1)  # nothing left to lease
+    first.renew(["a", "b"], lease_seconds=-1)  # the first worker stops renewing: its leases run out
+    assert sorted(second.lease()) == ["a", "b"]
+    assert first.renew(["a", "b"]) == set()  # the first worker finds it lost the items
+    first.close()
+    second.close()
+
+
+def test_renewed_lease_is_kept(queue_file):
+    first = WorkQueue(queue_file, "urls")
+    first.add(["a"])
+    first.lease(lease_seconds=-1)
+    assert first.renew(["a"]) == {"a"}
+    second = other_worker(queue_file, "urls")
+    assert second.lease() == []
+    first.close()
+    second.close()
+
+
+def test_restart_after_partial_run_only_runs_unfinished_items(queue_file):
+    keys = [f"item-{i}" for i in range(25)]
+    calls = []
+
+    def crash_after_12(key):
+        if len(calls) == 12:
+            raise RuntimeError("worker died")
+        calls.append(key)
+        return key.upper()
+
+    with pytest.raises(RuntimeError):
+        process_items(keys, crash_after_12, "recommend", queue_file=queue_file)
+    finished = list(calls)
+
+    calls.clear()
+    results = process_items(keys, lambda key: calls.append(key) or key.upper(), "recommend", queue_file=queue_file)
+    assert results == {key: key.upper() for key in keys}
+    assert sorted(calls) == sorted(set(keys) - set(finished))
+
+
+def test_shard_layout_mismatch_is_rejected(queue_file):
+    WorkQueue(queue_file, "urls", (0, 2)).close()
+    WorkQueue(queue_file, "urls", (1, 2)).close()
+    with pytest.raises(ValueError, match="i/2"):
+        WorkQueue(queue_file, "urls", (0, 4))
+    with pytest.raises(ValueError):
+        WorkQueue(queue_file, "urls")
+    WorkQueue(queue_file, "citations", (0, 4)).close()  # layouts are per job
+
+
+def test_shards_split_every_key_once(queue_file):
+    keys = [f"https://example.com/{i}" for i in range(40)]
+    results = [process_items(keys, len, "urls", (i, 3), queue_file) for i in range(3)]
+    assert sum(len(r) for r in results) == len(keys)
+    assert set().union(*results) == set(keys)
+
+
+def test_merge_shards_overlay_fills_each_rows_status(tmp_path):
+    columns = sharding.MERGE_MODES["urls"][1]
+    base = pd.DataFrame({"URL": ["u1", "u2", "u3"], columns[0]: ["", "", ""], columns[1]: ["", "", ""]})
+    shard0, shard1 = base.copy(), base.copy()
+    shard0.loc[[0, 2], columns[0]] = ["200 OK", "404 Not Found"]
+    shard1.loc[1, columns[0]] = "500 Server Error"
+    shard1.loc[:, columns[1]] = ["200 OK", "200 OK", "301 Moved"]
+    paths = [str(tmp_path / "checked.0.csv"), str(tmp_path / "checked.1.csv")]
+    shard0.to_csv(paths[0], index=False)
+    shard1.to_csv(paths[1], index=False)
+
+    merged = merge_shards("urls", paths, str(tmp_path / "merged.csv"))
+    assert list(merged[columns[0]]) == ["200 OK", "500 Server Error", "404 Not Found"]
+    assert list(merged[columns[1]]) == ["200 OK", "200 OK", "301 Moved"]
+    assert len(merged) == len(base)
+
+    shard1.iloc[:2].to_csv(paths[1], index=False)
+    with pytest.raises(ValueError):
+        merge_shards("urls", paths, str(tmp_path / "merged.csv"))
+
+
+def test_merge_shards_concat_stacks_rows(tmp_path):
+    paths = []
+    for i in range(2):
+        paths.append(str(tmp_path / f"citations.{i}.csv"))
+        pd.DataFrame({"PDF URL": [f"doc{i}a", f"doc{i}b"], "Citation": ["9 CFR 416", "7 U.S.C. 426"]}).to_csv(
+            paths[-1], index=False)
+    merged = merge_shards("citations", paths, str(tmp_path / "merged.csv"))
+    assert list(merged["PDF URL"]) == ["doc0a", "doc0b", "doc1a", "doc1b"]
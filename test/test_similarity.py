@@ -0,0 +1,112 @@
+# This is test_similarity.py
+# similarity_scores.compute_similarity and ivn_fuzzy_match.fuzzy_match against the row sets and scores
+# of the original scripts (reproduced below as reference functions) on a synthetic workbook with
+# near-duplicate component variants.
+
+import pytest
+import numpy as np
+import pandas as pd
+from itertools import product
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from synthetic_ivn import generate_ivn
+from similarity_scores import compute_similarity, original_columns
+from ivn_fuzzy_match import fuzzy_match
+
+SIDE_COLUMNS = ["Component Description", "Component", "Source", "Component URL", "Source Agency"]
+
+
+@pytest.fixture(scope="module")
+def ivn():
+    return generate_ivn(120, near_duplicate_rate=0.2)
+
+
+def original_similarity(df, threshold):
+    """The original similarity_scores.py loop: every distinct row pair, one CountVectorizer per pair."""
+    df = df.fillna("")
+    enabling = df[[f"Enabling {c}" for c in SIDE_COLUMNS]].drop_duplicates()
+    dependent = df[[f"Dependent {c}" for c in SIDE_COLUMNS]].drop_duplicates()
+    rows = []
+    for e, d in product(enabling.itertuples(index=False), dependent.itertuples(index=False)):
+        if e[2] == d[2] or not e[0] or not d[0]:
+            continue
+        vectors = CountVectorizer().fit_transform([e[0], d[0]]).toarray()
+        score = cosine_similarity(vectors)[0, 1]
+        if score >= threshold:
+            rows.append((e[2], e[1], e[0], d[1], d[0], d[2], e[3], d[3], e[4], d[4], round(score, 9)))
+    return sorted(rows)
+
+
+def original_fuzzy_scores(df):
+    """The original ivn_fuzzy_match.py scores: (Enabling, Dependent) description pair -> TF-IDF cosine."""
+    df = df.fillna("")
+    pairs = df[["Enabling Component Description", "Dependent Component Description"]].drop_duplicates()
+    vectorizer = TfidfVectorizer()
+    enabling = vectorizer.fit_transform(pairs["Enabling Component Description"])
+    dependent = vectorizer.transform(pairs["Dependent Component Description"])
+    matrix = cosine_similarity(enabling, dependent)
+    e_texts = list(pairs["Enabling Component Description"])
+    d_texts = list(pairs["Dependent Component Description"])
+    return {(e_texts[i], d_texts[j]): matrix[i, j] for i in range(len(e_texts)) for j in range(len(d_texts))}
+
+
+def similarity_rows(output):
+    return sorted(
+        (r["Enabling Source"], r["Enabling Component"], r["Enabling Component Description"],
+         r["Dependent Component"], r["Dependent Component Description"], r["Dependent Source"],
+         r["Enabling Component URL"], r["Dependent Component URL"], r["Enabling Source Agency"],
+         r["Dependent Source Agency"], round(r["Similarity"], 9))
+        for r in output.to_dict("records")
+    )
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.6])
+def test_similarity_matches_original_rows(ivn, threshold):
+    output = compute_similarity(ivn, threshold)
+    assert list(output.columns) == original_columns
+    assert similarity_rows(output) == original_similarity(ivn, threshold)
+
+
+def test_similarity_keeps_component_variants(ivn):
+    # Variants of one component (case, blank URL) are paired separately, as in the original script
+    output = compute_similarity(ivn, 0.3)
+    variants = output.groupby("Enabling Component")["Enabling Component Description"].nunique()
+    expected = pd.DataFrame(original_similarity(ivn, 0.3)).groupby(1)[2].nunique()
+    assert variants.sort_index().tolist() == expected.sort_index().tolist()
+
+
+def test_fuzzy_matches_original_rows_and_scores(ivn):
+    expected = original_fuzzy_scores(ivn)
+    filled = ivn.fillna("")
+    scores = np.array([expected[(e, d)] for e, d in zip(filled["Enabling Component Description"],
+                                                        filled["Dependent Component Description"])])
+    output = fuzzy_match(ivn, threshold=0.02)
+    # The input rows above the threshold, in input order, each once, with the original score
+    pd.testing.assert_frame_equal(output.drop(columns="Similarity Score"),
+                                  filled[scores > 0.02].reset_index(drop=True))
+    np.testing.assert_allclose(output["Similarity Score"], scores[scores > 0.02], atol=1e-12)
+
+
+@pytest.mark.parametrize("agency", [None, "same", "cross"])
+@pytest.mark.parametrize("threshold", [0.05, 0.4])
+def test_pruning_is_exact(ivn, threshold, agency):
+    pruned = compute_similarity(ivn, threshold, prune=True, agency=agency)
+    full = compute_similarity(ivn, threshold, prune=False, agency=agency)
+    pd.testing.assert_frame_equal(pruned, full)
+    if agency:
+        same = pruned["Enabling Source Agency"] == pruned["Dependent Source Agency"]
+        assert same.all() if agency == "same" else not same.any()
+
+
+def test_agency_filter_applies_to_full_product_fallback(ivn):
+    # threshold <= 0 scores every pair even with prune=True; the agency filter must still apply
+    pruned = compute_similarity(ivn, 0.0, prune=True, agency="same")
+    full = compute_similarity(ivn, 0.0, prune=False, agency="same")
+    pd.testing.assert_frame_equal(pruned, full)
+    assert (pruned["Enabling Source Agency"] == pruned["Dependent Source Agency"]).all()
+
+
+def test_candidate_max_df_is_a_subset(ivn):
+    exact = similarity_rows(compute_similarity(ivn, 0.3))
+    approximate = similarity_rows(compute_similarity(ivn, 0.3, max_df=0.2))
+    assert set(approximate) <= set(exact)
@@ -0,0 +1,91 @@
+# This is test_similarity_server.py
+# Runs similarity_server.py on a synthetic workbook (synthetic_ivn.generate_ivn) on a free localhost port and
+# checks the JSON replies: top-k and pair queries, bad queries (400/404) and unexpected errors (500).
+#
+# Example:
+#   python -m pytest test/test_similarity_server.py
+
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+import pytest
+
+from similarity_server import Snapshot, SimilarityIndex, make_handler
+from synthetic_ivn import generate_ivn
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("server")
+    path = str(tmp_path / "ivn.csv")
+    generate_ivn(60, near_duplicate_rate=0.2).to_csv(path, index=False)
+    index = SimilarityIndex(path, cache_dir=str(tmp_path / "cache"))
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(index))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield index, f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(base, path, **query):
+    """(HTTP status, JSON body) of a GET request."""
+    try:
+        with urlopen(f"{base}{path}?{urlencode(query)}", timeout=10) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_topk_and_pair(server):
+    index, base = server
+    snapshot = index.current()
+    component_id = snapshot.registry.components["ID"].iloc[0]
+    status, body = get(base, "/topk", component=component_id, k=3)
+    assert status == 200
+    assert body["component"]["id"] == component_id
+    assert len(body["results"]) <= 3
+    scores = [result["score"] for result in body["results"]]
+    assert scores == sorted(scores, reverse=True)
+    if body["results"]:
+        best = body["results"][0]
+        status, pair = get(base, "/pair", a=component_id, b=best["id"])
+        assert status == 200 and pair["score"] == pytest.approx(best["score"])
+
+
+def test_bad_queries(server):
+    _, base = server
+    assert get(base, "/topk", component="no such component")[0] == 404
+    assert get(base, "/topk", component="x", k="many")[0] == 400
+    assert get(base, "/nowhere")[0] == 404
+
+
+def test_ambiguous_name_with_missing_id(server):
+    index, base = server
+    snapshot = index.current()
+    registry = snapshot.registry
+    saved = registry.components.loc[[0, 1], ["ID", "Component"]].copy()
+    try:
+        registry.components.loc[[0, 1], "Component"] = "Shared Name"
+        registry.components.loc[0, "ID"] = np.nan
+        index.snapshot = Snapshot(snapshot.digest, registry, snapshot.vectors)
+        status, body = get(base, "/topk", component="Shared Name")
+        assert status == 400
+        assert "query by ID instead" in body["error"]
+    finally:
+        registry.components.loc[[0, 1], ["ID", "Component"]] = saved
+        index.snapshot = snapshot
+
+
+def test_unexpected_error_is_a_json_500(server, monkeypatch):
+    index, base = server
+    monkeypatch.setattr(Snapshot, "pair", lambda self, a, b: 1 / 0)
+    status, body = get(base, "/pair", a="x", b="y")
+    assert status == 500
+    assert "division by zero" in body["error"]
+    assert get(base, "/status")[0] == 200  # the server keeps answering
@@ -0,0 +1,83 @@
+# This is test_threshold_sweep.py
+# Checks threshold_sweep.ScoreSweep against direct runs of similarity_scores.py and ivn_fuzzy_match.py on a
+# synthetic workbook (synthetic_ivn.generate_ivn): cuts, counts and top-N lists come from one cached pass.
+#
+# Example:
+#   python -m pytest test/test_threshold_sweep.py
+
+import os
+
+import pandas as pd
+import pytest
+
+from component_registry import ComponentRegistry
+from ivn_fuzzy_match import fuzzy_match
+from similarity_scores import compute_similarity
+from synthetic_ivn import generate_ivn
+from threshold_sweep import ScoreSweep
+
+THRESHOLDS = {"similarity": [0.05, 0.2, 0.45, 0.9], "fuzzy": [0.0, 0.02, 0.3, 0.99]}
+
+
+@pytest.fixture(scope="module")
+def workbook(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("sweep")
+    path = str(tmp_path / "ivn.csv")
+    generate_ivn(150, near_duplicate_rate=0.2).to_csv(path, index=False)
+    return path, str(tmp_path / "cache")
+
+
+def direct_run(path, method, threshold):
+    registry = ComponentRegistry.load(path, os.path.join(os.path.dirname(path), "cache"))
+    if method == "similarity":
+        return compute_similarity(registry.edges, threshold)
+    return fuzzy_match(registry.edges.drop(columns=["Enabling Code", "Dependent Code"]), threshold)
+
+
+@pytest.mark.parametrize("method", ["similarity", "fuzzy"])
+def test_cut_matches_a_direct_run(workbook, method):
+    path, cache_dir = workbook
+    sweep = ScoreSweep.load(path, method, cache_dir=cache_dir)
+    for threshold in THRESHOLDS[method]:
+        expected = direct_run(path, method, threshold)
+        cut = sweep.cut(threshold)
+        assert sweep.kept(threshold) == len(expected) == len(cut)
+        if len(expected):
+            pd.testing.assert_frame_equal(cut, expected, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("method", ["similarity", "fuzzy"])
+def test_edge_counts_match_direct_runs(workbook, method):
+    path, cache_dir = workbook
+    sweep = ScoreSweep.load(path, method, cache_dir=cache_dir)
+    counts = sweep.edge_counts(THRESHOLDS[method]).set_index("Threshold")
+    for threshold in THRESHOLDS[method]:
+        expected = direct_run(path, method, threshold)
+        assert counts.loc[threshold, "Pairs"] == len(expected)
+        assert counts.loc[threshold, "Enabling Components"] == expected["Enabling Component"].nunique()
+        assert counts.loc[threshold, "Dependent Components"] == expected["Dependent Component"].nunique()
+
+
+@pytest.mark.parametrize("method", ["similarity", "fuzzy"])
+def test_top_lists_the_best_pairs_of_each_component(workbook, method):
+    path, cache_dir = workbook
+    sweep = ScoreSweep.load(path, method, cache_dir=cache_dir)
+    column = sweep.column
+    everything = sweep.cut(sweep.floor)
+    expected = (everything.sort_values(column, ascending=False, kind="stable")
+                .groupby("Enabling Component", sort=False).head(3).reset_index(drop=True))
+    pd.testing.assert_frame_equal(sweep.top(3), expected, check_dtype=False, check_categorical=False)
+
+
+def test_cache_stores_arrays_and_reloads(workbook, capsys):
+    path, cache_dir = workbook
+    first = ScoreSweep.load(path, "similarity", cache_dir=cache_dir)
+    first.cut(0.2)  # builds the component tables
+    capsys.readouterr()
+    second = ScoreSweep.load(path, "similarity", cache_dir=cache_dir)
+    assert "Using cached similarity scores" in capsys.readouterr().out
+    assert second._tables is None and not hasattr(second, "scored")
+    assert second.pairs.shape == (len(second.scores), 2)
+    pd.testing.assert_frame_equal(second.cut(0.2), first.cut(0.2))
+    with pytest.raises(ValueError):
+        second.cut(0.01)  # below the floor
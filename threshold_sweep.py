@@ -0,0 +1,244 @@
+# This is threshold_sweep.py
+# Threshold tuning for similarity_scores.py and ivn_fuzzy_match.py. Pairs are scored once, down to a low
+# floor, and the scored pairs are cached by the workbook hash and the scoring code (like pipeline.py stages).
+# From that single pass the sweep reports a score histogram, quantiles, the edges kept at each candidate
+# threshold and the top-N matches of each component; --cut then writes the output for the chosen threshold
+# from the cached scores, without scoring again.
+#
+# Example:
+#   python ivn.py sweep fuzzy --input ivntest.xlsx --step 0.01
+#   python ivn.py sweep similarity --input ivntest.xlsx --cut 0.45 --output similarity_scores_filtered.xlsx
+
+import os
+import pickle
+import hashlib
+import operator
+import argparse
+import numpy as np
+import pandas as pd
+from instrumentation import count, timer
+from ivn_output import write_table
+
+INPUT_FILE = "ivntest.xlsx"
+REPORT_FILE = "threshold_sweep.csv"
+CACHE_DIR = ".ivn_cache"
+HISTOGRAM_BINS = 20
+QUANTILES = [0.5, 0.9, 0.95, 0.99, 0.999]
+TOP_N = 5
+
+# method -> (score column, whether a score passes a threshold, lowest threshold scored by default).
+# similarity keeps scores >= threshold and only prunes candidate pairs above 0; fuzzy keeps scores > threshold.
+METHODS = {
+    "similarity": ("Similarity", operator.ge, 0.05),
+    "fuzzy": ("Similarity Score", operator.gt, 0.0),
+}
+
+
+def score_pairs(input_file, method, floor, workers=1, max_df=None, agency=None):
+    """
+    Runs the method's scoring at threshold=floor. Returns (registry, pairs, scores), in the
+    order of the method's output: see ScoreSweep for what pairs holds.
+    """
+    from component_registry import ComponentRegistry
+    registry = ComponentRegistry.load(input_file)
+    if method == "similarity":
+        from similarity_scores import similar_pairs
+        _, _, i, j, scores = similar_pairs(registry.edges, floor, max_df=max_df, agency=agency)
+        return registry, np.column_stack([i, j]), scores
+    from ivn_fuzzy_match import matching_rows
+    rows, scores = matching_rows(edge_rows(registry), floor, workers)
+    return registry, rows, scores
+
+
+def edge_rows(registry):
+    """The workbook rows as ivn_fuzzy_match.fuzzy_match reads them."""
+    from ivn_output import fill_blank
+    return fill_blank(registry.edges.drop(columns=["Enabling Code", "Dependent Code"]))
+
+
+class ScoreSweep:
+    """
+    The pairs one method scored down to floor, kept compactly: the workbook's component
+    registry and, for each pair in the order of the method's output, its score and where
+    its output row comes from. For similarity, pairs holds (i, j) rows into the unique
+    Enabling and Dependent components (similarity_scores.unique_components of the
+    registry's edges). For fuzzy it holds positions in the edge rows. Output rows are
+    only rebuilt for cut() and top().
+    """
+
+    def __init__(self, method, floor, registry, pairs, scores):
+        self.method = method
+        self.floor = floor
+        self.column, self.passes, _ = METHODS[method]
+        self.registry = registry
+        self.pairs = pairs
+        self.pair_scores = np.asarray(scores, dtype=float)
+        self.scores = np.sort(self.pair_scores)
+        self._tables = None
+
+    def __getstate__(self):
+        return dict(self.__dict__, _tables=None)  # rebuilt from the registry when needed
+
+    def tables(self):
+        """The tables output rows are taken from: (enabling_df, dependent_df) for similarity, (edge rows,) for fuzzy."""
+        if self._tables is None:
+            if self.method == "similarity":
+                from ivn_output import fill_blank
+                from similarity_scores import unique_components
+                edges = fill_blank(self.registry.edges)
+                self._tables = (unique_components(edges, "Enabling"), unique_components(edges, "Dependent"))
+            else:
+                self._tables = (edge_rows(self.registry),)
+        return self._tables
+
+    def names(self, side):
+        """The side's Component name of each pair."""
+        if self.method == "similarity":
+            k = 0 if side == "Enabling" else 1
+            return self.tables()[k][f"{side} Component"].to_numpy()[self.pairs[:, k]]
+        return self.tables()[0][f"{side} Component"].to_numpy()[self.pairs]
+
+    def rows(self, selected):
+        """Output rows of the pairs at positions selected, in that order."""
+        scores = self.pair_scores[selected]
+        if self.method == "similarity":
+            from similarity_scores import pair_rows
+            enabling_df, dependent_df = self.tables()
+            return pair_rows(enabling_df, dependent_df, self.pairs[selected, 0], self.pairs[selected, 1], scores)
+        return self.tables()[0].iloc[self.pairs[selected]].assign(**{self.column: scores}).reset_index(drop=True)
+
+    @classmethod
+    def load(cls, input_file, method, floor=None, workers=1, cache_dir=CACHE_DIR, use_cache=True, max_df=None,
+             agency=None):
+        """
+        Scores input_file once per workbook, method, floor, candidate options and
+        scoring code; later calls read the cache. max_df and agency are passed to
+        similarity_scores.similar_pairs (similarity only).
+        """
+        from pipeline import file_hash, local_sources, make_stage
+        if method != "similarity" and (max_df is not None or agency):
+            raise ValueError("max_df and agency only apply to the similarity method")
+        floor = METHODS[method][2] if floor is None else floor
+        params = {"threshold": floor}
+        if method == "fuzzy" and workers > 1:
+            params["workers"] = workers  # hashed features give (slightly) different scores
+        if max_df is not None:
+            params["max_df"] = max_df
+        if agency:
+            params["agency"] = agency
+        source = "".join(local_sources("threshold_sweep").values())  # the cached layout is ScoreSweep's
+        key = hashlib.sha256((file_hash(input_file) + make_stage(method, **params).fingerprint() + source)
+                             .encode("utf-8"))
+        path = os.path.join(cache_dir, f"sweep-{method}-{key.hexdigest()[:16]}.pkl")
+        if use_cache and os.path.exists(path):
+            with open(path, "rb") as f:
+                print(f"⏭️ Using cached {method} scores from {path}")
+                return pickle.load(f)
+
+        with timer(f"sweep.{method}.scoring"):
+            sweep = cls(method, floor, *score_pairs(input_file, method, floor, workers, max_df, agency))
+        count(f"sweep.{method}.pairs", len(sweep.scores))
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(sweep, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return sweep
+
+    def _check(self, threshold):
+        if threshold < self.floor:
+            raise ValueError(f"Scores were only kept down to {self.floor}; rerun the sweep with --floor {threshold}")
+
+    def kept(self, threshold):
+        """Number of pairs the method keeps at threshold."""
+        self._check(threshold)
+        side = "left" if self.passes is operator.ge else "right"
+        return len(self.scores) - int(np.searchsorted(self.scores, threshold, side=side))
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        counts, edges = np.histogram(np.clip(self.scores, 0, 1), bins=bins, range=(0, 1))
+        return pd.DataFrame({"From": edges[:-1], "To": edges[1:], "Pairs": counts})
+
+    def quantiles(self, q=QUANTILES):
+        if not len(self.scores):
+            return pd.Series(np.nan, index=q)
+        return pd.Series(np.quantile(self.scores, q), index=q)
+
+    def edge_counts(self, thresholds):
+        """Pairs, Enabling and Dependent components kept at each threshold."""
+        scores = pd.Series(self.pair_scores)
+        best = {side: scores.groupby(self.names(side), sort=False).max().to_numpy()
+                for side in ("Enabling", "Dependent")}
+        rows = []
+        for threshold in thresholds:
+            rows.append({
+                "Threshold": threshold,
+                "Pairs": self.kept(threshold),
+                "Enabling Components": int(self.passes(best["Enabling"], threshold).sum()),
+                "Dependent Components": int(self.passes(best["Dependent"], threshold).sum()),
+            })
+        return pd.DataFrame(rows)
+
+    def top(self, n=TOP_N):
+        """The n highest-scoring pairs of each Enabling Component, best first."""
+        order = np.argsort(-self.pair_scores, kind="stable")
+        names = self.names("Enabling")[order]
+        return self.rows(order[pd.Series(names).groupby(names, sort=False).cumcount().to_numpy() < n])
+
+    def cut(self, threshold):
+        """The method's output at threshold, taken from the cached scores."""
+        self._check(threshold)
+        return self.rows(np.flatnonzero(self.passes(self.pair_scores, threshold)))
+
+
+def thresholds_from(floor, step=None, thresholds=None):
+    if thresholds:
+        return sorted(thresholds)
+    step = step or 0.05
+    return [round(t, 6) for t in np.arange(floor, 1 + step / 2, step)]
+
+
+def main(input_file=INPUT_FILE, method="fuzzy", floor=None, thresholds=None, step=None, report_file=REPORT_FILE,
+         cut=None, output_file=None, top_n=None, top_file=None, workers=1, cache_dir=CACHE_DIR, use_cache=True,
+         max_df=None, agency=None):
+    sweep = ScoreSweep.load(input_file, method, floor, workers, cache_dir, use_cache, max_df, agency)
+    print(f"📈 {len(sweep.scores)} {method} pairs scored at or above {sweep.floor}")
+
+    histogram = sweep.histogram()
+    widest = max(histogram["Pairs"].max(), 1)
+    for row in histogram.itertuples(index=False):
+        print(f"  {row.From:.2f}-{row.To:.2f} {'█' * round(40 * row.Pairs / widest):<40} {row.Pairs}")
+    print("  Quantiles: " + ", ".join(f"p{q * 100:g}={value:.4f}" for q, value in sweep.quantiles().items()))
+
+    counts = sweep.edge_counts(thresholds_from(sweep.floor, step, thresholds))
+    print(counts.to_string(index=False))
+    if report_file:
+        write_table(counts, report_file)
+        print(f"📝 Edge counts per threshold saved to {report_file}")
+
+    if top_file:
+        write_table(sweep.top(top_n or TOP_N), top_file, float_format="0.0000")
+        print(f"🏅 Top {top_n or TOP_N} matches per Enabling Component saved to {top_file}")
+
+    if cut is not None:
+        output = sweep.cut(cut)
+        write_table(output, output_file, float_format="0.0000")
+        print(f"✂️ {len(output)} pairs at threshold {cut} saved to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score similarity pairs once and report edge counts per threshold.")
+    parser.add_argument("method", choices=list(METHODS))
+    parser.add_argument("--input", default=INPUT_FILE)
+    parser.add_argument("--floor", type=float, help="Lowest threshold to keep scores for")
+    parser.add_argument("--thresholds", type=float, nargs="+", help="Thresholds to report (default: floor..1 by --step)")
+    parser.add_argument("--step", type=float, help="Threshold step for the report (default 0.05)")
+    parser.add_argument("--report", default=REPORT_FILE)
+    parser.add_argument("--cut", type=float, help="Write the output at this threshold to --output")
+    parser.add_argument("--output")
+    parser.add_argument("--top", type=int, help="Matches per Enabling Component for --top-output")
+    parser.add_argument("--top-output")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--candidate-max-df", type=float, help="similarity: see similarity_scores.candidate_pairs")
+    parser.add_argument("--agency", choices=["same", "cross"], help="similarity: pair within/across agencies only")
+    args = parser.parse_args()
+    main(args.input, args.method, args.floor, args.thresholds, args.step, args.report, args.cut, args.output,
+         args.top, args.top_output, args.workers, max_df=args.candidate_max_df, agency=args.agency)